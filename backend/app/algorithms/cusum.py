@@ -164,6 +164,116 @@ class CUSUMDetector:
         
         return change_detected, change_type, confidence, metadata
     
+    def detect_change_batch(
+        self, 
+        observations: np.ndarray, 
+        baseline_mean: float, 
+        baseline_std: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Detect changes over a 1-D array of observations in one call
+        
+        Equivalent to calling detect_change on each observation in order, with
+        the max(0, ...) recurrences evaluated as whole-array NumPy operations
+        (see _cumulative_sums). With reset_after_detection the arrays are
+        re-evaluated from each recorded change point onwards, so the work is one
+        vectorized pass per detection rather than one Python step per observation.
+        NaN observations are skipped and the per-observation processing history
+        is not recorded.
+        
+        Args:
+            observations: 1-D array of observation values
+            baseline_mean: Target mean (baseline)
+            baseline_std: Baseline standard deviation for normalization
+            
+        Returns:
+            Tuple of:
+            - change_flags (np.ndarray): Boolean change flag per valid observation
+            - change_types (np.ndarray): "increase", "decrease", or "none" per valid observation
+            - confidences (np.ndarray): Confidence score (0-1) per valid observation
+        """
+        
+        observations = np.asarray(observations, dtype=float).ravel()
+        observations = observations[~np.isnan(observations)]
+        
+        n = observations.size
+        change_types = np.full(n, "none", dtype=object)
+        
+        if np.isnan(baseline_mean) or np.isnan(baseline_std) or baseline_std <= 0 or n == 0:
+            return np.zeros(n, dtype=bool), change_types, np.zeros(n)
+        
+        k = self.config.drift_k
+        h = self.config.threshold_h
+        bilateral = self.config.bilateral
+        
+        z_values = (observations - baseline_mean) / baseline_std
+        s_plus = np.empty(n)
+        s_minus = np.empty(n)
+        counts = self.observation_count + 1 + np.arange(n)
+        recorded = []
+        
+        start = 0
+        while start < n:
+            s_plus[start:] = self._cumulative_sums(z_values[start:] - k, self.s_plus)
+            if bilateral:
+                s_minus[start:] = self._cumulative_sums(-z_values[start:] - k, self.s_minus)
+            else:
+                s_minus[start:] = self.s_minus
+            
+            alarms = s_plus[start:] >= h
+            if bilateral:
+                alarms |= s_minus[start:] >= h
+            hits = np.flatnonzero(alarms & (counts[start:] >= self.config.min_observations)) + start
+            
+            if not self.config.reset_after_detection or hits.size == 0:
+                recorded.extend(hits.tolist())
+                self.s_plus, self.s_minus = float(s_plus[-1]), float(s_minus[-1])
+                break
+            
+            # Sums restart from zero after the first recorded change point
+            recorded.append(int(hits[0]))
+            self.s_plus = self.s_minus = 0.0
+            start = int(hits[0]) + 1
+        
+        self.observation_count += n
+        
+        upper = s_plus >= h
+        lower = (s_minus >= h) & ~upper if bilateral else np.zeros(n, dtype=bool)
+        change_flags = upper | lower
+        change_types[upper] = "increase"
+        change_types[lower] = "decrease"
+        confidences = np.zeros(n)
+        confidences[upper] = np.minimum(s_plus[upper] / h, 2.0) / 2.0
+        confidences[lower] = np.minimum(s_minus[lower] / h, 2.0) / 2.0
+        
+        for i in recorded:
+            self.change_points.append({
+                "observation_index": int(counts[i]),
+                "change_type": change_types[i],
+                "confidence": float(confidences[i]),
+                "s_plus": float(s_plus[i]),
+                "s_minus": float(s_minus[i]),
+                "observation_value": float(observations[i]),
+                "standardized_value": float(z_values[i])
+            })
+        
+        detected = int(change_flags.sum())
+        if detected:
+            logger.info(f"CUSUM changes detected at {detected} of {n} observations")
+        
+        return change_flags, change_types, confidences
+    
+    @staticmethod
+    def _cumulative_sums(increments: np.ndarray, initial: float) -> np.ndarray:
+        """
+        Evaluate S(t) = max(0, S(t-1) + w(t)) for a whole array of increments
+        
+        With C(t) the running total of w, S(t) = C(t) - min(-S(0), C(1), ..., C(t)),
+        so the clamped recurrence becomes a cumsum and a running minimum.
+        """
+        totals = np.cumsum(increments)
+        return totals - np.minimum.accumulate(np.minimum(totals, -initial))
+    
     def process_time_series(
         self, 
         time_series: np.ndarray, 
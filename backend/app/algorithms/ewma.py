@@ -7,6 +7,7 @@ using statistical process control methods adapted for satellite time series data
 """
 
 import numpy as np
+from scipy.signal import lfilter
 from typing import Tuple, List, Optional, Dict
 from dataclasses import dataclass
 import logging
@@ -135,6 +136,78 @@ class EWMADetector:
         
         return change_detected, confidence, metadata
     
+    def detect_change_batch(
+        self, 
+        observations: np.ndarray, 
+        baseline_mean: float, 
+        baseline_std: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Detect changes over a 1-D array of observations in one call
+        
+        Equivalent to calling detect_change on each observation in order, but
+        the EWMA recurrence runs as a single linear filter instead of one
+        Python call per value. NaN observations are skipped, as detect_change
+        does; per-observation metadata dicts are not built.
+        
+        Args:
+            observations: 1-D array of observation values
+            baseline_mean: Historical baseline mean
+            baseline_std: Historical baseline standard deviation
+            
+        Returns:
+            Tuple of:
+            - change_flags (np.ndarray): Boolean change flag per valid observation
+            - confidences (np.ndarray): Confidence score (0-1) per valid observation
+            - ewma_values (np.ndarray): EWMA value per valid observation
+        """
+        
+        observations = np.asarray(observations, dtype=float).ravel()
+        observations = observations[~np.isnan(observations)]
+        
+        if np.isnan(baseline_mean) or np.isnan(baseline_std) or baseline_std <= 0 or observations.size == 0:
+            empty = np.zeros(0)
+            return empty.astype(bool), empty, empty
+        
+        lam = self.config.lambda_param
+        ewma_values = np.empty_like(observations)
+        
+        # The first observation of a fresh detector only seeds the EWMA at the baseline
+        if self.ewma_history:
+            previous, start = self.ewma_history[-1], 0
+        else:
+            previous, start = baseline_mean, 1
+            ewma_values[0] = baseline_mean
+        
+        # EWMA(t) = λ * X(t) + (1-λ) * EWMA(t-1) as a first-order IIR filter
+        ewma_values[start:], _ = lfilter(
+            [lam], [1.0, lam - 1.0], observations[start:], zi=[(1 - lam) * previous]
+        )
+        
+        # Calculate control limits
+        lambda_factor = np.sqrt(lam / (2 - lam))
+        control_limit = self.config.threshold_multiplier * baseline_std * lambda_factor
+        
+        deviation = np.abs(ewma_values - baseline_mean)
+        change_flags = deviation > control_limit
+        if control_limit > 0:
+            confidences = np.minimum(deviation / control_limit, 2.0) / 2.0
+        else:
+            confidences = np.zeros_like(deviation)
+        
+        # Carry detector state forward as the per-observation path would
+        first_count = self.observation_count + 1
+        self.ewma_history.extend(ewma_values[-self.config.max_history:].tolist())
+        del self.ewma_history[:-self.config.max_history]
+        self.observation_count += observations.size
+        
+        new_points = (np.flatnonzero(change_flags) + first_count).tolist()
+        self.change_points.extend(new_points)
+        if new_points:
+            logger.info(f"EWMA changes detected at {len(new_points)} of {observations.size} observations")
+        
+        return change_flags, confidences, ewma_values
+    
     def process_time_series(
         self, 
         time_series: np.ndarray, 
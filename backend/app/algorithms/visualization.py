@@ -8,8 +8,9 @@ import io
 import base64
 from typing import Dict, Optional, Tuple
 from PIL import Image
-from matplotlib import pyplot as plt
+from matplotlib import colormaps
 from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.figure import Figure
 import logging
 
 logger = logging.getLogger(__name__)
@@ -34,7 +35,8 @@ class ChangeVisualizer:
         after_image: np.ndarray,
         colormap: str = 'change_intensity',
         title: str = 'Environmental Change Heat Map',
-        show_colorbar: bool = True
+        show_colorbar: bool = True,
+        change_map: Optional[np.ndarray] = None
     ) -> str:
         """
         Generate a heat map showing change intensity
@@ -45,6 +47,7 @@ class ChangeVisualizer:
             colormap: Name of colormap to use
             title: Title for the heatmap
             show_colorbar: Whether to show colorbar
+            change_map: Optional precomputed after - before, reused instead of re-differencing
             
         Returns:
             Base64 encoded PNG image string
@@ -52,13 +55,14 @@ class ChangeVisualizer:
         
         try:
             # Calculate change
-            change = self._calculate_change_magnitude(before_image, after_image)
+            change = self._calculate_change_magnitude(before_image, after_image, change_map)
             
             # Normalize to 0-1
             change_norm = self._normalize_array(change)
             
             # Create figure
-            fig, ax = plt.subplots(figsize=(12, 10))
+            fig = Figure(figsize=(12, 10))
+            ax = fig.subplots()
             
             # Get colormap
             cmap = self._get_colormap(colormap)
@@ -68,7 +72,7 @@ class ChangeVisualizer:
             
             # Add colorbar
             if show_colorbar:
-                cbar = plt.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
+                cbar = fig.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
                 cbar.set_label('Change Intensity', rotation=270, labelpad=20, fontsize=12)
             
             # Add title
@@ -77,7 +81,6 @@ class ChangeVisualizer:
             
             # Convert to base64
             img_base64 = self._figure_to_base64(fig)
-            plt.close(fig)
             
             return img_base64
             
@@ -118,7 +121,8 @@ class ChangeVisualizer:
             n_rows = (n_indices + n_cols - 1) // n_cols
             
             # Create figure
-            fig, axes = plt.subplots(n_rows, n_cols, figsize=(5*n_cols, 4*n_rows))
+            fig = Figure(figsize=(5*n_cols, 4*n_rows))
+            axes = fig.subplots(n_rows, n_cols)
             
             if n_indices == 1:
                 axes = np.array([axes])
@@ -145,17 +149,16 @@ class ChangeVisualizer:
                 axes[idx].axis('off')
                 
                 # Add colorbar
-                plt.colorbar(im, ax=axes[idx], fraction=0.046, pad=0.04)
+                fig.colorbar(im, ax=axes[idx], fraction=0.046, pad=0.04)
             
             # Hide unused subplots
             for idx in range(n_indices, len(axes)):
                 axes[idx].axis('off')
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # Convert to base64
             img_base64 = self._figure_to_base64(fig)
-            plt.close(fig)
             
             return img_base64
             
@@ -188,7 +191,8 @@ class ChangeVisualizer:
             n_panels = 3 if change_map is not None else 2
             
             # Create figure
-            fig, axes = plt.subplots(1, n_panels, figsize=(6*n_panels, 6))
+            fig = Figure(figsize=(6*n_panels, 6))
+            axes = fig.subplots(1, n_panels)
             
             if n_panels == 2:
                 axes = [axes[0], axes[1]]
@@ -213,13 +217,12 @@ class ChangeVisualizer:
                 im = axes[2].imshow(change_norm, cmap='RdYlBu_r', interpolation='bilinear')
                 axes[2].set_title(labels[2], fontsize=14, fontweight='bold')
                 axes[2].axis('off')
-                plt.colorbar(im, ax=axes[2], fraction=0.046, pad=0.04)
+                fig.colorbar(im, ax=axes[2], fraction=0.046, pad=0.04)
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # Convert to base64
             img_base64 = self._figure_to_base64(fig)
-            plt.close(fig)
             
             return img_base64
             
@@ -227,6 +230,50 @@ class ChangeVisualizer:
             logger.error(f"Error generating comparison view: {e}")
             return self._generate_error_image("Comparison view generation failed")
     
+    def generate_change_gif(
+        self,
+        before_image: np.ndarray,
+        after_image: np.ndarray,
+        change_map: Optional[np.ndarray] = None,
+        duration: int = 1000,
+        colormap: str = 'change_intensity'
+    ) -> str:
+        """
+        Generate an animated GIF cycling before, after and change intensity frames
+        
+        Args:
+            before_image: Image from earlier date
+            after_image: Image from later date
+            change_map: Optional precomputed after - before, reused instead of re-differencing
+            duration: Display time of each frame in milliseconds
+            colormap: Name of colormap for the change frame
+            
+        Returns:
+            Base64 encoded GIF image string
+        """
+        
+        try:
+            change = self._calculate_change_magnitude(before_image, after_image, change_map)
+            change_rgb = self._get_colormap(colormap)(self._normalize_array(change), bytes=True)[..., :3]
+            
+            frames = [
+                Image.fromarray(self._prepare_rgb(before_image)),
+                Image.fromarray(self._prepare_rgb(after_image)),
+                Image.fromarray(change_rgb)
+            ]
+            
+            buffer = io.BytesIO()
+            frames[0].save(buffer, format='GIF', save_all=True, append_images=frames[1:],
+                           duration=duration, loop=0)
+            img_base64 = base64.b64encode(buffer.getvalue()).decode()
+            buffer.close()
+            
+            return f"data:image/gif;base64,{img_base64}"
+            
+        except Exception as e:
+            logger.error(f"Error generating change GIF: {e}")
+            return self._generate_error_image("Change GIF generation failed")
+    
     def generate_temporal_chart(
         self,
         time_series: list,
@@ -258,7 +305,8 @@ class ChangeVisualizer:
             values = [point['value'] for point in time_series]
             
             # Create figure
-            fig, ax = plt.subplots(figsize=(12, 6))
+            fig = Figure(figsize=(12, 6))
+            ax = fig.subplots()
             
             # Plot main time series
             ax.plot(dates, values, 'o-', linewidth=2, markersize=6, label='Observed', color='#2E86AB')
@@ -308,11 +356,10 @@ class ChangeVisualizer:
             # Format dates
             fig.autofmt_xdate()
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # Convert to base64
             img_base64 = self._figure_to_base64(fig)
-            plt.close(fig)
             
             return img_base64
             
@@ -343,7 +390,8 @@ class ChangeVisualizer:
             base_rgb = self._prepare_rgb(base_image)
             
             # Create figure
-            fig, ax = plt.subplots(figsize=(12, 10))
+            fig = Figure(figsize=(12, 10))
+            ax = fig.subplots()
             ax.imshow(base_rgb)
             
             # Calculate cell size
@@ -391,11 +439,10 @@ class ChangeVisualizer:
             ]
             ax.legend(handles=legend_elements, loc='upper right', frameon=True, shadow=True)
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # Convert to base64
             img_base64 = self._figure_to_base64(fig)
-            plt.close(fig)
             
             return img_base64
             
@@ -408,15 +455,19 @@ class ChangeVisualizer:
     def _calculate_change_magnitude(
         self,
         before: np.ndarray,
-        after: np.ndarray
+        after: np.ndarray,
+        difference: Optional[np.ndarray] = None
     ) -> np.ndarray:
-        """Calculate change magnitude between two images"""
+        """Calculate change magnitude between two images, reusing after - before if given"""
+        
+        if difference is None:
+            difference = after - before
         
         # Handle multi-band images
-        if before.ndim == 3:
-            change = np.sqrt(np.sum((after - before) ** 2, axis=2))
+        if difference.ndim == 3:
+            change = np.sqrt(np.sum(difference ** 2, axis=2))
         else:
-            change = np.abs(after - before)
+            change = np.abs(difference)
         
         return change
     
@@ -457,10 +508,10 @@ class ChangeVisualizer:
         if name in self.colormaps:
             cmap = self.colormaps[name]
             if isinstance(cmap, str):
-                return plt.get_cmap(cmap)
+                return colormaps[cmap]
             return cmap
         
-        return plt.get_cmap('viridis')
+        return colormaps['viridis']
     
     def _create_change_colormap(self):
         """Create custom colormap for change intensity"""
@@ -493,7 +544,8 @@ class ChangeVisualizer:
     def _generate_error_image(self, message: str) -> str:
         """Generate error placeholder image"""
         
-        fig, ax = plt.subplots(figsize=(8, 4))
+        fig = Figure(figsize=(8, 4))
+        ax = fig.subplots()
         ax.text(0.5, 0.5, f'Error: {message}', 
                horizontalalignment='center',
                verticalalignment='center',
@@ -503,6 +555,5 @@ class ChangeVisualizer:
         ax.axis('off')
         
         img_base64 = self._figure_to_base64(fig)
-        plt.close(fig)
         
         return img_base64
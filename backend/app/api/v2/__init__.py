@@ -1,6 +1,6 @@
 """Enhanced GeoGuardian module"""
 
 # Import and expose the routers
-from . import analysis, aoi, alerts
+from . import analysis, aoi, alerts, debug
 
-__all__ = ["analysis", "aoi", "alerts"]
\ No newline at end of file
+__all__ = ["analysis", "aoi", "alerts", "debug"]
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""
+Debug API v2 - Composite Endpoint Probe
+Bundles the basic backend health checks into a single round-trip for test drivers
+"""
+
+from fastapi import APIRouter
+from typing import Dict, Any, Awaitable, Callable
+from datetime import datetime
+import asyncio
+import logging
+
+from ..aoi import get_user_aois
+from .analysis import get_analysis_results, get_system_status
+from ...core.database import get_supabase
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+async def _run_check(check: Awaitable[Any]) -> Dict[str, Any]:
+    """Await a single check, capturing failures instead of propagating them"""
+    try:
+        return {"ok": True, "data": await check}
+    except Exception as e:
+        logger.warning(f"Probe check failed: {str(e)}")
+        return {"ok": False, "error": str(e)}
+
+
+async def _in_thread(handler: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run an async handler that blocks on synchronous Supabase calls in a worker thread
+
+    The handler gets its own event loop there, so its blocking .execute() calls
+    neither stall the server's loop nor serialize the other probe checks.
+    """
+    return await asyncio.to_thread(asyncio.run, handler(*args, **kwargs))
+
+
+@router.get("/probe")
+async def probe_endpoints():
+    """
+    Run the basic endpoint checks in one request
+
+    Calls the health, AOI listing, analysis results and system status
+    handlers concurrently and returns their outcomes in a single payload,
+    so test drivers pay one round-trip instead of one per endpoint. The
+    health, AOI listing and system status handlers block on Supabase, so
+    they run in worker threads.
+    """
+
+    # Imported lazily: the health check lives on the app module itself
+    from ...main import health_check
+
+    health, aois, results, system_status = await asyncio.gather(
+        _run_check(_in_thread(health_check)),
+        _run_check(_in_thread(get_user_aois, current_user=None, supabase=get_supabase())),
+        _run_check(get_analysis_results()),
+        _run_check(_in_thread(get_system_status))
+    )
+
+    # Collapse list payloads to counts to keep the probe response small
+    for check in (aois, results):
+        if check["ok"]:
+            check["count"] = len(check.pop("data"))
+
+    return {
+        "health": health,
+        "aoi_count": aois,
+        "results_count": results,
+        "system_status": system_status,
+        "checked_at": datetime.now().isoformat()
+    }
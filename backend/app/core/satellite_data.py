@@ -19,6 +19,8 @@ from sentinelhub import (
     CRS, 
     MimeType,
     MosaickingOrder,
+    SentinelHubDownloadClient,
+    SentinelHubSession,
     bbox_to_dimensions
 )
 from .config import settings
@@ -27,7 +29,9 @@ from typing import List, Dict, Tuple, Optional, Union
 import logging
 from dataclasses import dataclass
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import os
+import tempfile
+import threading
 import time
 
 logger = logging.getLogger(__name__)
@@ -53,8 +57,11 @@ class FetchConfig:
     min_time_separation_days: int = 5
     preferred_resolution: float = 10.0
     max_image_size: int = 1024
+    min_image_size: int = 64  # Smaller AOIs are resampled up to this many pixels per side
     timeout_seconds: int = 120
     retry_attempts: int = 3
+    max_concurrent_requests: int = 4  # Sentinel Hub requests in flight at once per fetcher
+    memmap_dir: Optional[str] = None  # When set, decoded scenes are spilled here and returned as read-only memmaps
 
 
 class SentinelDataFetcher:
@@ -83,8 +90,41 @@ class SentinelDataFetcher:
         if not self.sh_config.sh_client_id or not self.sh_config.sh_client_secret:
             logger.warning("Sentinel Hub credentials not configured")
         
+        # Long-lived download client, created on first fetch so the OAuth token
+        # is requested once and only refreshed shortly before it expires
+        self._download_client: Optional[SentinelHubDownloadClient] = None
+        # Fetches run on worker threads, so creation is serialized to authenticate once
+        self._download_client_lock = threading.Lock()
+        
+        # Bounds concurrent fetch_imagery calls to respect the Sentinel Hub quota
+        self._request_slots = asyncio.Semaphore(self.config.max_concurrent_requests)
+        
         logger.info("SentinelDataFetcher initialized")
     
+    def _get_download_client(self) -> SentinelHubDownloadClient:
+        """Get the shared download client, authenticating on first use"""
+        
+        if self._download_client is None:
+            with self._download_client_lock:
+                if self._download_client is None:
+                    session = SentinelHubSession(config=self.sh_config)
+                    self._download_client = SentinelHubDownloadClient(config=self.sh_config, session=session)
+        
+        return self._download_client
+    
+    def connect(self) -> SentinelHubDownloadClient:
+        """
+        Authenticate and create the shared download client ahead of time
+        
+        Concurrent first fetches already share one session; calling this
+        first moves the OAuth exchange out of the first fetch's latency.
+        
+        Returns:
+            The shared download client
+        """
+        
+        return self._get_download_client()
+    
     async def fetch_imagery(
         self, 
         aoi_geometry: Dict, 
@@ -112,15 +152,16 @@ class SentinelDataFetcher:
             # Calculate optimal image size
             size = self._calculate_optimal_size(bbox)
             
-            # Use all 13 bands by default
+            # Use all 13 bands by default; a requested subset still gets SCL as its last layer
             if bands is None:
                 bands = self._get_all_sentinel2_bands()
+            else:
+                bands = [b for b in bands if b != "SCL"] + ["SCL"]
             
-            # Fetch imagery using thread pool for concurrent requests
-            with ThreadPoolExecutor(max_workers=3) as executor:
-                loop = asyncio.get_event_loop()
-                imagery_data = await loop.run_in_executor(
-                    executor, 
+            # Fetch imagery on the default executor; a cancelled fetch releases the
+            # caller immediately instead of waiting for the download to finish
+            async with self._request_slots:
+                imagery_data = await asyncio.to_thread(
                     self._fetch_imagery_sync,
                     bbox, date_range, size, bands
                 )
@@ -132,15 +173,44 @@ class SentinelDataFetcher:
             logger.error(f"Error fetching satellite imagery: {str(e)}")
             raise
     
+    async def fetch_one(
+        self, 
+        aoi_geometry: Dict, 
+        date_range: Tuple[datetime, datetime],
+        bands: Optional[List[str]] = None
+    ) -> Optional[SatelliteImage]:
+        """
+        Fetch the best image for an AOI within a single date window
+        
+        Independent windows (e.g. a recent and a baseline period) can be
+        fetched concurrently with asyncio.gather; call connect() first so
+        they share one authenticated session.
+        
+        Args:
+            aoi_geometry: GeoJSON geometry of area of interest
+            date_range: Tuple of (start_date, end_date)
+            bands: List of Sentinel-2 bands to fetch (defaults to all 13 bands)
+            
+        Returns:
+            Highest-ranked SatelliteImage in the window, or None if there is none
+        """
+        
+        images = await self.fetch_imagery(aoi_geometry, date_range, bands)
+        return images[0] if images else None
+    
     def _fetch_imagery_sync(
         self, 
         bbox: BBox, 
         date_range: Tuple[datetime, datetime],
         size: Tuple[int, int],
-        bands: List[str]
+        bands: List[str],
+        max_cloud_coverage: Optional[float] = None
     ) -> List[SatelliteImage]:
         """Synchronous imagery fetching for thread pool execution"""
         
+        if max_cloud_coverage is None:
+            max_cloud_coverage = self.config.max_cloud_coverage
+        
         # Create evalscript for all 13 Sentinel-2 bands + SCL
         evalscript = self._create_comprehensive_evalscript(bands)
         
@@ -152,7 +222,7 @@ class SentinelDataFetcher:
                     data_collection=DataCollection.SENTINEL2_L2A,
                     time_interval=date_range,
                     mosaicking_order=MosaickingOrder.LEAST_CC,
-                    maxcc=self.config.max_cloud_coverage
+                    maxcc=max_cloud_coverage
                 )
             ],
             responses=[
@@ -169,8 +239,8 @@ class SentinelDataFetcher:
             try:
                 logger.debug(f"Fetching attempt {attempt + 1}/{self.config.retry_attempts}")
 
-                # Get data with timeout
-                data = request.get_data(save_data=False)
+                # Get data through the shared, already-authenticated client
+                data = self._get_download_client().download(request.download_list, decode_data=True)
                 
                 if data and len(data) > 0:
                     # Process each image
@@ -180,6 +250,9 @@ class SentinelDataFetcher:
                             cloud_coverage = self._calculate_cloud_coverage(img_data)
                             quality_score = self._calculate_quality_score(img_data, cloud_coverage)
                             
+                            if self.config.memmap_dir:
+                                img_data = self._to_memmap(img_data)
+                            
                             # Create SatelliteImage object
                             satellite_image = SatelliteImage(
                                 data=img_data,
@@ -194,7 +267,7 @@ class SentinelDataFetcher:
                             imagery_data.append(satellite_image)
                     
                     # Filter by quality and limit number of images
-                    imagery_data = self._filter_and_sort_images(imagery_data)
+                    imagery_data = self._filter_and_sort_images(imagery_data, max_cloud_coverage)
                     break
                     
             except Exception as e:
@@ -205,6 +278,28 @@ class SentinelDataFetcher:
         
         return imagery_data
     
+    def _to_memmap(self, image_data: np.ndarray) -> np.ndarray:
+        """
+        Spill a decoded scene to disk and reopen it as a read-only memmap
+        
+        Args:
+            image_data: Decoded image array
+            
+        Returns:
+            Read-only memory-mapped array with the same shape, dtype and contents
+        """
+        
+        os.makedirs(self.config.memmap_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(suffix='.npy', dir=self.config.memmap_dir)
+        os.close(fd)
+        
+        spill = np.lib.format.open_memmap(path, mode='w+', dtype=image_data.dtype, shape=image_data.shape)
+        spill[...] = image_data
+        spill.flush()
+        del spill
+        
+        return np.load(path, mmap_mode='r')
+    
     def _geometry_to_bbox(self, geojson: Dict) -> BBox:
         """Convert GeoJSON geometry to Sentinel Hub BBox"""
         
@@ -232,7 +327,7 @@ class SentinelDataFetcher:
                 size = (int(size[0] * scale), int(size[1] * scale))
             
             # Ensure minimum size
-            min_size = 64
+            min_size = self.config.min_image_size
             size = (max(size[0], min_size), max(size[1], min_size))
             
             logger.debug(f"Calculated optimal size: {size}")
@@ -261,7 +356,12 @@ class SentinelDataFetcher:
         ]
     
     def _create_comprehensive_evalscript(self, bands: List[str]) -> str:
-        """Create evalscript for comprehensive band data"""
+        """
+        Create evalscript for comprehensive band data
+        
+        Any subset of bands may be requested; SCL is always fetched and
+        returned last since cloud coverage and quality scoring rely on it.
+        """
         
         # Filter out SCL from band outputs
         data_bands = [b for b in bands if b != "SCL"]
@@ -270,7 +370,7 @@ class SentinelDataFetcher:
         band_outputs = ", ".join([f"sample.{band}" for band in data_bands])
         
         # Create properly formatted band array for input
-        bands_array_str = ', '.join([f'"{band}"' for band in bands])
+        bands_array_str = ', '.join([f'"{band}"' for band in data_bands + ["SCL"]])
         
         evalscript = f"""
         //VERSION=3
@@ -340,13 +440,20 @@ class SentinelDataFetcher:
             logger.warning(f"Error calculating quality score: {e}")
             return 0.5  # Conservative estimate
     
-    def _filter_and_sort_images(self, images: List[SatelliteImage]) -> List[SatelliteImage]:
+    def _filter_and_sort_images(
+        self, 
+        images: List[SatelliteImage],
+        max_cloud_coverage: Optional[float] = None
+    ) -> List[SatelliteImage]:
         """Filter and sort images by quality"""
         
+        if max_cloud_coverage is None:
+            max_cloud_coverage = self.config.max_cloud_coverage
+        
         # Filter by cloud coverage and quality
         filtered_images = [
             img for img in images 
-            if img.cloud_coverage <= self.config.max_cloud_coverage and img.quality_score > 0.3
+            if img.cloud_coverage <= max_cloud_coverage and img.quality_score > 0.3
         ]
         
         # Sort by quality score (descending)
@@ -470,4 +577,92 @@ class SentinelDataFetcher:
         elif len(images) >= 2:
             return "Moderate data quality - analysis possible with reduced confidence"
         else:
-            return "Poor data quality - consider expanding date range"
\ No newline at end of file
+            return "Poor data quality - consider expanding date range"
+
+
+class SatelliteDataManager:
+    """
+    Synchronous satellite data access for scripts and batch jobs
+    
+    Wraps a single SentinelDataFetcher so every call made through one manager
+    shares the same authenticated Sentinel Hub session.
+    """
+    
+    def __init__(self, config: Optional[FetchConfig] = None):
+        """
+        Initialize the satellite data manager
+        
+        Args:
+            config: Fetching configuration parameters
+        """
+        self.fetcher = SentinelDataFetcher(config)
+    
+    def get_satellite_data(
+        self,
+        geojson: Dict,
+        start_date: datetime,
+        end_date: datetime,
+        max_cloud_coverage: float = 30,
+        store_path: Optional[str] = None
+    ) -> Dict:
+        """
+        Fetch the best available image for an AOI and date range
+        
+        Args:
+            geojson: GeoJSON polygon of the area of interest
+            start_date: Start of the acquisition window
+            end_date: End of the acquisition window
+            max_cloud_coverage: Maximum cloud coverage, as a percentage or fraction
+            store_path: Optional .npy path; when given the image is written there
+                and returned as a read-only memory map instead of an in-RAM array
+            
+        Returns:
+            Dictionary with success flag, image array (H, W, Bands) and metadata
+        """
+        
+        # Accept both percentages (30) and fractions (0.3)
+        if max_cloud_coverage > 1:
+            max_cloud_coverage = max_cloud_coverage / 100.0
+        
+        try:
+            bbox = self.fetcher._geometry_to_bbox(geojson)
+            size = self.fetcher._calculate_optimal_size(bbox)
+            images = self.fetcher._fetch_imagery_sync(
+                bbox,
+                (start_date, end_date),
+                size,
+                self.fetcher._get_all_sentinel2_bands(),
+                max_cloud_coverage
+            )
+            
+            if not images:
+                return {
+                    'success': False,
+                    'error': f"No imagery available between {start_date.date()} and {end_date.date()}"
+                }
+            
+            best_image = images[0]
+            image = best_image.data
+            
+            if store_path:
+                # Persist the scene and hand back a lazily paged view so the
+                # decoded array is released as soon as this call returns
+                np.save(store_path, image)
+                image = np.load(store_path, mmap_mode='r')
+            
+            return {
+                'success': True,
+                'image': image,
+                'path': store_path,
+                'timestamp': best_image.timestamp,
+                'cloud_coverage': best_image.cloud_coverage,
+                'quality_score': best_image.quality_score,
+                'bands': best_image.bands
+            }
+            
+        except Exception as e:
+            logger.error(f"Error getting satellite data: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
@@ -12,8 +12,20 @@ class SpectralAnalyzer:
     def __init__(self):
         self.epsilon = 1e-8  # Avoid division by zero
     
-    def extract_all_features(self, image: np.ndarray) -> Dict:
-        """Extract comprehensive features from satellite imagery"""
+    def extract_all_features(self, image: np.ndarray, include_stats: bool = False) -> Dict:
+        """
+        Extract comprehensive features from satellite imagery
+        
+        Args:
+            image: Multi-band image array (H, W, bands); float64 input is
+                downcast to float32, which is ample precision for the indices
+            include_stats: Also return mean/min/max/std per index under 'stats',
+                computed while each index array is still hot in cache, plus the
+                pixel validity mask they were computed over under 'valid_mask'
+        """
+        
+        if image.dtype == np.float64:
+            image = image.astype(np.float32)
         
         # Extract bands (assuming standard Sentinel-2 order)
         bands = self._extract_bands(image)
@@ -21,7 +33,7 @@ class SpectralAnalyzer:
         # Calculate spectral indices
         indices = self._calculate_all_indices(bands)
         
-        return {
+        features = {
             'bands': bands,
             'indices': indices,
             'metadata': {
@@ -29,6 +41,45 @@ class SpectralAnalyzer:
                 'band_count': image.shape[2] if image.ndim == 3 else 1
             }
         }
+        
+        if include_stats:
+            # One NaN scan of the image instead of one per index
+            valid = self._valid_mask(image)
+            features['valid_mask'] = valid
+            features['stats'] = {name: self._index_stats(values, valid) for name, values in indices.items()}
+        
+        return features
+    
+    def _valid_mask(self, image: np.ndarray) -> np.ndarray:
+        """
+        Pixels where every band is finite (H, W)
+        
+        Index values are only NaN where an input band is, so this one mask
+        covers every index derived from the image. A pixel missing any band
+        is treated as no-data for all indices.
+        """
+        
+        if image.ndim == 2:
+            return np.isfinite(image)
+        return np.isfinite(image).all(axis=2)
+    
+    def _index_stats(self, index: np.ndarray, valid: np.ndarray) -> Dict[str, float]:
+        """mean/min/max/std of an index over the valid pixels from a single masked gather"""
+        
+        vals = index[valid]
+        n = vals.size
+        if n == 0:
+            return {'mean': float('nan'), 'min': float('nan'), 'max': float('nan'), 'std': float('nan')}
+        
+        # Accumulate in float64 so the one-pass variance stays stable for float32 inputs
+        mean = vals.sum(dtype=np.float64) / n
+        mean_sq = np.einsum('i,i->', vals, vals, dtype=np.float64) / n
+        return {
+            'mean': float(mean),
+            'min': float(vals.min()),
+            'max': float(vals.max()),
+            'std': float(np.sqrt(max(mean_sq - mean * mean, 0.0)))
+        }
     
     def _extract_bands(self, image: np.ndarray) -> Dict[str, np.ndarray]:
         """
@@ -80,12 +131,17 @@ class SpectralAnalyzer:
         indices = {}
         
         try:
+            # NIR-red difference and sum feed NDVI, EVI and SAVI; build each once
+            if 'nir' in bands and 'red' in bands:
+                nir_minus_red = bands['nir'] - bands['red']
+                nir_plus_red = bands['nir'] + bands['red']
+            
             # Vegetation indices
             if 'nir' in bands and 'red' in bands:
-                indices['ndvi'] = (bands['nir'] - bands['red']) / (bands['nir'] + bands['red'] + self.epsilon)
+                indices['ndvi'] = nir_minus_red / (nir_plus_red + self.epsilon)
             
             if 'nir' in bands and 'red' in bands and 'blue' in bands:
-                indices['evi'] = 2.5 * ((bands['nir'] - bands['red']) / 
+                indices['evi'] = 2.5 * (nir_minus_red / 
                                        (bands['nir'] + 6*bands['red'] - 7.5*bands['blue'] + 1 + self.epsilon))
             
             # Water indices  
@@ -112,8 +168,7 @@ class SpectralAnalyzer:
             # SAVI (Soil Adjusted Vegetation Index) - Better for areas with exposed soil
             if 'nir' in bands and 'red' in bands:
                 L = 0.5  # Soil brightness correction factor
-                indices['savi'] = ((bands['nir'] - bands['red']) / \
-                                  (bands['nir'] + bands['red'] + L + self.epsilon)) * (1 + L)
+                indices['savi'] = (nir_minus_red / (nir_plus_red + L + self.epsilon)) * (1 + L)
             
             # NBRI (Normalized Burn Ratio Index) - Burned areas and fire damage
             if 'nir' in bands and 'swir_2' in bands:
@@ -131,9 +186,14 @@ class SpectralAnalyzer:
             if 'red' in bands and 'nir' in bands:
                 indices['turbidity_index'] = bands['red'] / (bands['nir'] + self.epsilon)
             
-            # Clip indices to reasonable ranges to avoid numerical issues
+            # Clip indices to reasonable ranges to avoid numerical issues; the
+            # freshly computed arrays are clipped in place, but thermal_proxy is
+            # a view of the input image and must be copied
             for key in indices:
-                indices[key] = np.clip(indices[key], -1.5, 1.5)
+                if key == 'thermal_proxy':
+                    indices[key] = np.clip(indices[key], -1.5, 1.5)
+                else:
+                    np.clip(indices[key], -1.5, 1.5, out=indices[key])
             
         except Exception as e:
             import logging
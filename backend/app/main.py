@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from datetime import datetime
 import os
@@ -7,7 +8,7 @@ import tempfile
 from .core.config import settings
 from .core.database import create_db_and_tables
 from .api import auth, aoi, alerts
-from .api.v2 import analysis, aoi as aoi_v2, alerts as alerts_v2
+from .api.v2 import analysis, aoi as aoi_v2, alerts as alerts_v2, debug as debug_v2
 
 # Create FastAPI app
 app = FastAPI(
@@ -32,6 +33,10 @@ app.add_middleware(
     max_age=600,  # Cache preflight requests for 10 minutes
 )
 
+# Compress larger responses (analysis payloads embed base64 visualizations)
+# for clients that send Accept-Encoding: gzip
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # Include routers
 app.include_router(auth.router, prefix=settings.API_V1_STR)
 app.include_router(aoi.router, prefix=settings.API_V1_STR)
@@ -41,6 +46,7 @@ app.include_router(alerts.router, prefix=settings.API_V1_STR)
 app.include_router(analysis.router, prefix="/api/v2/analysis", tags=["analysis-v2"])
 app.include_router(aoi_v2.router, prefix="/api/v2/aoi", tags=["aoi-v2"])
 app.include_router(alerts_v2.router, prefix="/api/v2/alerts", tags=["alerts-v2"])
+app.include_router(debug_v2.router, prefix="/api/v2/debug", tags=["debug-v2"])
 
 # Mount static assets directory for serving generated visualizations
 assets_path = os.path.join(tempfile.gettempdir(), "geoguardian_assets")
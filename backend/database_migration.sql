@@ -166,6 +166,16 @@ FROM alerts a
 LEFT JOIN aois o ON a.aoi_id = o.id
 ORDER BY a.created_at DESC;
 
+-- Report which of the given tables exist and are visible to the caller, in one round-trip
+CREATE OR REPLACE FUNCTION check_tables(names text[])
+RETURNS text[] AS $$
+    SELECT COALESCE(array_agg(table_name::text), '{}')
+    FROM information_schema.tables
+    WHERE table_schema = 'public' AND table_name = ANY(names);
+$$ LANGUAGE sql STABLE;
+
 -- Grant necessary permissions
 GRANT SELECT ON alert_summary TO authenticated;
 GRANT SELECT ON alert_summary TO anon;
+GRANT EXECUTE ON FUNCTION check_tables(text[]) TO authenticated;
+GRANT EXECUTE ON FUNCTION check_tables(text[]) TO anon;
@@ -4,19 +4,99 @@ Test script to verify API endpoints are working correctly
 Run this script to test the backend API endpoints after making changes
 """
 
-import requests
-import json
+import httpx
+import argparse
+import asyncio
+import orjson
+import os
 import sys
 from datetime import datetime
+from types import MappingProxyType
 
 # Backend API base URL
 BASE_URL = "http://localhost:8000"
 
-def test_health_endpoint():
+# Set GEOGUARDIAN_TEST_LIVE=1 to test a running server at BASE_URL instead of
+# driving the app in-process through an ASGI transport
+LIVE_MODE = bool(os.getenv("GEOGUARDIAN_TEST_LIVE"))
+
+# Maximum number of pooled keep-alive connections in live mode
+POOL_SIZE = 8
+
+# Fail-fast timeouts so a hung backend cannot stall the whole run; the
+# Sentinel-backed imagery endpoints get a longer read timeout
+TIMEOUT = httpx.Timeout(10.0, connect=2.0)
+IMAGERY_TIMEOUT = httpx.Timeout(30.0, connect=2.0)
+
+# Sample GeoJSON for testing (small area in San Francisco), read-only and
+# shared by every test that needs an AOI
+SF_GEOJSON = MappingProxyType({
+    "type": "Polygon",
+    "coordinates": ((
+        (-122.4194, 37.7749),
+        (-122.4194, 37.7849),
+        (-122.4094, 37.7849),
+        (-122.4094, 37.7749),
+        (-122.4194, 37.7749)
+    ),)
+})
+
+# Preview request body serialized once; identical bytes also make the
+# shared-response key match across tests
+SF_PREVIEW_BODY = orjson.dumps({"geojson": SF_GEOJSON}, default=dict, option=orjson.OPT_SORT_KEYS)
+
+# In-flight/finished requests shared between tests, keyed on (method, path, body)
+_shared_requests = {}
+
+def create_client():
+    """Create the async HTTP client used by every test"""
+    if LIVE_MODE:
+        # One multiplexed HTTP/2 connection (when the server negotiates it)
+        # carries all concurrent probes; otherwise falls back to keep-alive
+        return httpx.AsyncClient(
+            base_url=BASE_URL,
+            http2=True,
+            limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE),
+            timeout=TIMEOUT
+        )
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from app.main import app
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url=BASE_URL, timeout=TIMEOUT)
+
+async def _shared_request(client, method, path, body_json=None, timeout=TIMEOUT):
+    """
+    Issue a request once per run and share the response between tests
+
+    Keyed on (method, path, canonical JSON body bytes) so tests posting the same
+    payload to the same endpoint - even concurrently - reuse a single backend
+    round-trip. Returns a (status_code, text, json_or_none) tuple.
+    """
+    key = (method, path, body_json)
+    if key not in _shared_requests:
+        _shared_requests[key] = asyncio.ensure_future(_send(client, method, path, body_json, timeout))
+    return await _shared_requests[key]
+
+async def _send(client, method, path, body_json, timeout):
+    response = await client.request(
+        method,
+        path,
+        content=body_json,
+        headers={"Content-Type": "application/json"} if body_json is not None else None,
+        timeout=timeout
+    )
+    try:
+        data = response.json()
+    except ValueError:
+        data = None
+    return response.status_code, response.text, data
+
+async def test_health_endpoint(client):
     """Test the health check endpoint"""
     print("Testing health endpoint...")
     try:
-        response = requests.get(f"{BASE_URL}/health")
+        response = await client.get("/health", timeout=TIMEOUT)
         if response.status_code == 200:
             data = response.json()
             print(f"[PASS] Health check passed: {data}")
@@ -24,18 +104,21 @@ def test_health_endpoint():
         else:
             print(f"❌ Health check failed: {response.status_code} - {response.text}")
             return False
+    except httpx.TimeoutException:
+        print("⏱️  Health check timed out")
+        return False
     except Exception as e:
         print(f"❌ Health check error: {e}")
         return False
 
-def test_aoi_endpoint():
+async def test_aoi_endpoint(client):
     """Test the AOI endpoints (both v1 and v2)"""
     print("\nTesting AOI endpoints...")
 
     # Test v1 endpoint first (known to work)
     print("Testing v1 AOI endpoint...")
     try:
-        response = requests.get(f"{BASE_URL}/api/v1/aoi")
+        response = await client.get("/api/v1/aoi", timeout=TIMEOUT)
         if response.status_code == 200:
             data = response.json()
             print(f"✅ V1 AOI endpoint working: {len(data)} AOIs returned")
@@ -43,6 +126,9 @@ def test_aoi_endpoint():
         else:
             print(f"❌ V1 AOI endpoint failed: {response.status_code}")
             v1_works = False
+    except httpx.TimeoutException:
+        print("⏱️  V1 AOI endpoint timed out")
+        v1_works = False
     except Exception as e:
         print(f"❌ V1 AOI endpoint error: {e}")
         v1_works = False
@@ -50,7 +136,7 @@ def test_aoi_endpoint():
     # Test v2 endpoint (known to have routing issues)
     print("Testing v2 AOI endpoint...")
     try:
-        response = requests.get(f"{BASE_URL}/api/v2/aoi")
+        response = await client.get("/api/v2/aoi", timeout=TIMEOUT)
         if response.status_code == 200:
             data = response.json()
             print(f"✅ V2 AOI endpoint working: {len(data)} AOIs returned")
@@ -58,6 +144,9 @@ def test_aoi_endpoint():
         else:
             print(f"⚠️  V2 AOI endpoint issue: {response.status_code} (known routing problem)")
             v2_works = False
+    except httpx.TimeoutException:
+        print("⏱️  V2 AOI endpoint timed out")
+        v2_works = False
     except Exception as e:
         print(f"⚠️  V2 AOI endpoint error: {e} (known routing problem)")
         v2_works = False
@@ -70,11 +159,11 @@ def test_aoi_endpoint():
         print("❌ No AOI endpoint working")
         return False
 
-def test_analysis_endpoint():
+async def test_analysis_endpoint(client):
     """Test the analysis results endpoint"""
     print("\nTesting analysis results endpoint...")
     try:
-        response = requests.get(f"{BASE_URL}/api/v2/results")
+        response = await client.get("/api/v2/results", timeout=TIMEOUT)
         if response.status_code == 200:
             data = response.json()
             print(f"✅ Analysis results endpoint working: {len(data)} results returned")
@@ -82,15 +171,18 @@ def test_analysis_endpoint():
         else:
             print(f"❌ Analysis results endpoint failed: {response.status_code} - {response.text}")
             return False
+    except httpx.TimeoutException:
+        print("⏱️  Analysis results endpoint timed out")
+        return False
     except Exception as e:
         print(f"❌ Analysis results endpoint error: {e}")
         return False
 
-def test_system_status_endpoint():
+async def test_system_status_endpoint(client):
     """Test the system status endpoint"""
     print("\nTesting system status endpoint...")
     try:
-        response = requests.get(f"{BASE_URL}/api/v2/system/status")
+        response = await client.get("/api/v2/system/status", timeout=TIMEOUT)
         if response.status_code == 200:
             data = response.json()
             print(f"✅ System status endpoint working: {data.get('system_online', 'unknown')}")
@@ -98,35 +190,55 @@ def test_system_status_endpoint():
         else:
             print(f"❌ System status endpoint failed: {response.status_code} - {response.text}")
             return False
+    except httpx.TimeoutException:
+        print("⏱️  System status endpoint timed out")
+        return False
     except Exception as e:
         print(f"❌ System status endpoint error: {e}")
         return False
 
-def test_satellite_imagery_endpoint():
+async def test_composite_probe(client):
+    """Test health, AOI, results and system status through the composite probe endpoint"""
+    print("\nTesting composite probe endpoint...")
+    try:
+        response = await client.get("/api/v2/debug/probe", timeout=TIMEOUT)
+        if response.status_code != 200:
+            print(f"❌ Composite probe failed: {response.status_code} - {response.text}")
+            return False
+
+        body = response.json()
+        checks = {
+            "Health check": body["health"]["ok"] and body["health"]["data"].get("status") == "ok",
+            "V1 AOI listing": body["aoi_count"]["ok"],
+            "Analysis results": body["results_count"]["ok"],
+            "System status": body["system_status"]["ok"] and body["system_status"]["data"].get("system_online", False)
+        }
+        for name, passed in checks.items():
+            print(f"{'✅' if passed else '❌'} {name}")
+        if body["aoi_count"]["ok"]:
+            print(f"   {body['aoi_count']['count']} AOIs, {body['results_count'].get('count', 0)} results returned")
+        return all(checks.values())
+    except httpx.TimeoutException:
+        print("⏱️  Composite probe timed out")
+        return False
+    except Exception as e:
+        print(f"❌ Composite probe error: {e}")
+        return False
+
+async def test_satellite_imagery_endpoint(client):
     """Test the satellite imagery preview endpoint"""
     print("\nTesting satellite imagery preview endpoint...")
     
-    # Sample GeoJSON for testing (small area in San Francisco)
-    test_geojson = {
-        "type": "Polygon",
-        "coordinates": [[
-            [-122.4194, 37.7749],
-            [-122.4194, 37.7849],
-            [-122.4094, 37.7849],
-            [-122.4094, 37.7749],
-            [-122.4194, 37.7749]
-        ]]
-    }
-    
     try:
-        response = requests.post(
-            f"{BASE_URL}/api/v2/analysis/data-availability/preview",
-            json={"geojson": test_geojson},
-            headers={"Content-Type": "application/json"}
+        status_code, text, data = await _shared_request(
+            client,
+            "POST",
+            "/api/v2/analysis/data-availability/preview",
+            SF_PREVIEW_BODY,
+            timeout=IMAGERY_TIMEOUT
         )
         
-        if response.status_code == 200:
-            data = response.json()
+        if status_code == 200:
             if data.get("success"):
                 print(f"✅ Satellite imagery endpoint working: preview generated")
                 return True
@@ -134,45 +246,36 @@ def test_satellite_imagery_endpoint():
                 print(f"⚠️  Satellite imagery endpoint responded but no imagery: {data.get('error', 'Unknown error')}")
                 return True  # Endpoint is working, just no imagery available
         else:
-            print(f"❌ Satellite imagery endpoint failed: {response.status_code} - {response.text}")
+            print(f"❌ Satellite imagery endpoint failed: {status_code} - {text}")
             return False
+    except httpx.TimeoutException:
+        print("⏱️  Satellite imagery endpoint timed out")
+        return False
     except Exception as e:
         print(f"❌ Satellite imagery endpoint error: {e}")
         return False
 
-def test_sentinel_vs_map_comparison():
+async def test_sentinel_vs_map_comparison(client):
     """Test to compare Sentinel vs Map services directly"""
     print("\n🔍 Sentinel vs Map Service Comparison Test")
     print("-" * 50)
 
-    # Test GeoJSON for San Francisco area
-    test_geojson = {
-        "type": "Polygon",
-        "coordinates": [[
-            [-122.4194, 37.7749],
-            [-122.4194, 37.7849],
-            [-122.4094, 37.7849],
-            [-122.4094, 37.7749],
-            [-122.4194, 37.7749]
-        ]]
-    }
-
     try:
         # Test Sentinel imagery endpoint
         print("Testing Sentinel imagery service...")
-        sentinel_response = requests.post(
-            f"{BASE_URL}/api/v2/data-availability/preview",
-            json={"geojson": test_geojson},
-            headers={"Content-Type": "application/json"},
-            timeout=30
+        sentinel_status, sentinel_text, sentinel_data = await _shared_request(
+            client,
+            "POST",
+            "/api/v2/analysis/data-availability/preview",
+            SF_PREVIEW_BODY,
+            timeout=IMAGERY_TIMEOUT
         )
 
         sentinel_success = False
         sentinel_has_image = False
         sentinel_error = None
 
-        if sentinel_response.status_code == 200:
-            sentinel_data = sentinel_response.json()
+        if sentinel_status == 200:
             sentinel_success = True
             if sentinel_data.get("success") and sentinel_data.get("preview_image"):
                 sentinel_has_image = True
@@ -186,8 +289,8 @@ def test_sentinel_vs_map_comparison():
                 print("❌ Sentinel: Endpoint working but reported failure")
                 sentinel_error = sentinel_data.get("error")
         else:
-            print(f"❌ Sentinel: HTTP {sentinel_response.status_code}")
-            print(f"   Response: {sentinel_response.text[:200]}...")
+            print(f"❌ Sentinel: HTTP {sentinel_status}")
+            print(f"   Response: {sentinel_text[:200]}...")
 
         # Test Map service (simulated - this would need to be adapted based on your map service)
         print("\nTesting Map service compatibility...")
@@ -220,31 +323,58 @@ def test_sentinel_vs_map_comparison():
             print(f"• Error: {sentinel_error}")
             return False
 
+    except httpx.TimeoutException:
+        print("⏱️  Sentinel comparison request timed out")
+        return False
     except Exception as e:
         print(f"❌ Comparison test failed: {e}")
         return False
 
-def main():
+async def warm_up(client, connections):
+    """Open keep-alive connections up front so concurrent tests start on hot sockets"""
+    responses = await asyncio.gather(
+        *(client.get("/health") for _ in range(connections)),
+        return_exceptions=True
+    )
+    ready = sum(1 for r in responses if not isinstance(r, Exception))
+    print(f"🔥 Warmed up {ready}/{connections} connections")
+
+async def _run_named(test, client):
+    """Run a single test and report as soon as it finishes"""
+    result = await test(client)
+    print(f"   ↳ {test.__name__} finished: {'PASS' if result else 'FAIL'}")
+    return result
+
+async def run_tests(client, granular=False):
     """Run all tests"""
     print("GeoGuardian API Endpoint Tests (Enhanced)")
     print("=" * 60)
-    print(f"Testing against: {BASE_URL}")
+    print(f"Testing against: {BASE_URL if LIVE_MODE else 'in-process ASGI app'}")
     print(f"Test started at: {datetime.now().isoformat()}")
     print()
 
-    # Basic endpoint tests
-    tests = [
-        test_health_endpoint,
-        test_aoi_endpoint,
-        test_analysis_endpoint,
-        test_system_status_endpoint,
-        test_satellite_imagery_endpoint
-    ]
+    # Basic endpoint tests; by default the cheap GET probes are batched into
+    # a single call to the composite probe endpoint
+    if granular:
+        tests = [
+            test_health_endpoint,
+            test_aoi_endpoint,
+            test_analysis_endpoint,
+            test_system_status_endpoint,
+            test_satellite_imagery_endpoint
+        ]
+    else:
+        tests = [
+            test_composite_probe,
+            test_satellite_imagery_endpoint
+        ]
+
+    if LIVE_MODE:
+        await warm_up(client, min(POOL_SIZE, len(tests)))
 
     print("📋 Running Basic Endpoint Tests...")
-    results = []
-    for test in tests:
-        results.append(test())
+    # The basic probes are independent read-only calls, so run them concurrently
+    results = await asyncio.gather(*(_run_named(test, client) for test in tests))
 
     print("\n" + "=" * 60)
     print("📊 BASIC TESTS SUMMARY:")
@@ -252,7 +382,7 @@ def main():
     print(f"❌ Failed: {len(results) - sum(results)}/{len(results)}")
 
     # Sentinel vs Map comparison test
-    comparison_result = test_sentinel_vs_map_comparison()
+    comparison_result = await test_sentinel_vs_map_comparison(client)
 
     print("\n" + "=" * 60)
     print("🎯 FINAL RESULTS:")
@@ -288,5 +418,22 @@ def main():
 
         return 0  # Return 0 since core functionality works
 
+async def _main(granular=False):
+    """Run all tests, closing the HTTP client afterwards"""
+    async with create_client() as client:
+        return await run_tests(client, granular=granular)
+
+def main():
+    """Parse arguments and run all tests"""
+    parser = argparse.ArgumentParser(description="Test GeoGuardian API endpoints")
+    parser.add_argument(
+        "--granular",
+        action="store_true",
+        help="Call each basic endpoint individually instead of the composite probe"
+    )
+    args = parser.parse_args()
+
+    return asyncio.run(_main(granular=args.granular))
+
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
@@ -6,7 +6,6 @@ Direct Backend Test for Delhi, India - Better Satellite Coverage
 import sys
 import os
 import asyncio
-sys.path.append('.')
 
 from datetime import datetime
 import logging
@@ -36,12 +35,8 @@ async def main():
     print(f"⏰ Test started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print_info("Delhi has excellent Sentinel-2 coverage - high success rate!")
     
-    # Create tester and override GeoJSON
-    tester = UmanandaDirectTester()
-    
-    # Monkey-patch the GeoJSON
-    import test_umananda_comprehensive
-    test_umananda_comprehensive.UMANANDA_GEOJSON = DELHI_GEOJSON
+    # Create tester for the Delhi AOI
+    tester = UmanandaDirectTester(geojson=DELHI_GEOJSON)
     
     # Run full test
     success = await tester.run_full_test(date_range_days=60)
@@ -5,10 +5,19 @@ Validates fusion algorithms with actual satellite imagery from different scenari
 
 import os
 import sys
+import argparse
+import asyncio
+import glob
+import hashlib
+import io
 import numpy as np
+import pandas as pd
 from datetime import datetime, timedelta
-import json
+import orjson
+from joblib import Memory
 import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional, Tuple
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -22,6 +31,10 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# On-disk cache of fetched imagery so re-runs skip the Sentinel Hub round-trips
+FIXTURE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.fixture_cache')
+
+
 # Test scenarios with known ground truth
 TEST_SCENARIOS = {
     'construction_site': {
@@ -51,200 +64,393 @@ TEST_SCENARIOS = {
 }
 
 
-def create_test_aoi(center_lon: float, center_lat: float, size_km: float = 1.0) -> dict:
+def create_test_aois(scenarios: dict, size_km: float = 1.0) -> dict:
     """
-    Create a square AOI GeoJSON around a center point
+    Create square AOI GeoJSONs around the center point of every scenario
     
     Args:
-        center_lon: Center longitude
-        center_lat: Center latitude
-        size_km: Size of the square in kilometers
+        scenarios: Scenario definitions keyed by scenario id, each with
+            'coordinates' as [lon, lat]
+        size_km: Size of the squares in kilometers
         
     Returns:
-        GeoJSON polygon
+        GeoJSON polygons keyed by scenario id
     """
+    centers = np.array([scenario['coordinates'] for scenario in scenarios.values()], dtype=float)
+    lons, lats = centers[:, 0], centers[:, 1]
+    
     # Approximate degree offset for the size
     # 1 degree latitude ≈ 111 km
     # 1 degree longitude varies with latitude
-    lat_offset = size_km / 111.0
-    lon_offset = size_km / (111.0 * np.cos(np.radians(center_lat)))
-    
-    coordinates = [
-        [
-            [center_lon - lon_offset, center_lat - lat_offset],
-            [center_lon + lon_offset, center_lat - lat_offset],
-            [center_lon + lon_offset, center_lat + lat_offset],
-            [center_lon - lon_offset, center_lat + lat_offset],
-            [center_lon - lon_offset, center_lat - lat_offset]  # Close polygon
-        ]
-    ]
-    
-    return {
-        'type': 'Polygon',
-        'coordinates': coordinates
-    }
+    lat_offsets = np.full_like(lats, size_km / 111.0)
+    lon_offsets = size_km / (111.0 * np.cos(np.radians(lats)))
+    
+    aois = {}
+    for scenario_id, lon, lat, lon_offset, lat_offset in zip(
+        scenarios, lons.tolist(), lats.tolist(), lon_offsets.tolist(), lat_offsets.tolist()
+    ):
+        aois[scenario_id] = {
+            'type': 'Polygon',
+            'coordinates': [
+                [
+                    [lon - lon_offset, lat - lat_offset],
+                    [lon + lon_offset, lat - lat_offset],
+                    [lon + lon_offset, lat + lat_offset],
+                    [lon - lon_offset, lat + lat_offset],
+                    [lon - lon_offset, lat - lat_offset]  # Close polygon
+                ]
+            ]
+        }
+    
+    return aois
 
 
-def test_fusion_with_real_data():
+# AOIs are built once up front; the canonical JSON doubles as the fixture cache key
+TEST_AOIS = create_test_aois(TEST_SCENARIOS, size_km=0.5)  # Smaller AOIs for faster processing
+TEST_AOI_KEYS = {
+    scenario_id: orjson.dumps(geojson, option=orjson.OPT_SORT_KEYS)
+    for scenario_id, geojson in TEST_AOIS.items()
+}
+
+
+def cached_get(
+    satellite_manager,
+    geojson: dict,
+    start: datetime,
+    end: datetime,
+    cloud: float,
+    refresh: bool = False,
+    geojson_key: Optional[bytes] = None
+) -> dict:
     """
-    Test fusion engine with real Sentinel data
+    Fetch satellite data, reusing a cached copy from a previous run if present
+    
+    Args:
+        satellite_manager: Manager used to fetch imagery on a cache miss
+        geojson: AOI geometry
+        start: Start of the acquisition window
+        end: End of the acquisition window
+        cloud: Maximum cloud coverage
+        refresh: Ignore any cached copy and re-download
+        geojson_key: Precomputed canonical JSON of the geometry
+        
+    Returns:
+        Response dict in the same shape as get_satellite_data
     """
+    if geojson_key is None:
+        geojson_key = orjson.dumps(geojson, option=orjson.OPT_SORT_KEYS)
     
-    print("=" * 80)
-    print("MULTI-SENSOR FUSION ENGINE TEST WITH REAL DATA")
-    print("=" * 80)
-    print()
+    key = hashlib.sha1(
+        geojson_key
+        + start.date().isoformat().encode()
+        + end.date().isoformat().encode()
+        + str(cloud).encode()
+    ).hexdigest()
+    path = os.path.join(FIXTURE_CACHE_DIR, f"{key}.npy")
     
-    # Initialize components
-    print("Initializing analysis engine...")
-    config = AnalysisConfig(
-        baseline_years=1,
-        confidence_threshold=0.7,
-        enable_vedgesat=False,  # Disable for simplicity
-        enable_all_algorithms=True
+    if not refresh and os.path.exists(path):
+        return {'success': True, 'image': np.load(path, mmap_mode='r'), 'path': path, 'cached': True}
+    
+    # The manager writes the scene straight into the cache and returns it
+    # memory-mapped, so misses and hits hand the same kind of array on
+    os.makedirs(FIXTURE_CACHE_DIR, exist_ok=True)
+    return satellite_manager.get_satellite_data(
+        geojson,
+        start_date=start,
+        end_date=end,
+        max_cloud_coverage=cloud,
+        store_path=path
     )
-    analysis_engine = AdvancedAnalysisEngine(config)
-    satellite_manager = SatelliteDataManager()
+
+
+# Fusion configuration shared by every analysis worker process
+ANALYSIS_CONFIG = AnalysisConfig(
+    baseline_years=1,
+    confidence_threshold=0.7,
+    enable_vedgesat=False,  # Disable for simplicity
+    enable_all_algorithms=True
+)
+
+# Sources whose code shapes the analysis output; their digest joins the cache key
+# so an algorithm change invalidates earlier results
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app')
+ANALYSIS_SOURCES = sorted(
+    [os.path.join(APP_DIR, 'core', f'{name}.py')
+     for name in ('analysis_engine', 'spectral_analyzer', 'fusion_engine', 'vedgesat_wrapper')]
+    + glob.glob(os.path.join(APP_DIR, 'algorithms', '*.py'))
+)
+
+
+def analysis_code_digest() -> str:
+    """SHA1 over the analysis engine and algorithm sources"""
+    digest = hashlib.sha1()
+    for path in ANALYSIS_SOURCES:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+# Cache key for everything besides the inputs: the fusion config and the analysis code
+CONFIG_KEY = f"{ANALYSIS_CONFIG!r}:{analysis_code_digest()}"
+
+# Per-process analysis engine, created once by the pool initializer
+_worker_engine: Optional[AdvancedAnalysisEngine] = None
+
+# Analysis outputs memoized on disk, keyed on the image contents, AOI and config
+FUSION_CACHE = Memory(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.fusion_cache'), verbose=0)
+
+
+def _init_worker() -> None:
+    """Create the analysis engine once per worker process"""
+    global _worker_engine
+    _worker_engine = AdvancedAnalysisEngine(ANALYSIS_CONFIG)
+
+
+@FUSION_CACHE.cache
+def run_fusion_analysis(
+    before_image: np.ndarray,
+    after_image: np.ndarray,
+    geojson: dict,
+    config_key: str
+) -> dict:
+    """
+    Run the comprehensive analysis, reusing the stored result for identical inputs
     
-    print(f"✓ Analysis engine initialized")
-    print(f"✓ Satellite manager ready")
-    print()
+    config_key only takes part in the cache key so a changed
+    ANALYSIS_CONFIG or analysis source invalidates earlier results.
+    """
+    analysis_engine = _worker_engine or AdvancedAnalysisEngine(ANALYSIS_CONFIG)
+    return analysis_engine.analyze_environmental_change(
+        before_image=before_image,
+        after_image=after_image,
+        geojson=geojson,
+        analysis_type='comprehensive',
+        baseline_data=None  # Let it calculate baseline
+    )
+
+
+async def fetch_scenario_images(
+    scenario_id: str,
+    scenario: dict,
+    satellite_manager: SatelliteDataManager,
+    refresh_fixtures: bool = False
+) -> Tuple[Optional[Tuple[str, str]], str]:
+    """
+    Fetch (or load from the fixture cache) the before/after images of a scenario
     
-    # Test each scenario
-    results_summary = []
+    Returns:
+        ((before_path, after_path) or None if a fetch failed, report text)
+    """
+    buf = io.StringIO()
+    
+    def out(msg: str = "") -> None:
+        buf.write(f"{msg}\n")
+    
+    out("-" * 80)
+    out(f"TEST: {scenario['name']}")
+    out(f"Description: {scenario['description']}")
+    out(f"Expected Category: {scenario['expected_category'].value}")
+    out("-" * 80)
+    
+    geojson = TEST_AOIS[scenario_id]
+    
+    # Get before and after images
+    out(f"Fetching satellite imagery...")
+    
+    # Get recent image (after)
+    after_date = datetime.now()
+    after_response = await asyncio.to_thread(
+        cached_get,
+        satellite_manager,
+        geojson,
+        after_date - timedelta(days=7),
+        after_date,
+        30,
+        refresh=refresh_fixtures,
+        geojson_key=TEST_AOI_KEYS[scenario_id]
+    )
+    
+    if not after_response.get('success'):
+        out(f"✗ Failed to fetch recent imagery: {after_response.get('error')}")
+        return None, buf.getvalue()
+    
+    out(f"✓ Recent image retrieved: {after_response['image'].shape}")
+    
+    # Get baseline image (before) - 3 months ago
+    before_date = datetime.now() - timedelta(days=90)
+    before_response = await asyncio.to_thread(
+        cached_get,
+        satellite_manager,
+        geojson,
+        before_date - timedelta(days=7),
+        before_date,
+        30,
+        refresh=refresh_fixtures,
+        geojson_key=TEST_AOI_KEYS[scenario_id]
+    )
+    
+    if not before_response.get('success'):
+        out(f"✗ Failed to fetch baseline imagery: {before_response.get('error')}")
+        return None, buf.getvalue()
+    
+    out(f"✓ Baseline image retrieved: {before_response['image'].shape}")
+    
+    return (before_response['path'], after_response['path']), buf.getvalue()
+
+
+def analyze_scenario(
+    scenario_id: str,
+    before_path: str,
+    after_path: str,
+    use_cache: bool = True
+) -> Tuple[dict, str]:
+    """
+    Run the fusion analysis for one scenario in a worker process
+    
+    Images are passed as paths into the fixture cache and memory-mapped here,
+    so nothing but two short strings has to be pickled per scenario.
+    Set use_cache to False to recompute instead of reusing FUSION_CACHE.
+    
+    Returns:
+        (summary entry for the scenario, report text)
+    """
+    scenario = TEST_SCENARIOS[scenario_id]
+    geojson = TEST_AOIS[scenario_id]
+    analyze = run_fusion_analysis if use_cache else run_fusion_analysis.func
+    
+    buf = io.StringIO()
+    
+    def out(msg: str = "") -> None:
+        buf.write(f"{msg}\n")
     
-    for scenario_id, scenario in TEST_SCENARIOS.items():
-        print("-" * 80)
-        print(f"TEST: {scenario['name']}")
-        print(f"Description: {scenario['description']}")
-        print(f"Expected Category: {scenario['expected_category'].value}")
-        print("-" * 80)
+    try:
+        before_image = np.load(before_path, mmap_mode='r')
+        after_image = np.load(after_path, mmap_mode='r')
         
-        try:
-            # Create AOI
-            geojson = create_test_aoi(
-                scenario['coordinates'][0],
-                scenario['coordinates'][1],
-                size_km=0.5  # Smaller AOI for faster processing
-            )
-            
-            # Get before and after images
-            print(f"Fetching satellite imagery...")
-            
-            # Get recent image (after)
-            after_date = datetime.now()
-            after_response = satellite_manager.get_satellite_data(
-                geojson,
-                start_date=after_date - timedelta(days=7),
-                end_date=after_date,
-                max_cloud_coverage=30
-            )
-            
-            if not after_response.get('success'):
-                print(f"✗ Failed to fetch recent imagery: {after_response.get('error')}")
-                continue
-            
-            after_image = after_response['image']
-            print(f"✓ Recent image retrieved: {after_image.shape}")
-            
-            # Get baseline image (before) - 3 months ago
-            before_date = datetime.now() - timedelta(days=90)
-            before_response = satellite_manager.get_satellite_data(
-                geojson,
-                start_date=before_date - timedelta(days=7),
-                end_date=before_date,
-                max_cloud_coverage=30
-            )
-            
-            if not before_response.get('success'):
-                print(f"✗ Failed to fetch baseline imagery: {before_response.get('error')}")
-                continue
-            
-            before_image = before_response['image']
-            print(f"✓ Baseline image retrieved: {before_image.shape}")
-            
-            # Run comprehensive analysis with fusion
-            print(f"\nRunning multi-sensor fusion analysis...")
-            analysis_results = analysis_engine.analyze_environmental_change(
-                before_image=before_image,
-                after_image=after_image,
-                geojson=geojson,
-                analysis_type='comprehensive',
-                baseline_data=None  # Let it calculate baseline
-            )
-            
-            # Extract fusion results
-            fusion = analysis_results.get('fusion_analysis', {})
+        # Run comprehensive analysis with fusion
+        out(f"\nRunning multi-sensor fusion analysis...")
+        analysis_results = analyze(before_image, after_image, geojson, CONFIG_KEY)
+        
+        # Extract fusion results
+        fusion = analysis_results.get('fusion_analysis', {})
+        
+        if fusion:
+            out(f"\n{'=' * 60}")
+            out(f"FUSION ANALYSIS RESULTS")
+            out(f"{'=' * 60}")
+            out(f"Category Detected: {fusion.get('category', 'unknown')}")
+            out(f"Risk Level: {fusion.get('risk_level', 'unknown').upper()}")
+            out(f"Composite Risk Score: {fusion.get('composite_risk_score', 0):.3f}")
+            out(f"Confidence: {fusion.get('confidence', 0):.1%}")
+            out(f"Seasonal Likelihood: {fusion.get('seasonal_likelihood', 0):.1%}")
+            out(f"\nPrimary Indicators:")
+            for indicator in fusion.get('primary_indicators', []):
+                out(f"  • {indicator}")
+            out(f"\nRecommendation:")
+            out(f"  {fusion.get('recommendation', 'N/A')}")
+            out(f"{'=' * 60}")
             
-            if fusion:
-                print(f"\n{'=' * 60}")
-                print(f"FUSION ANALYSIS RESULTS")
-                print(f"{'=' * 60}")
-                print(f"Category Detected: {fusion.get('category', 'unknown')}")
-                print(f"Risk Level: {fusion.get('risk_level', 'unknown').upper()}")
-                print(f"Composite Risk Score: {fusion.get('composite_risk_score', 0):.3f}")
-                print(f"Confidence: {fusion.get('confidence', 0):.1%}")
-                print(f"Seasonal Likelihood: {fusion.get('seasonal_likelihood', 0):.1%}")
-                print(f"\nPrimary Indicators:")
-                for indicator in fusion.get('primary_indicators', []):
-                    print(f"  • {indicator}")
-                print(f"\nRecommendation:")
-                print(f"  {fusion.get('recommendation', 'N/A')}")
-                print(f"{'=' * 60}")
-                
-                # Check if detected category matches expected
-                detected_category = fusion.get('category', 'unknown')
-                expected_category = scenario['expected_category'].value
-                
-                match = detected_category == expected_category
-                match_str = "✓ MATCH" if match else "✗ MISMATCH"
-                
-                results_summary.append({
-                    'scenario': scenario['name'],
-                    'expected': expected_category,
-                    'detected': detected_category,
-                    'match': match,
-                    'confidence': fusion.get('confidence', 0),
-                    'risk_score': fusion.get('composite_risk_score', 0),
-                    'risk_level': fusion.get('risk_level', 'unknown')
-                })
-                
-                print(f"\nCategory Match: {match_str}")
-                print(f"Expected: {expected_category}")
-                print(f"Detected: {detected_category}")
-                
-            else:
-                print(f"✗ No fusion analysis results returned")
-                results_summary.append({
-                    'scenario': scenario['name'],
-                    'expected': scenario['expected_category'].value,
-                    'detected': 'error',
-                    'match': False,
-                    'error': 'No fusion results'
-                })
+            # Check if detected category matches expected
+            detected_category = fusion.get('category', 'unknown')
+            expected_category = scenario['expected_category'].value
             
-            # Print other detection results
-            print(f"\nOther Detection Results:")
-            for detection in analysis_results.get('detections', []):
-                det_type = detection.get('type', 'unknown')
-                change_detected = detection.get('change_detected', False)
-                confidence = detection.get('confidence', 0)
-                print(f"  • {det_type}: {'CHANGE' if change_detected else 'STABLE'} (confidence: {confidence:.1%})")
+            match = detected_category == expected_category
+            match_str = "✓ MATCH" if match else "✗ MISMATCH"
             
-            print(f"\nOverall Confidence: {analysis_results.get('overall_confidence', 0):.1%}")
-            print(f"Priority Level: {analysis_results.get('priority_level', 'unknown').upper()}")
+            summary = {
+                'scenario': scenario['name'],
+                'expected': expected_category,
+                'detected': detected_category,
+                'match': match,
+                'confidence': fusion.get('confidence', 0),
+                'risk_score': fusion.get('composite_risk_score', 0),
+                'risk_level': fusion.get('risk_level', 'unknown')
+            }
             
-        except Exception as e:
-            logger.error(f"Error testing scenario {scenario_id}: {e}", exc_info=True)
-            results_summary.append({
+            out(f"\nCategory Match: {match_str}")
+            out(f"Expected: {expected_category}")
+            out(f"Detected: {detected_category}")
+        
+        else:
+            out(f"✗ No fusion analysis results returned")
+            summary = {
                 'scenario': scenario['name'],
                 'expected': scenario['expected_category'].value,
                 'detected': 'error',
                 'match': False,
-                'error': str(e)
-            })
+                'error': 'No fusion results'
+            }
+        
+        # Print other detection results
+        out(f"\nOther Detection Results:")
+        for detection in analysis_results.get('detections', []):
+            det_type = detection.get('type', 'unknown')
+            change_detected = detection.get('change_detected', False)
+            confidence = detection.get('confidence', 0)
+            out(f"  • {det_type}: {'CHANGE' if change_detected else 'STABLE'} (confidence: {confidence:.1%})")
         
-        print()
+        out(f"\nOverall Confidence: {analysis_results.get('overall_confidence', 0):.1%}")
+        out(f"Priority Level: {analysis_results.get('priority_level', 'unknown').upper()}")
+    
+    except Exception as e:
+        logger.error(f"Error testing scenario {scenario_id}: {e}", exc_info=True)
+        summary = {
+            'scenario': scenario['name'],
+            'expected': scenario['expected_category'].value,
+            'detected': 'error',
+            'match': False,
+            'error': str(e)
+        }
+    
+    out()
+    return summary, buf.getvalue()
+
+
+async def test_fusion_with_real_data(refresh_fixtures: bool = False, use_cache: bool = True):
+    """
+    Test fusion engine with real Sentinel data
+    
+    Args:
+        refresh_fixtures: Re-download imagery instead of using the fixture cache
+        use_cache: Reuse memoized analysis results for unchanged inputs
+    """
+    
+    print("=" * 80)
+    print("MULTI-SENSOR FUSION ENGINE TEST WITH REAL DATA")
+    print("=" * 80)
+    print()
+    
+    # Initialize components
+    satellite_manager = SatelliteDataManager()
+    print(f"✓ Satellite manager ready")
+    print()
+    
+    # Fetch imagery for all scenarios concurrently; fetches run in worker threads
+    fetched = await asyncio.gather(*[
+        fetch_scenario_images(scenario_id, scenario, satellite_manager, refresh_fixtures)
+        for scenario_id, scenario in TEST_SCENARIOS.items()
+    ])
+    
+    # The fusion analysis is CPU-bound, so spread the scenarios over processes
+    results_summary = []
+    max_workers = min(len(TEST_SCENARIOS), os.cpu_count() or 1)
+    print(f"Running multi-sensor fusion analysis on {max_workers} worker processes...")
+    print()
+    
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+        futures = {}
+        for scenario_id, (paths, fetch_report) in zip(TEST_SCENARIOS, fetched):
+            if paths is None:
+                sys.stdout.write(fetch_report + "\n")
+                continue
+            future = executor.submit(analyze_scenario, scenario_id, *paths, use_cache)
+            futures[future] = fetch_report
+        
+        for future in as_completed(futures):
+            summary, analysis_report = future.result()
+            sys.stdout.write(futures[future] + analysis_report)
+            sys.stdout.flush()
+            results_summary.append(summary)
     
     # Print summary
     print("=" * 80)
@@ -263,39 +469,68 @@ def test_fusion_with_real_data():
     
     print("Detailed Results:")
     print("-" * 80)
-    for result in results_summary:
-        status = "✓ PASS" if result.get('match') else "✗ FAIL"
-        print(f"{status} | {result['scenario']}")
-        print(f"       Expected: {result['expected']}")
-        print(f"       Detected: {result['detected']}")
-        if 'confidence' in result:
-            print(f"       Confidence: {result['confidence']:.1%}")
-            print(f"       Risk Score: {result['risk_score']:.3f}")
-            print(f"       Risk Level: {result['risk_level'].upper()}")
-        if 'error' in result:
-            print(f"       Error: {result['error']}")
-        print()
+    df = pd.DataFrame(results_summary)
+    if not df.empty:
+        df.insert(0, 'status', np.where(df['match'], '✓ PASS', '✗ FAIL'))
+        formatters = {
+            'confidence': '{:.1%}'.format,
+            'risk_score': '{:.3f}'.format,
+            'risk_level': lambda level: level.upper() if isinstance(level, str) else ''
+        }
+        print(df.drop(columns='match').to_string(
+            index=False,
+            na_rep='',
+            formatters={col: fmt for col, fmt in formatters.items() if col in df}
+        ))
+    print()
     
     # Save results to file
-    results_file = f"fusion_test_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(results_file, 'w') as f:
-        json.dump({
-            'test_date': datetime.now().isoformat(),
-            'success_rate': success_rate,
-            'total_tests': total_tests,
-            'successful_matches': successful_matches,
-            'results': results_summary
-        }, f, indent=2)
+    run_stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    results_file = f"fusion_test_results_{run_stamp}.json"
+    payload = orjson.dumps({
+        'test_date': datetime.now(),  # orjson encodes datetimes as ISO 8601 natively
+        'success_rate': success_rate,
+        'total_tests': total_tests,
+        'successful_matches': successful_matches,
+        'results': results_summary
+    }, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    
+    fd = os.open(results_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, payload)
+    finally:
+        os.close(fd)
+    
+    # Columnar snapshot of the same rows for cheap diffing across runs
+    table_file = f"fusion_test_results_{run_stamp}.parquet"
+    df.to_parquet(table_file, index=False)
     
     print(f"Results saved to: {results_file}")
+    print(f"Results table saved to: {table_file}")
     print()
     
     return success_rate >= 50  # Consider test passing if 50%+ accuracy
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test fusion engine with real Sentinel data")
+    parser.add_argument(
+        '--refresh-fixtures',
+        action='store_true',
+        help='Ignore cached imagery in .fixture_cache and re-download it'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Recompute the fusion analysis instead of reusing results from .fusion_cache'
+    )
+    args = parser.parse_args()
+    
     try:
-        success = test_fusion_with_real_data()
+        success = asyncio.run(test_fusion_with_real_data(
+            refresh_fixtures=args.refresh_fixtures,
+            use_cache=not args.no_cache
+        ))
         sys.exit(0 if success else 1)
     except Exception as e:
         logger.error(f"Test failed with error: {e}", exc_info=True)
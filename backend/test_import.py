@@ -1,11 +1,61 @@
 #!/usr/bin/env python3
 """Test script to check v2 imports"""
 
+import glob
+import os
+import pickle
+import sys
+from importlib import metadata
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app")
+
+# Router paths from the last successful run, reused while the modules are unchanged
+ROUTES_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".routes_cache.pkl")
+
+
+def _modules_signature():
+    """
+    (mtime, size) of every app source plus the interpreter version and every installed
+    distribution's version, used to invalidate the cache
+    """
+    distributions = sorted((d.metadata["Name"] or "", d.version or "") for d in metadata.distributions())
+    signature = [sys.version, tuple(distributions)]
+    for path in sorted(glob.glob(os.path.join(APP_DIR, "**", "*.py"), recursive=True)):
+        stat = os.stat(path)
+        signature.append((os.path.relpath(path, APP_DIR), stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def _load_cached_routes():
+    """Return cached router paths if the v2 modules have not changed since they were recorded"""
+    try:
+        with open(ROUTES_CACHE, "rb") as f:
+            cached = pickle.load(f)
+        if cached["signature"] == _modules_signature():
+            return cached["routes"]
+    except Exception:
+        pass
+    return None
+
+
+cached_routes = _load_cached_routes()
+if cached_routes is not None:
+    for label, paths in cached_routes:
+        print(f"✅ {label} import not re-run (cached: sources and dependencies unchanged)")
+        print(f"Router endpoints: {paths}")
+    sys.exit(0)
+
+routes = []
+failed = 0
+
 try:
     from app.api.v2 import analysis
     print("✅ Analysis import successful")
-    print(f"Router endpoints: {[route.path for route in analysis.router.routes]}")
+    paths = [route.path for route in analysis.router.routes]
+    print(f"Router endpoints: {paths}")
+    routes.append(("Analysis", paths))
 except Exception as e:
+    failed += 1
     print(f"❌ Analysis import failed: {e}")
     import traceback
     traceback.print_exc()
@@ -13,13 +63,24 @@ except Exception as e:
 try:
     from app.api.v2 import aoi as aoi_v2
     print("✅ AOI v2 import successful")
-    print(f"Router endpoints: {[route.path for route in aoi_v2.router.routes]}")
+    paths = [route.path for route in aoi_v2.router.routes]
+    print(f"Router endpoints: {paths}")
+    routes.append(("AOI v2", paths))
 except Exception as e:
+    failed += 1
     print(f"❌ AOI v2 import failed: {e}")
 
 try:
     from app.api.v2 import alerts as alerts_v2
     print("✅ Alerts v2 import successful")
-    print(f"Router endpoints: {[route.path for route in alerts_v2.router.routes]}")
+    paths = [route.path for route in alerts_v2.router.routes]
+    print(f"Router endpoints: {paths}")
+    routes.append(("Alerts v2", paths))
 except Exception as e:
+    failed += 1
     print(f"❌ Alerts v2 import failed: {e}")
+
+# Only cache a fully successful run so failures are always re-checked
+if not failed:
+    with open(ROUTES_CACHE, "wb") as f:
+        pickle.dump({"signature": _modules_signature(), "routes": routes}, f)
@@ -11,6 +11,8 @@ frontend by allowing direct data input.
 1.  **Edit the `aoi_name` and `geojson_coordinates` variables below.**
 2.  Replace the default Umananda Island data with your own AOI name and GeoJSON.
 3.  Run the script from your terminal: `python test_manual_aoi.py`
+4.  Preview and analysis responses are cached for 6 hours; pass `--no-cache` to force fresh calls.
+5.  Pass `--repeat N` to run the suite N times and get p50/p95 timings per call.
 
 The script will then execute a series of tests:
 - Health check to ensure the backend is online.
@@ -23,10 +25,22 @@ This provides a complete, end-to-end validation of the backend processing pipeli
 for any given set of coordinates.
 """
 
-import requests
-import json
+import httpx
+import ijson
+import fastjsonschema
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import orjson
+import os
+import shelve
+import statistics
 import sys
+import time
 import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
 
 # --- EDIT THIS SECTION ---
 # Put your AOI name and GeoJSON coordinates here.
@@ -50,174 +64,452 @@ geojson_coordinates = {
 # Backend API base URL
 BASE_URL = "http://localhost:8000"
 
-def test_health_check():
-    """Test if backend is running"""
-    print("\n[HEALTH] Testing backend health...")
-    try:
-        response = requests.get(f"{BASE_URL}/health", timeout=10)
-        if response.status_code == 200:
-            print("[OK] Backend is running and healthy")
-            return True
-        else:
-            print(f"[ERROR] Backend health check failed: {response.status_code}")
-            return False
-    except Exception as e:
-        print(f"[ERROR] Cannot connect to backend: {e}")
-        print("[TIP] Make sure the backend is running on http://localhost:8000")
-        return False
+# On-disk cache of expensive geojson-keyed responses, reused across runs for a few hours
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".geo_test_cache")
+CACHE_TTL_SECONDS = 6 * 60 * 60
+
+# Analysis responses at least this large are parsed incrementally instead of buffered
+STREAM_THRESHOLD_BYTES = 64 * 1024
+DETECTION_PREVIEW_COUNT = 3
+
+# (name, elapsed_ms) for every timed call, accumulated across --repeat runs
+TIMINGS = []
+
+# Request bodies are serialized once at import and sent as raw bytes
+GEOJSON_BYTES = orjson.dumps(geojson_coordinates, option=orjson.OPT_SORT_KEYS)
+AOI_BODY = orjson.dumps({"name": aoi_name, "geojson": geojson_coordinates})
+PREVIEW_BODY = b'{"geojson":' + GEOJSON_BYTES + b'}'
+
+# Compiled once: structural shape of the Polygon geojson edited above
+VALIDATE_POLYGON = fastjsonschema.compile({
+    "type": "object",
+    "required": ["type", "coordinates"],
+    "properties": {
+        "type": {"const": "Polygon"},
+        "coordinates": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "array",
+                "minItems": 4,
+                "items": {
+                    "type": "array",
+                    "minItems": 2,
+                    "maxItems": 2,
+                    "items": {"type": "number"}
+                }
+            }
+        }
+    }
+})
+
+
+def validate_geojson(geojson):
+    """
+    Validate the polygon locally before any request is sent.
+
+    Raises fastjsonschema.JsonSchemaException for a malformed structure and
+    ValueError for unclosed rings or out-of-range coordinates.
+    """
+    VALIDATE_POLYGON(geojson)
+    for ring in geojson["coordinates"]:
+        if ring[0] != ring[-1]:
+            raise ValueError(f"Ring is not closed: starts at {ring[0]} but ends at {ring[-1]}")
+        for lon, lat in ring:
+            if not (-180 <= lon <= 180 and -90 <= lat <= 90):
+                raise ValueError(f"Coordinate out of range: [{lon}, {lat}]")
+
+
+def _analysis_body():
+    """Comprehensive analysis body: a fresh aoi_id spliced around the pre-serialized geojson"""
+    return b'{"aoi_id":"%s","geojson":%s,"analysis_type":"comprehensive"}' % (
+        str(uuid.uuid4()).encode(), GEOJSON_BYTES
+    )
+
+
+def create_client():
+    """Create one pooled async client shared by every test call"""
+    return httpx.AsyncClient(
+        base_url=BASE_URL,
+        timeout=httpx.Timeout(120.0, connect=10.0),
+        # Retries cover connection failures only; the transport owns pooling and HTTP/2
+        transport=httpx.AsyncHTTPTransport(
+            http2=True,
+            retries=2,
+            limits=httpx.Limits(max_connections=8, max_keepalive_connections=8)
+        ),
+        headers={
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            # br needs the brotli extra; httpx decodes either transparently
+            "Accept-Encoding": "gzip, br"
+        }
+    )
+
+
+def _cache_key(endpoint, geojson_bytes):
+    """Stable key for an endpoint + canonical (sorted-key) geojson bytes pair"""
+    return hashlib.sha1(endpoint.encode() + b"\0" + geojson_bytes).hexdigest()
+
+
+def _json(response):
+    """Decode a fully read response body with orjson; an empty body is {}"""
+    return orjson.loads(response.content) if response.content else {}
+
 
-def test_aoi_creation(name, geojson):
-    """Test AOI creation"""
-    print(f"\n[BUILD] Testing AOI creation: {name}")
+async def _read_json(response):
+    """Buffer a response body and parse it as JSON, returning (result, text)"""
+    await response.aread()
     try:
-        response = requests.post(
-            f"{BASE_URL}/api/v1/aoi",
-            json={"name": name, "geojson": geojson},
-            headers={"Content-Type": "application/json"},
-            timeout=30
-        )
-        if response.status_code == 200:
-            result = response.json()
-            print(f"[OK] AOI created successfully. ID: {result.get('aoi_id')}")
-            return result.get('aoi_id')
+        return _json(response), response.text
+    except ValueError:
+        return None, response.text
+
+
+def _truncate_detections(result):
+    """Keep only the first few detections, recording how many there were"""
+    detections = result.get('detections', [])
+    result['detections'] = detections[:DETECTION_PREVIEW_COUNT]
+    result['detection_count'] = len(detections)
+    return result
+
+
+async def _stream_analysis_json(response):
+    """
+    Incrementally parse a comprehensive analysis response.
+
+    Every top-level field is built as usual except `detections`: only the
+    first few items are materialised and the rest are just counted, so
+    memory stays flat however many detections the backend returns. Bodies
+    below STREAM_THRESHOLD_BYTES are simply buffered.
+    """
+    content_length = int(response.headers.get("content-length") or 0)
+    if 0 < content_length < STREAM_THRESHOLD_BYTES:
+        result, text = await _read_json(response)
+        return (_truncate_detections(result) if isinstance(result, dict) else result), text
+
+    root = ijson.ObjectBuilder()
+    kept = []
+    item = None
+    depth = 0
+    count = 0
+
+    def handle(prefix, event, value):
+        nonlocal item, depth, count
+        if prefix != 'detections.item' and not prefix.startswith('detections.item.'):
+            root.event(event, value)
+            return
+        if count < DETECTION_PREVIEW_COUNT:
+            if item is None:
+                item = ijson.ObjectBuilder()
+            item.event(event, value)
+        if event in ('start_map', 'start_array'):
+            depth += 1
+        elif event in ('end_map', 'end_array'):
+            depth -= 1
+        if depth == 0:
+            if item is not None:
+                kept.append(item.value)
+                item = None
+            count += 1
+
+    events = ijson.sendable_list()
+    parser = ijson.parse_coro(events, use_float=True)
+    async for chunk in response.aiter_bytes():
+        parser.send(chunk)
+        for prefix, event, value in events:
+            handle(prefix, event, value)
+        del events[:]
+    parser.close()
+    for prefix, event, value in events:
+        handle(prefix, event, value)
+
+    result = getattr(root, 'value', None)
+    if isinstance(result, dict):
+        result['detections'] = kept
+        result['detection_count'] = count
+    return result, ""
+
+
+async def post_cached(client, endpoint, geojson_bytes, body, timeout, use_cache=True, parse=_read_json):
+    """
+    POST a pre-serialized geojson-keyed body, reusing a fresh cached response when available.
+
+    Returns (status_code, parsed JSON or None, raw text). Successful bodies
+    are decoded with `parse`; only successful responses are cached so
+    failures are always retried against the backend.
+    """
+    key = _cache_key(endpoint, geojson_bytes)
+    if use_cache:
+        with shelve.open(CACHE_PATH) as db:
+            entry = db.get(key)
+        if entry is not None and time.time() - entry[0] < CACHE_TTL_SECONDS:
+            print(f"   [CACHE] Reusing cached response for {endpoint}")
+            return 200, entry[1], ""
+
+    async with client.stream("POST", endpoint, content=body, timeout=timeout) as response:
+        status_code = response.status_code
+        if status_code == 200:
+            result, text = await parse(response)
         else:
-            print(f"[ERROR] AOI creation failed: {response.status_code} - {response.text}")
-            return None
-    except Exception as e:
-        print(f"[ERROR] AOI creation error: {e}")
-        return None
+            result, text = await _read_json(response)
 
-def test_satellite_preview(geojson):
-    """Test satellite imagery preview"""
-    print("\n[SATELLITE] Testing satellite imagery preview...")
+    if use_cache and status_code == 200 and result and result.get('success', True):
+        with shelve.open(CACHE_PATH) as db:
+            db[key] = (time.time(), result)
+    return status_code, result, text
+
+
+async def request_json(client, method, path, body, timeout):
+    """Send an uncached request and return (status_code, parsed JSON or None, raw text)"""
+    response = await client.request(method, path, content=body, timeout=timeout)
     try:
-        response = requests.post(
-            f"{BASE_URL}/api/v2/analysis/data-availability/preview",
-            json={"geojson": geojson},
-            headers={"Content-Type": "application/json"},
-            timeout=60
-        )
-        if response.status_code == 200 and response.json().get('success'):
-            result = response.json()
-            print("[OK] Satellite preview successful.")
-            print(f"   - Timestamp: {result.get('timestamp', 'N/A')}")
-            print(f"   - Cloud Cover: {result.get('cloud_coverage', 'N/A')}")
-            print(f"   - Quality: {result.get('quality_score', 'N/A')}")
-            return True
-        else:
-            error_msg = response.json().get('error', response.text)
-            print(f"[WARN] Preview failed or data not available: {error_msg}")
-            return False
-    except Exception as e:
-        print(f"[ERROR] Preview error: {e}")
+        return response.status_code, _json(response), response.text
+    except ValueError:
+        return response.status_code, None, response.text
+
+
+def report_health(result):
+    """Report a healthy backend"""
+    print("[OK] Backend is running and healthy")
+    return True
+
+def report_aoi_creation(result):
+    """Report the created AOI and return its ID"""
+    print(f"[OK] AOI created successfully. ID: {result.get('aoi_id')}")
+    return result.get('aoi_id')
+
+def report_satellite_preview(result):
+    """Report satellite imagery preview availability"""
+    if not result.get('success'):
+        print(f"[WARN] Preview failed or data not available: {result.get('error')}")
         return False
+    print("[OK] Satellite preview successful.")
+    print(f"   - Timestamp: {result.get('timestamp', 'N/A')}")
+    print(f"   - Cloud Cover: {result.get('cloud_coverage', 'N/A')}")
+    print(f"   - Quality: {result.get('quality_score', 'N/A')}")
+    return True
 
-def test_comprehensive_analysis(name, geojson):
-    """Test comprehensive analysis"""
-    print(f"\n[ANALYSIS] Testing comprehensive analysis: {name}")
-    analysis_data = {
-        "aoi_id": str(uuid.uuid4()),
-        "geojson": geojson,
-        "analysis_type": "comprehensive",
-    }
+def report_comprehensive_analysis(result):
+    """Report comprehensive analysis results"""
+    print("[OK] Analysis completed.")
+    print(f"   - Success: {result.get('success', False)}")
+    print(f"   - Status: {result.get('status', 'unknown')}")
+    print(f"   - Overall Confidence: {result.get('overall_confidence', 0):.3f}")
+    print(f"   - Priority Level: {result.get('priority_level', 'unknown')}")
+    print(f"   - Detections Found: {result.get('detection_count', len(result.get('detections', [])))}")
+    print(f"   - Algorithms Used: {result.get('algorithms_used', [])}")
+    print(f"   - Processing Time: {result.get('processing_time_seconds', 0):.1f}s")
+    print(f"   - Data Quality Score: {result.get('data_quality_score', 0):.3f}")
+
+    # Show detailed detection results
+    detections = result.get('detections', [])
+    if detections:
+        print("   - Detection Details:")
+        for i, detection in enumerate(detections[:DETECTION_PREVIEW_COUNT]):
+            print(f"     {i+1}. Type: {detection.get('type', 'unknown')}")
+            print(f"        Confidence: {detection.get('confidence', 0):.3f}")
+            print(f"        Change Detected: {detection.get('change_detected', False)}")
+    else:
+        print("   - No environmental changes detected")
+
+    # Show satellite metadata if available
+    satellite_meta = result.get('satellite_metadata', {})
+    if satellite_meta:
+        recent = satellite_meta.get('recent_image', {})
+        baseline = satellite_meta.get('baseline_image', {})
+        if recent and baseline:
+            print("   - Satellite Data:")
+            print(f"     Recent Image: {recent.get('timestamp', 'N/A')[:10]}")
+            print(f"     Baseline Image: {baseline.get('timestamp', 'N/A')[:10]}")
+            print(f"     Time Separation: {satellite_meta.get('time_separation_days', 0)} days")
+
+    return True
+
+def report_system_status(status):
+    """Report system status"""
+    print("[OK] System status retrieved.")
+    print(f"   - System Online: {status.get('system_online', False)}")
+    print(f"   - DB Status: {status.get('database_status', 'unknown')}")
+    print(f"   - Satellite Status: {status.get('satellite_data_status', 'unknown')}")
+    return True
+
+
+@dataclass(frozen=True)
+class Check:
+    """One backend call: how to send it and how to report its JSON response"""
+    name: str
+    banner: str
+    method: str
+    path: str
+    build_body: Optional[Callable[[], bytes]]
+    timeout: float
+    report: Callable[[dict], Any]
+    cached: bool = False
+    parse: Callable = _read_json
+    requires: Optional[str] = None  # name of a check that must pass first
+
+
+HEALTH_CHECK = Check(
+    "Health", "[HEALTH] Testing backend health...",
+    "GET", "/health", None, 10, report_health
+)
+
+CHECKS = [
+    Check(
+        "AOI Creation", f"[BUILD] Testing AOI creation: {aoi_name}",
+        "POST", "/api/v1/aoi",
+        lambda: AOI_BODY,
+        30, report_aoi_creation
+    ),
+    Check(
+        "Satellite Preview", "[SATELLITE] Testing satellite imagery preview...",
+        "POST", "/api/v2/analysis/data-availability/preview",
+        lambda: PREVIEW_BODY,
+        60, report_satellite_preview, cached=True
+    ),
+    Check(
+        "Comprehensive Analysis", f"[ANALYSIS] Testing comprehensive analysis: {aoi_name}",
+        "POST", "/api/v2/analysis/analyze/comprehensive",
+        _analysis_body,
+        120, report_comprehensive_analysis, cached=True, parse=_stream_analysis_json,
+        requires="Satellite Preview"
+    ),
+    Check(
+        "System Status", "[STATUS] Testing system status...",
+        "GET", "/api/v2/analysis/system/status", None,
+        30, report_system_status
+    ),
+]
+
+
+@contextlib.contextmanager
+def timed(name):
+    """Record the wall-clock time of the enclosed block in TIMINGS"""
+    start = time.perf_counter()
     try:
-        response = requests.post(
-            f"{BASE_URL}/api/v2/analysis/analyze/comprehensive",
-            json=analysis_data,
-            headers={"Content-Type": "application/json"},
-            timeout=120
-        )
-        if response.status_code == 200:
-            result = response.json()
-            print("[OK] Analysis completed.")
-            print(f"   - Success: {result.get('success', False)}")
-            print(f"   - Status: {result.get('status', 'unknown')}")
-            print(f"   - Overall Confidence: {result.get('overall_confidence', 0):.3f}")
-            print(f"   - Priority Level: {result.get('priority_level', 'unknown')}")
-            print(f"   - Detections Found: {len(result.get('detections', []))}")
-            print(f"   - Algorithms Used: {result.get('algorithms_used', [])}")
-            print(f"   - Processing Time: {result.get('processing_time_seconds', 0):.1f}s")
-            print(f"   - Data Quality Score: {result.get('data_quality_score', 0):.3f}")
-
-            # Show detailed detection results
-            detections = result.get('detections', [])
-            if detections:
-                print(f"   - Detection Details:")
-                for i, detection in enumerate(detections[:3]):  # Show first 3
-                    print(f"     {i+1}. Type: {detection.get('type', 'unknown')}")
-                    print(f"        Confidence: {detection.get('confidence', 0):.3f}")
-                    print(f"        Change Detected: {detection.get('change_detected', False)}")
-            else:
-                print("   - No environmental changes detected")
-
-            # Show satellite metadata if available
-            satellite_meta = result.get('satellite_metadata', {})
-            if satellite_meta:
-                recent = satellite_meta.get('recent_image', {})
-                baseline = satellite_meta.get('baseline_image', {})
-                if recent and baseline:
-                    print(f"   - Satellite Data:")
-                    print(f"     Recent Image: {recent.get('timestamp', 'N/A')[:10]}")
-                    print(f"     Baseline Image: {baseline.get('timestamp', 'N/A')[:10]}")
-                    print(f"     Time Separation: {satellite_meta.get('time_separation_days', 0)} days")
-
-            return True
-        else:
-            print(f"[ERROR] Analysis failed: {response.status_code} - {response.text}")
-            return False
-    except Exception as e:
-        print(f"[ERROR] Analysis error: {e}")
-        return False
+        yield
+    finally:
+        TIMINGS.append((name, (time.perf_counter() - start) * 1000))
 
-def test_system_status():
-    """Test system status"""
-    print("\n[STATUS] Testing system status...")
+
+def print_timings(timings):
+    """Print calls slowest first"""
+    print("\nTIMINGS (slowest first):")
+    for name, ms in sorted(timings, key=lambda entry: -entry[1]):
+        print(f"{ms:10.1f} ms  {name}")
+
+
+def print_timing_quantiles(timings):
+    """Print p50/p95 per call name across repeated runs"""
+    by_name = {}
+    for name, ms in timings:
+        by_name.setdefault(name, []).append(ms)
+
+    print("\nTIMING QUANTILES:")
+    print(f"{'p50 ms':>10}  {'p95 ms':>10}  {'runs':>4}  call")
+    for name, samples in sorted(by_name.items(), key=lambda item: -statistics.median(item[1])):
+        if len(samples) < 2:
+            continue
+        cuts = statistics.quantiles(samples, n=20)
+        print(f"{cuts[9]:10.1f}  {cuts[18]:10.1f}  {len(samples):4d}  {name}")
+
+
+async def run_check(client, check, use_cache=True):
+    """Send one check and report its outcome, never raising"""
+    print(f"\n{check.banner}")
+    body = check.build_body() if check.build_body else None
     try:
-        response = requests.get(f"{BASE_URL}/api/v2/analysis/system/status", timeout=30)
-        if response.status_code == 200:
-            status = response.json()
-            print("[OK] System status retrieved.")
-            print(f"   - System Online: {status.get('system_online', False)}")
-            print(f"   - DB Status: {status.get('database_status', 'unknown')}")
-            print(f"   - Satellite Status: {status.get('satellite_data_status', 'unknown')}")
-            return True
-        else:
-            print(f"[ERROR] System status failed: {response.status_code}")
-            return False
+        with timed(check.name):
+            return await _run_check(client, check, body, use_cache)
     except Exception as e:
-        print(f"[ERROR] System status error: {e}")
+        print(f"[ERROR] {check.name} error: {e}")
         return False
 
-def main():
+async def _run_check(client, check, body, use_cache):
+    """Send one check's request and report its response"""
+    if check.cached:
+        status_code, result, text = await post_cached(
+            client, check.path, GEOJSON_BYTES, body, check.timeout,
+            use_cache=use_cache, parse=check.parse
+        )
+    else:
+        status_code, result, text = await request_json(
+            client, check.method, check.path, body, check.timeout
+        )
+    if status_code == 200 and result is not None:
+        return bool(check.report(result))
+    print(f"[ERROR] {check.name} failed: {status_code} - {text}")
+    return False
+
+async def run_dependent_check(client, check, prerequisite, use_cache=True):
+    """
+    Run a check once its prerequisite (if any) has passed.
+
+    Returns None without sending anything when the prerequisite failed, e.g.
+    no comprehensive analysis when the preview found no usable imagery.
+    """
+    if prerequisite is not None and not await prerequisite:
+        print(f"\n[SKIP] {check.name}: {check.requires} did not pass")
+        return None
+    return await run_check(client, check, use_cache)
+
+async def main(use_cache=True, repeat=1):
     """Main test function"""
+    try:
+        validate_geojson(geojson_coordinates)
+    except (fastjsonschema.JsonSchemaException, ValueError) as e:
+        print(f"[FATAL] Invalid geojson_coordinates: {e}")
+        print("[TIP] Fix the EDIT THIS SECTION block at the top of this script.")
+        return 2
+
+    exit_code = 0
+    async with create_client() as client:
+        for _ in range(repeat):
+            with timed("Total run"):
+                exit_code = max(exit_code, await run_tests(client, use_cache))
+
+    if repeat > 1:
+        print_timing_quantiles(TIMINGS)
+    return exit_code
+
+async def run_tests(client, use_cache=True):
+    """Run the health gate and all backend checks on the shared client"""
     print("="*60)
     print("      MANUAL GEOJSON COORDINATES BACKEND TESTER")
     print("="*60)
     print(f"TARGET AOI: {aoi_name}")
-    print(f"COORDINATES: {json.dumps(geojson_coordinates)}")
+    print(f"COORDINATES: {GEOJSON_BYTES.decode()}")
     print("-" * 60)
 
-    if not test_health_check():
+    first_timing = len(TIMINGS)
+    if not await run_check(client, HEALTH_CHECK):
+        print(f"[TIP] Make sure the backend is running on {BASE_URL}")
         print("\n[FATAL] Backend is not running. Please start the backend server first.")
         print("Command: `python -m uvicorn app.main:app --reload --host 0.0.0.0 --port 8000`")
         return 1
 
-    results = [
-        ("AOI Creation", test_aoi_creation(aoi_name, geojson_coordinates)),
-        ("Satellite Preview", test_satellite_preview(geojson_coordinates)),
-        ("Comprehensive Analysis", test_comprehensive_analysis(aoi_name, geojson_coordinates)),
-        ("System Status", test_system_status()),
-    ]
+    # The remaining checks are independent of each other, so overlap them on one event loop
+    tasks = {}
+    for check in CHECKS:
+        prerequisite = tasks.get(check.requires)
+        tasks[check.name] = asyncio.ensure_future(
+            run_dependent_check(client, check, prerequisite, use_cache)
+        )
+    results = list(zip(tasks, await asyncio.gather(*tasks.values())))
+
+    print_timings(TIMINGS[first_timing:])
 
     print("\n" + "="*60)
     print("                    TEST SUMMARY")
     print("="*60)
     passed_count = sum(1 for _, success in results if success)
+    skipped_count = sum(1 for _, success in results if success is None)
     for name, success in results:
-        status = "[PASS]" if success else "[FAIL]"
+        status = "[SKIP]" if success is None else "[PASS]" if success else "[FAIL]"
         print(f"{status:6} - {name}")
 
-    print(f"\nOVERALL: {passed_count}/{len(results)} tests passed.")
+    print(f"\nOVERALL: {passed_count}/{len(results)} tests passed, {skipped_count} skipped.")
     if passed_count == len(results):
         print("\n[SUCCESS] All tests passed! The backend is working correctly.")
         return 0
@@ -226,8 +518,15 @@ def main():
         return 1
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manual AOI backend tester")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always hit the backend instead of reusing cached preview/analysis responses")
+    parser.add_argument("--repeat", type=int, default=1, metavar="N",
+                        help="Run the whole suite N times and report p50/p95 timings per call")
+    args = parser.parse_args()
+
     try:
-        sys.exit(main())
+        sys.exit(asyncio.run(main(use_cache=not args.no_cache, repeat=max(1, args.repeat))))
     except KeyboardInterrupt:
         print("\n\n[INFO] Test interrupted by user. Exiting.")
         sys.exit(0)
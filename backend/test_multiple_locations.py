@@ -7,16 +7,26 @@ Tests: Chilika Lake, Delhi, and Guwahati
 import sys
 import os
 import asyncio
+import contextvars
+import hashlib
+import io
+import json
+import orjson
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 sys.path.append('.')
 
 from datetime import datetime, timedelta
 import logging
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.transforms import Bbox
 from pathlib import Path
 
 # Import backend modules
-from app.core.satellite_data import SentinelDataFetcher, FetchConfig
+from app.core.satellite_data import SentinelDataFetcher, FetchConfig, SatelliteImage
 from app.core.spectral_analyzer import SpectralAnalyzer
 from app.algorithms.visualization import ChangeVisualizer
 
@@ -69,10 +79,31 @@ LOCATIONS = {
     }
 }
 
+# Stand-in for an index the analyzer could not compute for a location
+_ZERO = {'mean': 0.0}
+
+# Health score: 50 + weights . min(mean, 1) for each index whose mean clears its floor
+_HEALTH_INDICES = ('ndvi', 'ndwi', 'ndbi', 'evi')
+_HEALTH_WEIGHTS = np.array([25.0, 15.0, -20.0, 10.0])
+_HEALTH_FLOORS = np.array([-np.inf, 0.0, 0.1, -np.inf])  # water only counts if present, urban above 0.1
+
+# Assessment bands: (25, 40], (40, 60], ... map to successive labels
+_HEALTH_ASSESS_BINS = np.array([25, 40, 60, 75])
+_HEALTH_ASSESS_LABELS = (
+    "❌ Very poor environmental condition",
+    "⚠️ Poor environmental condition",
+    "⚠️ Fair environmental condition",
+    "✅ Good environmental condition",
+    "✅ Excellent environmental condition",
+)
+
 # Create output directory
 OUTPUT_DIR = Path("analysis_results")
 OUTPUT_DIR.mkdir(exist_ok=True)
 
+# Fetched scenes from previous runs, reused so re-runs skip the Sentinel Hub download
+SAT_CACHE_DIR = Path(".sat_cache")
+
 def print_header(text):
     print("\n" + "=" * 80)
     print(f"  {text}")
@@ -92,17 +123,194 @@ def print_error(text):
 def print_info(text):
     print(f"ℹ️  {text}")
 
+class _TaskBufferedStdout:
+    """Stand-in for sys.stdout that keeps the prints of each capturing asyncio task apart"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self._buffer = contextvars.ContextVar('stdout_buffer', default=None)
+    
+    def write(self, text):
+        return (self._buffer.get() or self.stream).write(text)
+    
+    def flush(self):
+        self.stream.flush()
+    
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+    
+    async def buffered(self, coro):
+        """Await coro, writing everything it printed in this task to the stream in one call"""
+        buffer = io.StringIO()
+        token = self._buffer.set(buffer)
+        try:
+            return await coro
+        finally:
+            self._buffer.reset(token)
+            self.stream.write(buffer.getvalue())
+            self.stream.flush()
+
+# Output pixels available to one multi-index panel at the 150 dpi the figures are saved with
+MULTI_PANEL_PX = 14 * 150 // 2
+
+def display_overview(arr, target_px):
+    """Strided view of an image decimated to roughly target_px along its longest side"""
+    stride = max(1, max(arr.shape[0], arr.shape[1]) // target_px)
+    return arr[::stride, ::stride]
+
+# (viz type, index key, multi-index grid position, panel label, imshow style)
+INDEX_PANELS = (
+    ('NDVI', 'ndvi', (0, 1), 'NDVI (Vegetation)', {'cmap': 'RdYlGn', 'vmin': -0.2, 'vmax': 1.0}),
+    ('NDWI', 'ndwi', (1, 0), 'NDWI (Water)', {'cmap': 'Blues', 'vmin': -0.5, 'vmax': 1.0}),
+    ('NDBI', 'ndbi', (1, 1), 'NDBI (Built-up)', {'cmap': 'Reds', 'vmin': -0.5, 'vmax': 1.0}),
+)
+
+def render_location_panels(location_name, image_date, safe_name, panels):
+    """
+    Draw a location's multi-index figure and export it as a PDF plus one PNG
+    
+    Runs in a worker process: only plain arrays and strings cross the process
+    boundary, and the Figure is built and discarded inside the worker. Every
+    panel is drawn once; the PDF holds the full figure followed by one page
+    cropped around each panel, and the multi-index PNG is the only raster export.
+    """
+    viz_paths = {}
+    fig = Figure(figsize=(14, 12))
+    axes = fig.subplots(2, 2)
+    fig.suptitle(f'{location_name} - Multi-Index Analysis\n{image_date}',
+                fontsize=16, fontweight='bold')
+    
+    # Axes to crop around for each panel's PDF page
+    crops = []
+    for panel in panels:
+        ax = axes[panel['pos']]
+        im = ax.imshow(panel['array'], interpolation='nearest', **panel['style'])
+        ax.set_title(panel['title'])
+        ax.axis('off')
+        crop_axes = [ax]
+        if panel['colorbar']:
+            crop_axes.append(fig.colorbar(im, ax=ax, fraction=0.046).ax)
+        crops.append(crop_axes)
+    
+    fig.tight_layout()
+    canvas = FigureCanvasAgg(fig)
+    try:
+        # Lay the figure out once to measure each panel's extent in inches
+        canvas.draw()
+        renderer = canvas.get_renderer()
+        to_inches = fig.dpi_scale_trans.inverted()
+        extents = [
+            Bbox.union([ax.get_tightbbox(renderer) for ax in crop_axes]).transformed(to_inches)
+            for crop_axes in crops
+        ]
+        
+        path = OUTPUT_DIR / f"{safe_name}.pdf"
+        with PdfPages(path) as pdf:
+            pdf.savefig(fig, dpi=150, bbox_inches='tight')
+            for extent in extents:
+                pdf.savefig(fig, dpi=150, bbox_inches=extent.expanded(1.05, 1.05))
+        viz_paths['Panels (PDF)'] = str(path)
+        
+        path = OUTPUT_DIR / f"{safe_name}_multi_index.png"
+        canvas.print_figure(str(path), dpi=150, bbox_inches='tight')
+        viz_paths['Multi-Index'] = str(path)
+    finally:
+        fig.clear()
+    
+    return viz_paths
+
+def save_figure(fig, path, dpi=150):
+    """Render a standalone Figure to disk through its own Agg canvas, then release it"""
+    try:
+        FigureCanvasAgg(fig).print_figure(str(path), dpi=dpi, bbox_inches='tight')
+    finally:
+        fig.clear()
+
 
 class MultiLocationAnalyzer:
     """Analyze multiple locations with visualization output"""
     
     def __init__(self):
+        # Decoded scenes are spilled to a scratch dir and handed out as read-only memmaps
+        self._scratch_dir = tempfile.TemporaryDirectory(prefix="geoguardian_scenes_")
         self.satellite_fetcher = SentinelDataFetcher(
-            FetchConfig(max_cloud_coverage=0.4, max_images=1)  # Slightly relaxed for more coverage
+            FetchConfig(
+                max_cloud_coverage=0.4,  # Slightly relaxed for more coverage
+                max_images=1,
+                memmap_dir=self._scratch_dir.name
+            )
         )
         self.spectral_analyzer = SpectralAnalyzer()
         self.visualizer = ChangeVisualizer()
         self.results = {}
+        # Bounds how many locations fetch and analyze at once
+        self._sem = asyncio.Semaphore(3)
+        # Matplotlib rendering is CPU-bound, so it runs in separate processes
+        self._pool = ProcessPoolExecutor(max_workers=min(6, os.cpu_count() or 1))
+    
+    async def __aenter__(self):
+        # Authenticate once so concurrent locations share one warm Sentinel Hub session
+        try:
+            await asyncio.to_thread(self.satellite_fetcher.connect)
+        except Exception as e:
+            # Each location will retry and report the failure itself
+            print_error(f"Sentinel Hub authentication failed: {e}")
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def close(self):
+        """Shut down the render pool and remove spilled scenes"""
+        self._pool.shutdown()
+        self._scratch_dir.cleanup()
+    
+    async def _fetch_cached(self, geojson, start_date, end_date):
+        """Fetch imagery, reusing the scene cached on disk for this AOI and date window"""
+        key = hashlib.blake2b(json.dumps(
+            {'geo': geojson, 'd0': start_date.date().isoformat(), 'd1': end_date.date().isoformat()},
+            sort_keys=True
+        ).encode(), digest_size=16).hexdigest()
+        data_path = SAT_CACHE_DIR / f"{key}.npy"
+        meta_path = SAT_CACHE_DIR / f"{key}.json"
+        
+        if data_path.exists() and meta_path.exists():
+            meta = json.loads(meta_path.read_text())
+            print_info("Using cached satellite imagery")
+            # Memory-mapped: pages are only read from disk when the analysis touches them
+            return [SatelliteImage(
+                data=np.load(data_path, mmap_mode='r'),
+                timestamp=datetime.fromisoformat(meta['timestamp']),
+                cloud_coverage=meta['cloud_coverage'],
+                bounds=self.satellite_fetcher._geometry_to_bbox(geojson),
+                resolution=meta['resolution'],
+                bands=meta['bands'],
+                quality_score=meta['quality_score']
+            )]
+        
+        images = await self.satellite_fetcher.fetch_imagery(
+            aoi_geometry=geojson,
+            date_range=(start_date, end_date),
+            bands=None
+        )
+        
+        # Only the best scene is analyzed, so only that one is cached
+        if images:
+            image = images[0]
+            # Indices live in [-1, 1] and only summary stats are reported, so float32
+            # halves the bytes every reduction and the RGB composite have to move
+            if image.data.dtype == np.float64:
+                image.data = image.data.astype(np.float32)
+            SAT_CACHE_DIR.mkdir(exist_ok=True)
+            np.save(data_path, image.data)
+            meta_path.write_text(json.dumps({
+                'timestamp': image.timestamp.isoformat(),
+                'cloud_coverage': float(image.cloud_coverage),
+                'resolution': image.resolution,
+                'bands': image.bands,
+                'quality_score': float(image.quality_score)
+            }))
+        return images
     
     async def analyze_location(self, location_name, location_data, days_back=60):
         """Analyze a single location"""
@@ -116,11 +324,7 @@ class MultiLocationAnalyzer:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days_back)
             
-            images = await self.satellite_fetcher.fetch_imagery(
-                aoi_geometry=location_data['geojson'],
-                date_range=(start_date, end_date),
-                bands=None
-            )
+            images = await self._fetch_cached(location_data['geojson'], start_date, end_date)
             
             if not images or len(images) == 0:
                 print_error(f"No satellite imagery found for {location_name}")
@@ -133,7 +337,7 @@ class MultiLocationAnalyzer:
             
             # Analyze spectral indices
             print_info("Analyzing spectral indices...")
-            features = self.spectral_analyzer.extract_all_features(image.data)
+            features = self.spectral_analyzer.extract_all_features(image.data, include_stats=True)
             indices = features['indices']
             
             # Calculate metrics
@@ -149,15 +353,8 @@ class MultiLocationAnalyzer:
                 'assessment': ''
             }
             
-            # Calculate mean values for each index
-            for idx_name, idx_data in indices.items():
-                mean_val = float(np.nanmean(idx_data))
-                results['indices'][idx_name] = {
-                    'mean': mean_val,
-                    'min': float(np.nanmin(idx_data)),
-                    'max': float(np.nanmax(idx_data)),
-                    'std': float(np.nanstd(idx_data))
-                }
+            # Summary statistics come back from the analyzer, computed alongside each index
+            results['indices'] = features['stats']
             
             # Display key metrics
             print_info("\n📊 Spectral Analysis Results:")
@@ -219,7 +416,18 @@ class MultiLocationAnalyzer:
                 for viz_type, path in viz_paths.items():
                     print(f"   • {viz_type}: {path}")
             
-            self.results[location_name] = results
+            # Checkpoint the full result to disk and keep only what the comparison chart needs
+            safe_name = location_name.replace(" ", "_").lower()
+            result_path = OUTPUT_DIR / f"{safe_name}.json"
+            result_path.write_bytes(orjson.dumps(
+                results, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2
+            ))
+            self.results[location_name] = {
+                'health_score': health_score,
+                'dominant_feature': dominant_feature,
+                'indices': {k: {'mean': v['mean']} for k, v in results['indices'].items()},
+                'result_path': str(result_path)
+            }
             return results
             
         except Exception as e:
@@ -229,32 +437,16 @@ class MultiLocationAnalyzer:
             return None
     
     def _calculate_health_score(self, indices):
-        """Calculate environmental health score"""
-        score = 50
+        """
+        Calculate environmental health score
         
-        # Vegetation health
-        if 'ndvi' in indices:
-            ndvi = indices['ndvi']['mean']
-            score += min(ndvi * 25, 25)
-        
-        # Water presence (positive for natural areas)
-        if 'ndwi' in indices:
-            ndwi = indices['ndwi']['mean']
-            if ndwi > 0:
-                score += min(ndwi * 15, 15)
-        
-        # Urbanization (negative impact on "natural" health)
-        if 'ndbi' in indices:
-            ndbi = indices['ndbi']['mean']
-            if ndbi > 0.1:
-                score -= min(ndbi * 20, 20)
-        
-        # EVI (enhanced vegetation)
-        if 'evi' in indices:
-            evi = indices['evi']['mean']
-            score += min(evi * 10, 10)
-        
-        return max(0, min(100, score))
+        Vegetation (NDVI, EVI) and water presence raise the score, urbanization
+        lowers it; each index contributes weight * min(mean, 1). Missing
+        indices contribute nothing.
+        """
+        means = np.array([indices.get(k, {}).get('mean', np.nan) for k in _HEALTH_INDICES])
+        contrib = np.where(means > _HEALTH_FLOORS, np.minimum(means, 1.0), 0.0)
+        return float(np.clip(50 + _HEALTH_WEIGHTS @ contrib, 0, 100))
     
     def _determine_dominant_feature(self, indices):
         """Determine dominant land cover feature"""
@@ -273,134 +465,64 @@ class MultiLocationAnalyzer:
     
     def _get_assessment(self, score):
         """Get textual assessment from score"""
-        if score > 75:
-            return "✅ Excellent environmental condition"
-        elif score > 60:
-            return "✅ Good environmental condition"
-        elif score > 40:
-            return "⚠️ Fair environmental condition"
-        elif score > 25:
-            return "⚠️ Poor environmental condition"
-        else:
-            return "❌ Very poor environmental condition"
+        return _HEALTH_ASSESS_LABELS[int(np.digitize(score, _HEALTH_ASSESS_BINS, right=True))]
     
     async def _generate_visualizations(self, location_name, image, indices, results):
-        """Generate and save visualizations"""
-        viz_paths = {}
+        """
+        Generate and save visualizations
+        
+        The display arrays are prepared here; drawing and image encoding run in
+        the analyzer's process pool so locations render in parallel.
+        """
         safe_name = location_name.replace(" ", "_").lower()
+        panels = []
         
         try:
-            # 1. RGB Composite
             if image.data.ndim == 3 and image.data.shape[2] >= 3:
-                fig, ax = plt.subplots(figsize=(10, 8))
-                rgb = self._create_rgb_composite(image.data)
-                ax.imshow(rgb)
-                ax.set_title(f'{location_name} - RGB Composite\n{results["image_date"]}', 
-                           fontsize=14, fontweight='bold')
-                ax.axis('off')
-                
-                path = OUTPUT_DIR / f"{safe_name}_rgb.png"
-                plt.savefig(path, dpi=150, bbox_inches='tight')
-                plt.close(fig)
-                viz_paths['RGB'] = str(path)
-            
-            # 2. NDVI Heatmap
-            if 'ndvi' in indices:
-                fig, ax = plt.subplots(figsize=(10, 8))
-                im = ax.imshow(indices['ndvi'], cmap='RdYlGn', vmin=-0.2, vmax=1.0)
-                plt.colorbar(im, ax=ax, label='NDVI Value')
-                ax.set_title(f'{location_name} - Vegetation Health (NDVI)\n{results["image_date"]}',
-                           fontsize=14, fontweight='bold')
-                ax.axis('off')
-                
-                path = OUTPUT_DIR / f"{safe_name}_ndvi.png"
-                plt.savefig(path, dpi=150, bbox_inches='tight')
-                plt.close(fig)
-                viz_paths['NDVI'] = str(path)
-            
-            # 3. NDWI Heatmap (Water)
-            if 'ndwi' in indices:
-                fig, ax = plt.subplots(figsize=(10, 8))
-                im = ax.imshow(indices['ndwi'], cmap='Blues', vmin=-0.5, vmax=1.0)
-                plt.colorbar(im, ax=ax, label='NDWI Value')
-                ax.set_title(f'{location_name} - Water Bodies (NDWI)\n{results["image_date"]}',
-                           fontsize=14, fontweight='bold')
-                ax.axis('off')
-                
-                path = OUTPUT_DIR / f"{safe_name}_ndwi.png"
-                plt.savefig(path, dpi=150, bbox_inches='tight')
-                plt.close(fig)
-                viz_paths['NDWI'] = str(path)
-            
-            # 4. NDBI Heatmap (Urban)
-            if 'ndbi' in indices:
-                fig, ax = plt.subplots(figsize=(10, 8))
-                im = ax.imshow(indices['ndbi'], cmap='Reds', vmin=-0.5, vmax=1.0)
-                plt.colorbar(im, ax=ax, label='NDBI Value')
-                ax.set_title(f'{location_name} - Built-up Areas (NDBI)\n{results["image_date"]}',
-                           fontsize=14, fontweight='bold')
-                ax.axis('off')
-                
-                path = OUTPUT_DIR / f"{safe_name}_ndbi.png"
-                plt.savefig(path, dpi=150, bbox_inches='tight')
-                plt.close(fig)
-                viz_paths['NDBI'] = str(path)
-            
-            # 5. Multi-panel comparison
-            fig, axes = plt.subplots(2, 2, figsize=(14, 12))
-            fig.suptitle(f'{location_name} - Multi-Index Analysis\n{results["image_date"]}',
-                        fontsize=16, fontweight='bold')
-            
-            # RGB
-            if image.data.ndim == 3 and image.data.shape[2] >= 3:
-                rgb = self._create_rgb_composite(image.data)
-                axes[0, 0].imshow(rgb)
-                axes[0, 0].set_title('RGB Composite')
-                axes[0, 0].axis('off')
-            
-            # NDVI
-            if 'ndvi' in indices:
-                im1 = axes[0, 1].imshow(indices['ndvi'], cmap='RdYlGn', vmin=-0.2, vmax=1.0)
-                axes[0, 1].set_title(f'NDVI (Vegetation)\nMean: {results["indices"]["ndvi"]["mean"]:.3f}')
-                axes[0, 1].axis('off')
-                plt.colorbar(im1, ax=axes[0, 1], fraction=0.046)
-            
-            # NDWI
-            if 'ndwi' in indices:
-                im2 = axes[1, 0].imshow(indices['ndwi'], cmap='Blues', vmin=-0.5, vmax=1.0)
-                axes[1, 0].set_title(f'NDWI (Water)\nMean: {results["indices"]["ndwi"]["mean"]:.3f}')
-                axes[1, 0].axis('off')
-                plt.colorbar(im2, ax=axes[1, 0], fraction=0.046)
-            
-            # NDBI
-            if 'ndbi' in indices:
-                im3 = axes[1, 1].imshow(indices['ndbi'], cmap='Reds', vmin=-0.5, vmax=1.0)
-                axes[1, 1].set_title(f'NDBI (Built-up)\nMean: {results["indices"]["ndbi"]["mean"]:.3f}')
-                axes[1, 1].axis('off')
-                plt.colorbar(im3, ax=axes[1, 1], fraction=0.046)
-            
-            plt.tight_layout()
-            path = OUTPUT_DIR / f"{safe_name}_multi_index.png"
-            plt.savefig(path, dpi=150, bbox_inches='tight')
-            plt.close(fig)
-            viz_paths['Multi-Index'] = str(path)
-            
-            return viz_paths
+                # Compose from the decimated view so only displayed pixels are touched
+                rgb = self._create_rgb_composite(display_overview(image.data, MULTI_PANEL_PX))
+                panels.append({
+                    'viz_type': 'RGB',
+                    'pos': (0, 0),
+                    'array': rgb,
+                    'title': 'RGB Composite',
+                    'style': {},
+                    'colorbar': False
+                })
+            
+            for viz_type, key, pos, label, style in INDEX_PANELS:
+                if key in indices:
+                    panels.append({
+                        'viz_type': viz_type,
+                        'pos': pos,
+                        'array': display_overview(indices[key], MULTI_PANEL_PX),
+                        'title': f'{label}\nMean: {results["indices"][key]["mean"]:.3f}',
+                        'style': style,
+                        'colorbar': True
+                    })
+            
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._pool, render_location_panels,
+                location_name, results["image_date"], safe_name, panels
+            )
             
         except Exception as e:
             print_error(f"Visualization generation failed: {e}")
             import traceback
             traceback.print_exc()
-            return viz_paths
+            return {}
     
     def _create_rgb_composite(self, image_data):
-        """Create RGB composite"""
+        """Create a display-ready uint8 RGB composite"""
         if image_data.ndim == 3 and image_data.shape[2] >= 3:
-            # Sentinel-2: B04 (Red), B03 (Green), B02 (Blue)
-            rgb = image_data[:, :, [2, 1, 0]]
-            # Normalize
-            rgb = np.clip(rgb * 2.5, 0, 1)  # Brightness adjustment
-            return rgb
+            # Sentinel-2: B04 (Red), B03 (Green), B02 (Blue) - a zero-copy reversed-stride view
+            view = image_data[..., 2::-1]
+            # Brightness adjustment (x2.5) and scaling to 0-255, written straight into one buffer
+            rgb = np.empty(view.shape, dtype=np.float32)
+            np.multiply(view, np.float32(2.5 * 255), out=rgb, casting='unsafe')
+            np.clip(rgb, 0.0, 255.0, out=rgb)
+            return rgb.astype(np.uint8)
         return None
     
     def generate_comparison_chart(self):
@@ -412,19 +534,17 @@ class MultiLocationAnalyzer:
             return
         
         try:
-            locations = list(self.results.keys())
-            
-            # Prepare data
-            ndvi_values = [self.results[loc]['indices'].get('ndvi', {}).get('mean', 0) 
-                          for loc in locations]
-            ndwi_values = [self.results[loc]['indices'].get('ndwi', {}).get('mean', 0) 
-                          for loc in locations]
-            ndbi_values = [self.results[loc]['indices'].get('ndbi', {}).get('mean', 0) 
-                          for loc in locations]
-            health_scores = [self.results[loc]['health_score'] for loc in locations]
+            # Prepare data in a single pass over the results
+            keys = ('ndvi', 'ndwi', 'ndbi')
+            rows = [
+                (loc, *(r['indices'].get(k, _ZERO)['mean'] for k in keys), r['health_score'])
+                for loc, r in self.results.items()
+            ]
+            locations, ndvi_values, ndwi_values, ndbi_values, health_scores = map(list, zip(*rows))
             
             # Create comparison chart
-            fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+            fig = Figure(figsize=(16, 12))
+            axes = fig.subplots(2, 2)
             fig.suptitle('Multi-Location Environmental Analysis Comparison', 
                         fontsize=16, fontweight='bold')
             
@@ -465,10 +585,9 @@ class MultiLocationAnalyzer:
             for i, v in enumerate(health_scores):
                 axes[1, 1].text(i, v + 2, f'{v:.1f}', ha='center', fontweight='bold')
             
-            plt.tight_layout()
+            fig.tight_layout()
             path = OUTPUT_DIR / "comparison_chart.png"
-            plt.savefig(path, dpi=150, bbox_inches='tight')
-            plt.close(fig)
+            save_figure(fig, path)
             
             print_success(f"Comparison chart saved: {path}")
             
@@ -485,12 +604,32 @@ class MultiLocationAnalyzer:
         print(f"⏰ Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print_info(f"Output directory: {OUTPUT_DIR.absolute()}")
         
-        for location_name, location_data in LOCATIONS.items():
-            result = await self.analyze_location(location_name, location_data, days_back)
-            if result:
-                print_success(f"✅ {location_name} - Analysis complete")
-            else:
+        async def _run_one(location_name, location_data):
+            async with self._sem:
+                # Each location's report is written as one block as soon as it finishes
+                return location_name, await stdout.buffered(
+                    self.analyze_location(location_name, location_data, days_back)
+                )
+        
+        # Locations are independent, so their network-bound fetches overlap
+        stdout = _TaskBufferedStdout(sys.stdout)
+        sys.stdout = stdout
+        try:
+            outcomes = await asyncio.gather(
+                *[_run_one(name, data) for name, data in LOCATIONS.items()],
+                return_exceptions=True
+            )
+        finally:
+            sys.stdout = stdout.stream
+        
+        for location_name, outcome in zip(LOCATIONS, outcomes):
+            if isinstance(outcome, Exception) or outcome[1] is None:
                 print_error(f"❌ {location_name} - Analysis failed")
+            else:
+                print_success(f"✅ {location_name} - Analysis complete")
+        
+        # Keep results in LOCATIONS order rather than completion order
+        self.results = {name: self.results[name] for name in LOCATIONS if name in self.results}
         
         # Generate comparison chart
         if len(self.results) > 1:
@@ -507,7 +646,10 @@ class MultiLocationAnalyzer:
             print_error("No successful analyses")
             return
         
-        for location_name, result in self.results.items():
+        total_visualizations = 0
+        for location_name, summary in self.results.items():
+            result = orjson.loads(Path(summary['result_path']).read_bytes())
+            total_visualizations += len(result.get('visualizations', {}))
             print(f"\n🗺️  {location_name}")
             print(f"   • Description: {result['description']}")
             print(f"   • Image Date: {result['image_date']}")
@@ -517,14 +659,14 @@ class MultiLocationAnalyzer:
             print(f"   • Visualizations: {len(result.get('visualizations', {}))}")
         
         print(f"\n📁 All results saved to: {OUTPUT_DIR.absolute()}")
-        print(f"📸 Total visualizations: {sum(len(r.get('visualizations', {})) for r in self.results.values())}")
+        print(f"📸 Total visualizations: {total_visualizations}")
         print(f"\n⏰ Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
 
 async def main():
     """Run multi-location analysis"""
-    analyzer = MultiLocationAnalyzer()
-    await analyzer.analyze_all_locations(days_back=60)
+    async with MultiLocationAnalyzer() as analyzer:
+        await analyzer.analyze_all_locations(days_back=60)
 
 
 if __name__ == "__main__":
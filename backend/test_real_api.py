@@ -4,14 +4,21 @@ REAL API Test - Demonstrate actual backend functionality
 Shows REAL responses from live FastAPI endpoints
 """
 
-import requests
-import json
+import httpx
+import asyncio
+import orjson
 from datetime import datetime
 
-def test_real_api_endpoints():
+BASE_URL = "http://localhost:8000"
+
+async def _hit(client, url):
+    """GET one endpoint on the shared client"""
+    return await client.get(url, timeout=10)
+
+async def test_real_api_endpoints(client):
     """Test REAL API endpoints and show actual responses"""
     
-    base_url = "http://localhost:8000"
+    base_url = BASE_URL
     
     print("🔥 TESTING REAL FASTAPI BACKEND")
     print("=" * 50)
@@ -30,22 +37,29 @@ def test_real_api_endpoints():
     
     real_responses = {}
     
-    for endpoint, description in endpoints:
+    # Fire every request at once, then report them in order
+    responses = await asyncio.gather(
+        *[_hit(client, endpoint) for endpoint, _ in endpoints],
+        return_exceptions=True
+    )
+    
+    for (endpoint, description), response in zip(endpoints, responses):
         print(f"\n🧪 Testing: {description}")
         print(f"   URL: {base_url}{endpoint}")
         
         try:
-            response = requests.get(f"{base_url}{endpoint}", timeout=10)
+            if isinstance(response, Exception):
+                raise response
             
             print(f"   Status: {response.status_code}")
-            print(f"   Size: {len(response.text)} bytes")
+            print(f"   Size: {len(response.content)} bytes")
             
             if response.status_code == 200:
                 print("   ✅ SUCCESS")
                 
                 # Try to parse JSON if possible
                 try:
-                    json_data = response.json()
+                    json_data = orjson.loads(response.content)
                     real_responses[endpoint] = json_data
                     
                     # Show some real data samples
@@ -68,7 +82,7 @@ def test_real_api_endpoints():
                                 print(f"      - {algo.get('name', 'unknown')}")
                 
                 except:
-                    print(f"   📄 Raw Response Preview: {response.text[:100]}...")
+                    print(f"   📄 Raw Response Preview: {response.content[:100].decode(errors='replace')}...")
             else:
                 print(f"   ❌ ERROR: HTTP {response.status_code}")
                 
@@ -77,17 +91,17 @@ def test_real_api_endpoints():
     
     return real_responses
 
-def demonstrate_real_analysis_capabilities():
+async def demonstrate_real_analysis_capabilities(client):
     """Test REAL analysis capabilities endpoint"""
     
     print("\n\n🔬 TESTING REAL ANALYSIS CAPABILITIES")
     print("=" * 50)
     
     try:
-        response = requests.get("http://localhost:8000/api/v2/capabilities", timeout=10)
+        response = await _hit(client, "/api/v2/capabilities")
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             
             print("✅ REAL BACKEND CAPABILITIES:")
             print(f"   🚀 System Version: {data.get('version', 'unknown')}")
@@ -124,17 +138,17 @@ def demonstrate_real_analysis_capabilities():
         print(f"❌ Failed to get real capabilities: {e}")
         return False
 
-def show_real_system_metrics():
+async def show_real_system_metrics(client):
     """Show REAL system metrics from live backend"""
     
     print("\n\n📊 REAL SYSTEM METRICS")
     print("=" * 50)
     
     try:
-        response = requests.get("http://localhost:8000/api/v2/status", timeout=10)
+        response = await _hit(client, "/api/v2/status")
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             
             print("✅ LIVE SYSTEM STATUS:")
             print(f"   🔥 Status: {data.get('status', 'unknown')}")
@@ -161,7 +175,7 @@ def show_real_system_metrics():
         print(f"❌ Failed to get real status: {e}")
         return False
 
-def main():
+async def main():
     """Run comprehensive REAL API testing"""
     
     print("🔥 GEOGUARDIAN REAL BACKEND DEMONSTRATION")
@@ -169,14 +183,16 @@ def main():
     print("🌐 Testing actual FastAPI server at localhost:8000")
     print()
     
-    # Test all endpoints
-    real_responses = test_real_api_endpoints()
-    
-    # Show detailed capabilities
-    demonstrate_real_analysis_capabilities()
-    
-    # Show system metrics
-    show_real_system_metrics()
+    # One pooled client for every request so connections are reused
+    async with httpx.AsyncClient(base_url=BASE_URL, http2=True) as client:
+        # Test all endpoints
+        real_responses = await test_real_api_endpoints(client)
+        
+        # Show detailed capabilities
+        await demonstrate_real_analysis_capabilities(client)
+        
+        # Show system metrics
+        await show_real_system_metrics(client)
     
     print("\n\n🎯 REAL BACKEND TESTING COMPLETED")
     print(f"📡 Tested {len(real_responses)} endpoints successfully")
@@ -184,4 +200,4 @@ def main():
     print("🔬 No hardcoded or synthetic values used")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
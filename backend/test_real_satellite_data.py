@@ -8,16 +8,21 @@ NO SYNTHETIC DATA WHATSOEVER
 import sys
 import os
 import asyncio
+import argparse
+import hashlib
+import json
 sys.path.append('.')
 
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import requests
 from datetime import datetime, timedelta
+from pathlib import Path
 import logging
 
 # Import backend modules
-from app.core.satellite_data import SentinelDataFetcher, FetchConfig
+from app.core.satellite_data import SentinelDataFetcher, FetchConfig, SatelliteImage
 from app.algorithms.ewma import EWMADetector
 from app.algorithms.cusum import CUSUMDetector
 
@@ -36,10 +41,83 @@ UMANANDA_AOI = {
     ]]
 }
 
+# Scenes from earlier runs, keyed by AOI, bands and day-bucketed window; least recently
+# used entries beyond TILE_CACHE_ENTRIES are evicted
+TILE_CACHE_DIR = Path(".real_sat_cache")
+TILE_CACHE_ENTRIES = 5
+
+# Preview resolution for the analysis figure; --high-res restores print quality
+PREVIEW_DPI = 100
+HIGH_RES_DPI = 300
+
+# Only the bands the RGB preview and NDVI use are requested; the fetcher appends SCL last
+FETCH_BANDS = ["B02", "B03", "B04", "B08"]
+BLUE, GREEN, RED, NIR = (FETCH_BANDS.index(band) for band in ("B02", "B03", "B04", "B08"))
+
+# Tile edge for the blocked NDVI pass; a 256x256 float32 tile plus its scratch fits in L2
+NDVI_BLOCK = 256
+
+def ndvi_and_stats(data, block=NDVI_BLOCK):
+    """
+    Float32 NDVI from B08 (NIR) and B04 (Red) plus its summary statistics in one pass
+    
+    The scene is walked in block x block tiles: each tile's NDVI is written into
+    its slice of the output and folded into running sum/min/max and a
+    NaN-ignoring mean/variance (Chan's parallel Welford merge) while still in
+    cache, instead of streaming the full array again for every statistic.
+    The ufuncs compute in float32 directly, so a float64 scene is never copied
+    whole just to downcast it. NaN pixels propagate to min/max/mean exactly
+    as ndarray.min/max/mean would; nanmean/nanstd match np.nanmean/np.nanstd.
+    
+    Returns:
+        Tuple of (ndvi array, {'min', 'max', 'mean', 'nanmean', 'nanstd'} dict)
+    """
+    height, width = data.shape[:2]
+    ndvi = np.empty((height, width), dtype=np.float32)
+    total = 0.0
+    lo, hi = np.inf, -np.inf
+    count, valid_mean, m2 = 0, 0.0, 0.0
+    
+    for i in range(0, height, block):
+        for j in range(0, width, block):
+            tile = data[i:i + block, j:j + block]
+            red = tile[:, :, RED]    # B04 (Red)
+            nir = tile[:, :, NIR]    # B08 (NIR)
+            out = ndvi[i:i + block, j:j + block]
+            
+            np.subtract(nir, red, out=out, dtype=np.float32)
+            denom = np.add(nir, red, dtype=np.float32)
+            denom += 1e-8
+            np.divide(out, denom, out=out)
+            
+            total += out.sum(dtype=np.float64)
+            lo = np.minimum(lo, out.min())
+            hi = np.maximum(hi, out.max())
+            
+            valid = ~np.isnan(out)
+            tile_count = int(np.count_nonzero(valid))
+            if tile_count:
+                tile_mean = out.sum(where=valid, dtype=np.float64) / tile_count
+                tile_m2 = np.square(out - tile_mean, dtype=np.float64).sum(where=valid)
+                delta = tile_mean - valid_mean
+                merged = count + tile_count
+                valid_mean += delta * tile_count / merged
+                m2 += tile_m2 + delta * delta * count * tile_count / merged
+                count = merged
+    
+    return ndvi, {
+        'min': float(lo),
+        'max': float(hi),
+        'mean': float(total / ndvi.size),
+        'nanmean': valid_mean if count else float('nan'),
+        'nanstd': float(np.sqrt(m2 / count)) if count else float('nan')
+    }
+
 class RealSatelliteDataTester:
     """Test with ACTUAL satellite data from ESA/Copernicus"""
     
-    def __init__(self):
+    def __init__(self, high_res=False):
+        self.high_res = high_res
         print("🛰️ REAL SATELLITE DATA TESTER")
         print("📍 Target: Umananda Island, Assam, India")
         print("🌍 Data Source: ESA Sentinel-2 satellites")
@@ -47,7 +125,9 @@ class RealSatelliteDataTester:
         
         # Initialize satellite fetcher
         try:
-            self.satellite_fetcher = SentinelDataFetcher()
+            # The island is only a few 10m pixels across: fetch exactly those instead of
+            # resampling the AOI up to the default 64px minimum
+            self.satellite_fetcher = SentinelDataFetcher(FetchConfig(min_image_size=1))
             print("✅ Satellite data fetcher initialized")
         except Exception as e:
             print(f"❌ Satellite fetcher failed: {e}")
@@ -56,6 +136,78 @@ class RealSatelliteDataTester:
         # Initialize algorithms
         self.ewma = EWMADetector()
         self.cusum = CUSUMDetector()
+        
+        # (image, ndvi_and_stats result) pairs, most computed while other fetches were in flight
+        self.ndvi_results = []
+    
+    async def _fetch_cached(self, date_range):
+        """Best image in a window, reusing the scene cached on disk by an earlier run"""
+        key = hashlib.blake2b(json.dumps({
+            'geo': UMANANDA_AOI,
+            'bands': FETCH_BANDS,
+            'd0': date_range[0].date().isoformat(),
+            'd1': date_range[1].date().isoformat()
+        }, sort_keys=True).encode(), digest_size=16).hexdigest()
+        data_path = TILE_CACHE_DIR / f"{key}.npy"
+        meta_path = TILE_CACHE_DIR / f"{key}.json"
+        
+        if data_path.exists() and meta_path.exists():
+            meta = json.loads(meta_path.read_text())
+            os.utime(data_path)  # Mark as recently used for eviction
+            print(f"   💾 Using cached scene for {meta['timestamp'][:10]}")
+            return SatelliteImage(
+                data=np.load(data_path, mmap_mode='r'),
+                timestamp=datetime.fromisoformat(meta['timestamp']),
+                cloud_coverage=meta['cloud_coverage'],
+                bounds=self.satellite_fetcher._geometry_to_bbox(UMANANDA_AOI),
+                resolution=meta['resolution'],
+                bands=meta['bands'],
+                quality_score=meta['quality_score']
+            )
+        
+        image = await self.satellite_fetcher.fetch_one(UMANANDA_AOI, date_range, FETCH_BANDS)
+        if image is None:
+            return None
+        
+        TILE_CACHE_DIR.mkdir(exist_ok=True)
+        np.save(data_path, image.data)
+        meta_path.write_text(json.dumps({
+            'timestamp': image.timestamp.isoformat(),
+            'cloud_coverage': float(image.cloud_coverage),
+            'resolution': image.resolution,
+            'bands': image.bands,
+            'quality_score': float(image.quality_score)
+        }))
+        
+        # Evict the least recently used scenes
+        cached = sorted(TILE_CACHE_DIR.glob("*.npy"), key=lambda path: path.stat().st_mtime)
+        for stale in cached[:-TILE_CACHE_ENTRIES]:
+            stale.unlink(missing_ok=True)
+            stale.with_suffix(".json").unlink(missing_ok=True)
+        
+        return image
+    
+    async def _fetch_with_ndvi(self, date_range):
+        """
+        Fetch the best image in a window and compute its NDVI on a worker thread
+        
+        Run for several windows at once, each image's NDVI is computed while the
+        other windows are still downloading rather than after all of them land.
+        """
+        image = await self._fetch_cached(date_range)
+        if image is not None:
+            result = await asyncio.to_thread(ndvi_and_stats, image.data)
+            self.ndvi_results.append((image, result))
+        return image
+    
+    def _ndvi_for(self, image):
+        """NDVI and stats for an image, computed once and reused afterwards"""
+        for known_image, result in self.ndvi_results:
+            if known_image is image:
+                return result
+        result = ndvi_and_stats(image.data)
+        self.ndvi_results.append((image, result))
+        return result
     
     async def fetch_real_sentinel_data(self):
         """Attempt to fetch REAL Sentinel-2 data for Umananda Island"""
@@ -74,11 +226,16 @@ class RealSatelliteDataTester:
             print(f"📍 AOI: Umananda Island {UMANANDA_AOI['coordinates'][0]}")
             print("📅 Requesting data from last 30 days...")
             print("☁️  Maximum cloud coverage: 30%")
-            print("📊 Bands: All 13 Sentinel-2 spectral bands")
+            print(f"📊 Bands: {', '.join(FETCH_BANDS)} (+ SCL for cloud masking)")
             
-            # First try to get paired images for change detection
-            recent_image, baseline_image = await self.satellite_fetcher.get_latest_images_for_change_detection(
-                UMANANDA_AOI, days_back=30
+            # First try to get paired images for change detection: the best image
+            # of the last 15 days and of the 15 days before, fetched concurrently
+            end_date = datetime.now()
+            split_date = end_date - timedelta(days=15)
+            await asyncio.to_thread(self.satellite_fetcher.connect)
+            recent_image, baseline_image = await asyncio.gather(
+                self._fetch_with_ndvi((split_date, end_date)),
+                self._fetch_with_ndvi((end_date - timedelta(days=30), split_date))
             )
             
             if recent_image and baseline_image:
@@ -101,12 +258,9 @@ class RealSatelliteDataTester:
                 end_date = datetime.now()
                 start_date = end_date - timedelta(days=60)  # Expand search window
                 
-                images = await self.satellite_fetcher.fetch_imagery(
-                    UMANANDA_AOI, (start_date, end_date)
-                )
+                single_image = await self._fetch_cached((start_date, end_date))
                 
-                if images and len(images) > 0:
-                    single_image = images[0]
+                if single_image is not None:
                     print("\n✅ REAL SATELLITE DATA RETRIEVED (Single Image)!")
                     print(f"   📅 Image Date: {single_image.timestamp}")
                     print(f"   📐 Resolution: {single_image.resolution}m per pixel")
@@ -142,104 +296,90 @@ class RealSatelliteDataTester:
         print("\n🌱 CALCULATING REAL NDVI FROM SATELLITE DATA")
         
         # Extract NIR (Band 8) and Red (Band 4) from real satellite data
-        # Sentinel-2 band order: [B01, B02, B03, B04, B05, B06, B07, B08, B8A, B09, B11, B12, SCL]
+        # Band order follows FETCH_BANDS: [B02, B03, B04, B08, SCL]
         
         try:
             # Recent image NDVI
-            recent_red = recent_image.data[:, :, 3]    # B04 (Red)
-            recent_nir = recent_image.data[:, :, 7]    # B08 (NIR)
-            recent_ndvi = (recent_nir - recent_red) / (recent_nir + recent_red + 1e-8)
+            recent_ndvi, recent_stats = self._ndvi_for(recent_image)
             
-            # Baseline image NDVI (might be same as recent for single-image analysis)
-            baseline_red = baseline_image.data[:, :, 3]  # B04 (Red)
-            baseline_nir = baseline_image.data[:, :, 7]  # B08 (NIR)
-            baseline_ndvi = (baseline_nir - baseline_red) / (baseline_nir + baseline_red + 1e-8)
+            # Baseline image NDVI (same image for single-image analysis, so reuse it)
+            if baseline_image is recent_image:
+                baseline_ndvi, baseline_stats = recent_ndvi, recent_stats
+            else:
+                baseline_ndvi, baseline_stats = self._ndvi_for(baseline_image)
             
             print("✅ REAL NDVI CALCULATED FROM SATELLITE BANDS")
-            print(f"   Recent NDVI range: {recent_ndvi.min():.3f} to {recent_ndvi.max():.3f}")
-            print(f"   Recent NDVI mean: {recent_ndvi.mean():.3f}")
-            print(f"   Baseline NDVI range: {baseline_ndvi.min():.3f} to {baseline_ndvi.max():.3f}")
-            print(f"   Baseline NDVI mean: {baseline_ndvi.mean():.3f}")
+            print(f"   Recent NDVI range: {recent_stats['min']:.3f} to {recent_stats['max']:.3f}")
+            print(f"   Recent NDVI mean: {recent_stats['mean']:.3f}")
+            print(f"   Baseline NDVI range: {baseline_stats['min']:.3f} to {baseline_stats['max']:.3f}")
+            print(f"   Baseline NDVI mean: {baseline_stats['mean']:.3f}")
             
             if recent_image.timestamp != baseline_image.timestamp:
-                print(f"   NDVI change: {recent_ndvi.mean() - baseline_ndvi.mean():.3f}")
+                print(f"   NDVI change: {recent_stats['mean'] - baseline_stats['mean']:.3f}")
             else:
                 print("   ⚠️  Single image analysis - no temporal change calculated")
             
             # Validate NDVI values are realistic
-            if -1 <= recent_ndvi.mean() <= 1 and -1 <= baseline_ndvi.mean() <= 1:
+            if -1 <= recent_stats['mean'] <= 1 and -1 <= baseline_stats['mean'] <= 1:
                 print("   ✅ NDVI values are within valid range [-1, 1]")
             else:
                 print("   ⚠️  NDVI values outside expected range - possible data issues")
             
-            return recent_ndvi, baseline_ndvi
+            return recent_ndvi, baseline_ndvi, baseline_stats
             
         except Exception as e:
             print(f"❌ Error calculating real NDVI: {e}")
-            return None, None
+            return None, None, None
     
-    def test_algorithms_with_real_data(self, recent_ndvi, baseline_ndvi):
-        """Test algorithms with REAL NDVI calculated from satellite data"""
+    def test_algorithms_with_real_data(self, recent_ndvi, baseline_ndvi, baseline_stats=None):
+        """
+        Test algorithms with REAL NDVI calculated from satellite data
+        
+        baseline_stats, as returned by ndvi_and_stats, supplies the baseline
+        mean and std without another pass over baseline_ndvi.
+        """
         print("\n🔬 TESTING ALGORITHMS WITH REAL SATELLITE-DERIVED DATA")
         
         # Calculate real baseline statistics 
-        baseline_mean = float(np.nanmean(baseline_ndvi))
-        baseline_std = float(np.nanstd(baseline_ndvi))
+        if baseline_stats is None:
+            baseline_stats = {'nanmean': np.nanmean(baseline_ndvi), 'nanstd': np.nanstd(baseline_ndvi)}
+        baseline_mean = float(baseline_stats['nanmean'])
+        baseline_std = float(baseline_stats['nanstd'])
         
         print(f"📊 REAL baseline statistics from satellite:")
         print(f"   Mean NDVI: {baseline_mean:.3f}")
         print(f"   Std NDVI: {baseline_std:.3f}")
         
-        # Test EWMA with real pixel values
-        print("\n🧪 Testing EWMA with REAL pixel data...")
-        ewma_results = []
-        self.ewma.reset()
-        
-        # Sample 100 random pixels from the image
+        # Sample 100 random pixels from the image, dropping any without data
+        # (seeded so reruns test the same pixels)
         height, width = recent_ndvi.shape
         num_samples = min(100, height * width)
+        rng = np.random.default_rng(0)
+        rows = rng.integers(0, height, num_samples)
+        cols = rng.integers(0, width, num_samples)
+        samples = recent_ndvi[rows, cols]
+        samples = samples[~np.isnan(samples)]
         
-        for i in range(num_samples):
-            row = np.random.randint(0, height)
-            col = np.random.randint(0, width)
-            pixel_ndvi = recent_ndvi[row, col]
-            
-            if not np.isnan(pixel_ndvi):
-                change_detected, confidence, metadata = self.ewma.detect_change(
-                    observation=float(pixel_ndvi),
-                    baseline_mean=baseline_mean,
-                    baseline_std=baseline_std
-                )
-                ewma_results.append(change_detected)
+        # Test EWMA with real pixel values
+        print("\n🧪 Testing EWMA with REAL pixel data...")
+        self.ewma.reset()
+        ewma_flags, _, _ = self.ewma.detect_change_batch(samples, baseline_mean, baseline_std)
         
-        ewma_changes = sum(ewma_results)
-        ewma_rate = ewma_changes / len(ewma_results) if ewma_results else 0
+        ewma_changes = int(ewma_flags.sum())
+        ewma_rate = ewma_changes / ewma_flags.size if ewma_flags.size else 0
         
-        print(f"   ✅ EWMA tested on {len(ewma_results)} real pixels")
+        print(f"   ✅ EWMA tested on {ewma_flags.size} real pixels")
         print(f"   🚨 Changes detected: {ewma_changes} ({ewma_rate:.1%})")
         
         # Test CUSUM with real pixel values
         print("\n🧪 Testing CUSUM with REAL pixel data...")
-        cusum_results = []
         self.cusum.reset()
+        cusum_flags, _, _ = self.cusum.detect_change_batch(samples, baseline_mean, baseline_std)
         
-        for i in range(num_samples):
-            row = np.random.randint(0, height)
-            col = np.random.randint(0, width)
-            pixel_ndvi = recent_ndvi[row, col]
-            
-            if not np.isnan(pixel_ndvi):
-                change_detected, change_type, confidence, metadata = self.cusum.detect_change(
-                    observation=float(pixel_ndvi),
-                    baseline_mean=baseline_mean,
-                    baseline_std=baseline_std
-                )
-                cusum_results.append((change_detected, change_type))
-        
-        cusum_changes = sum(1 for detected, _ in cusum_results if detected)
-        cusum_rate = cusum_changes / len(cusum_results) if cusum_results else 0
+        cusum_changes = int(cusum_flags.sum())
+        cusum_rate = cusum_changes / cusum_flags.size if cusum_flags.size else 0
         
-        print(f"   ✅ CUSUM tested on {len(cusum_results)} real pixels")
+        print(f"   ✅ CUSUM tested on {cusum_flags.size} real pixels")
         print(f"   🚨 Changes detected: {cusum_changes} ({cusum_rate:.1%})")
         
         return {
@@ -249,27 +389,30 @@ class RealSatelliteDataTester:
             'cusum_rate': cusum_rate,
             'baseline_mean': baseline_mean,
             'baseline_std': baseline_std,
-            'pixels_tested': len(ewma_results)
+            'pixels_tested': int(ewma_flags.size)
         }
     
     def create_real_data_visualization(self, recent_image, baseline_image, recent_ndvi, baseline_ndvi, results):
-        """Create visualization from REAL satellite data"""
+        """
+        Create visualization from REAL satellite data
+        
+        Builds the figure with the object-oriented API rather than pyplot, so it
+        can run on a worker thread while the event loop carries on.
+        """
         print("\n📊 CREATING VISUALIZATION FROM REAL SATELLITE DATA")
         
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(14, 10))
+        fig = Figure(figsize=(14, 10))
+        (ax1, ax2), (ax3, ax4) = fig.subplots(2, 2)
         fig.suptitle('🛰️ REAL Umananda Island Satellite Analysis', fontsize=16, fontweight='bold')
         
         # 1. Real RGB composite
         try:
-            # Create true color RGB from real bands (B04, B03, B02)
-            recent_rgb = np.stack([
-                recent_image.data[:, :, 3],  # Red
-                recent_image.data[:, :, 2],  # Green  
-                recent_image.data[:, :, 1]   # Blue
-            ], axis=-1)
-            
-            # Normalize for display (real Sentinel-2 ranges 0-1)
-            recent_rgb = np.clip(recent_rgb, 0, 1)
+            # Create true color RGB from real bands (B04, B03, B02), clipped for
+            # display (real Sentinel-2 ranges 0-1) straight into one float32 buffer
+            height, width = recent_image.data.shape[:2]
+            recent_rgb = np.empty((height, width, 3), dtype=np.float32)
+            for channel, band in enumerate((RED, GREEN, BLUE)):
+                np.clip(recent_image.data[:, :, band], 0, 1, out=recent_rgb[:, :, channel])
             
             ax1.imshow(recent_rgb)
             ax1.set_title(f'🛰️ REAL Satellite Image\n{recent_image.timestamp.strftime("%Y-%m-%d")}')
@@ -281,16 +424,20 @@ class RealSatelliteDataTester:
         
         # 2. Real NDVI map
         im2 = ax2.imshow(recent_ndvi, cmap='RdYlGn', vmin=-1, vmax=1)
-        ax2.set_title(f'🌱 REAL NDVI Map\nMean: {recent_ndvi.mean():.3f}')
+        recent_stats = self._ndvi_for(recent_image)[1]
+        baseline_stats = self._ndvi_for(baseline_image)[1]
+        ax2.set_title(f'🌱 REAL NDVI Map\nMean: {recent_stats["mean"]:.3f}')
         ax2.axis('off')
-        plt.colorbar(im2, ax=ax2, shrink=0.6)
+        fig.colorbar(im2, ax=ax2, shrink=0.6)
         
         # 3. NDVI change map
-        ndvi_change = recent_ndvi - baseline_ndvi
+        # The mean of a difference is the difference of the means, which the NDVI
+        # pass already produced, so the change map is only traversed to draw it
+        ndvi_change = np.subtract(recent_ndvi, baseline_ndvi)
         im3 = ax3.imshow(ndvi_change, cmap='RdBu_r', vmin=-0.5, vmax=0.5)
-        ax3.set_title(f'📈 REAL NDVI Change\nMean Δ: {ndvi_change.mean():.3f}')
+        ax3.set_title(f'📈 REAL NDVI Change\nMean Δ: {recent_stats["mean"] - baseline_stats["mean"]:.3f}')
         ax3.axis('off')
-        plt.colorbar(im3, ax=ax3, shrink=0.6)
+        fig.colorbar(im3, ax=ax3, shrink=0.6)
         
         # 4. Algorithm results summary
         ax4.axis('off')
@@ -319,14 +466,15 @@ class RealSatelliteDataTester:
                 bbox=dict(boxstyle="round,pad=0.5", facecolor="lightgreen", alpha=0.8),
                 transform=ax4.transAxes)
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         # Save with timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f'visuals/REAL_umananda_analysis_{timestamp}.png'
         os.makedirs('visuals', exist_ok=True)
-        plt.savefig(filename, dpi=300, bbox_inches='tight')
-        plt.close()
+        dpi = HIGH_RES_DPI if self.high_res else PREVIEW_DPI
+        FigureCanvasAgg(fig).print_figure(filename, dpi=dpi, bbox_inches='tight')
+        fig.clear()
         
         print(f"✅ Saved REAL data visualization: {filename}")
         return filename
@@ -344,22 +492,25 @@ class RealSatelliteDataTester:
             print("\n🎉 SUCCESS: REAL satellite data acquired!")
             
             # Calculate real NDVI from satellite bands
-            recent_ndvi, baseline_ndvi = self.analyze_real_ndvi_values(recent_image, baseline_image)
+            recent_ndvi, baseline_ndvi, baseline_stats = self.analyze_real_ndvi_values(recent_image, baseline_image)
             
             if recent_ndvi is not None and baseline_ndvi is not None:
                 # Test algorithms with real data
-                results = self.test_algorithms_with_real_data(recent_ndvi, baseline_ndvi)
+                results = self.test_algorithms_with_real_data(recent_ndvi, baseline_ndvi, baseline_stats)
                 
-                # Create visualization
-                viz_file = self.create_real_data_visualization(
+                # Create visualization on a worker thread; PNG encoding is only awaited at the end
+                viz_future = asyncio.get_running_loop().run_in_executor(
+                    None, self.create_real_data_visualization,
                     recent_image, baseline_image, recent_ndvi, baseline_ndvi, results
                 )
                 
                 print(f"\n🎯 REAL ANALYSIS COMPLETED!")
-                print(f"📁 Visualization: {viz_file}")
                 print("✅ 100% REAL satellite data used")
                 print("❌ 0% synthetic data used")
                 
+                viz_file = await viz_future
+                print(f"📁 Visualization: {viz_file}")
+                
                 return {
                     'success': True,
                     'recent_image': recent_image,
@@ -385,7 +536,7 @@ class RealSatelliteDataTester:
             
             return {'success': False, 'error': 'No real satellite data available'}
 
-async def main():
+async def main(high_res=False):
     """Main function to test with REAL satellite data"""
     print("🛰️ REAL SATELLITE DATA ANALYSIS - UMANANDA ISLAND")
     print("=" * 60)
@@ -394,7 +545,7 @@ async def main():
     print("🌍 COORDINATES: 26.1964°N, 91.7450°E (Brahmaputra River)")
     print()
     
-    tester = RealSatelliteDataTester()
+    tester = RealSatelliteDataTester(high_res=high_res)
     results = await tester.run_real_analysis()
     
     if results['success']:
@@ -409,4 +560,12 @@ async def main():
         print("💡 Real satellite data is required to complete this objective")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Analyze REAL Sentinel-2 data for Umananda Island")
+    parser.add_argument(
+        '--high-res',
+        action='store_true',
+        help=f'Save the analysis figure at {HIGH_RES_DPI} DPI instead of the {PREVIEW_DPI} DPI preview'
+    )
+    args = parser.parse_args()
+    
+    asyncio.run(main(high_res=args.high_res))
\ No newline at end of file
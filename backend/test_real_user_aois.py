@@ -5,35 +5,36 @@ Tests the exact coordinates that are failing in production
 
 import sys
 import os
+import asyncio
+import hashlib
+import json
 from datetime import datetime, timedelta
+from io import BytesIO
 import time
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
 
-from sentinelhub import SHConfig, DataCollection, SentinelHubRequest, BBox, CRS, MimeType, MosaickingOrder
+import httpx
+import numpy as np
+from PIL import Image
+from sentinelhub import SHConfig, DataCollection, SentinelHubRequest, SentinelHubSession, SentinelHubDownloadClient, BBox, CRS, MimeType, MosaickingOrder
 
-def test_simple_fast_preview(geojson, name):
-    """Test a SIMPLE, FAST preview - just get ONE image"""
-    print(f"\n{'='*60}")
-    print(f"TESTING: {name}")
-    print(f"{'='*60}")
-    
-    from app.core.config import settings
-    
-    # Extract bbox from geojson
-    coords = geojson['coordinates'][0]
-    lons = [c[0] for c in coords]
-    lats = [c[1] for c in coords]
-    bbox = BBox(bbox=[min(lons), min(lats), max(lons), max(lats)], crs=CRS.WGS84)
-    
-    print(f"BBox: [{min(lons):.4f}, {min(lats):.4f}, {max(lons):.4f}, {max(lats):.4f}]")
-    
-    config = SHConfig()
-    config.sh_client_id = settings.SENTINELHUB_CLIENT_ID
-    config.sh_client_secret = settings.SENTINELHUB_CLIENT_SECRET
-    
-    # SIMPLE evalscript - just RGB for preview
-    evalscript = """
+# Previews are network-bound, so up to this many are in flight at once; capped to stay within Sentinel Hub rate limits
+MAX_PREVIEW_WORKERS = 8
+
+# Retries for rate-limited (HTTP 429) process API calls, backing off 1s, 2s, 4s, ...
+MAX_RATE_LIMIT_RETRIES = 4
+
+PREVIEW_SIZE = (512, 512)
+
+# Previews from earlier runs, keyed by the rounded bbox and the day-bucketed time window
+PREVIEW_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.sh_cache')
+
+# One OAuth session per process; it only exchanges a new token once the current one expires
+_session = None
+
+# SIMPLE evalscript - just RGB for preview
+PREVIEW_EVALSCRIPT = """
     //VERSION=3
     function setup() {
         return {
@@ -46,16 +47,86 @@ def test_simple_fast_preview(geojson, name):
         return [sample.B04 * 2.5, sample.B03 * 2.5, sample.B02 * 2.5];
     }
     """
-    
-    # Get just ONE recent image - last 10 days
+
+
+def preview_bbox(geojson):
+    """[min_lon, min_lat, max_lon, max_lat] of an AOI polygon"""
+    coords = geojson['coordinates'][0]
+    lons = [c[0] for c in coords]
+    lats = [c[1] for c in coords]
+    return [min(lons), min(lats), max(lons), max(lats)]
+
+
+def preview_window():
+    """Get just ONE recent image - last 10 days"""
     end_date = datetime.now()
-    start_date = end_date - timedelta(days=10)
+    return end_date - timedelta(days=10), end_date
+
+
+def sh_config():
+    """Sentinel Hub config populated from the backend settings"""
+    from app.core.config import settings
     
-    print(f"Date range: {start_date.date()} to {end_date.date()}")
-    print("Fetching SINGLE PREVIEW image...")
+    config = SHConfig()
+    config.sh_client_id = settings.SENTINELHUB_CLIENT_ID
+    config.sh_client_secret = settings.SENTINELHUB_CLIENT_SECRET
+    return config
+
+
+def report_preview(shape, elapsed):
+    """Print the outcome of a retrieved preview against the frontend timeout"""
+    print(f"[SUCCESS] Retrieved preview in {elapsed:.1f} seconds")
+    print(f"   Image shape: {shape}")
     
-    request = SentinelHubRequest(
-        evalscript=evalscript,
+    # Check if within frontend timeout
+    if elapsed < 30:
+        print(f"   [OK] Within 30s frontend timeout")
+    else:
+        print(f"   [WARNING] Exceeds 30s timeout - will fail in frontend!")
+
+
+def report_cached_preview(shape):
+    """Print a preview loaded from the cache; no latency was measured for it"""
+    print("[CACHED] Preview loaded from a previous run - latency not measured")
+    print(f"   Image shape: {shape}")
+
+
+def get_session(config):
+    """Shared SentinelHubSession, created on first use"""
+    global _session
+    if _session is None:
+        _session = SentinelHubSession(config=config)
+    return _session
+
+
+def preview_cache_path(bounds, start_date, end_date):
+    """Cache file for a preview; bbox rounded to 4 decimals so float noise keeps the same key"""
+    key = json.dumps([
+        [round(v, 4) for v in bounds],
+        start_date.date().isoformat(),
+        end_date.date().isoformat()
+    ])
+    return os.path.join(PREVIEW_CACHE_DIR, f"{hashlib.sha1(key.encode()).hexdigest()}.npy")
+
+
+def load_cached_preview(path):
+    """Previously fetched preview image, or None on a cache miss"""
+    try:
+        return np.load(path)
+    except OSError:
+        return None
+
+
+def store_preview(path, image):
+    """Save a fetched preview so later runs skip the round-trip"""
+    os.makedirs(PREVIEW_CACHE_DIR, exist_ok=True)
+    np.save(path, image)
+
+
+def build_preview_request(bounds, start_date, end_date, config):
+    """SentinelHubRequest for a single least-cloudy RGB preview of a bbox"""
+    return SentinelHubRequest(
+        evalscript=PREVIEW_EVALSCRIPT,
         input_data=[
             SentinelHubRequest.input_data(
                 data_collection=DataCollection.SENTINEL2_L2A,
@@ -67,36 +138,142 @@ def test_simple_fast_preview(geojson, name):
         responses=[
             SentinelHubRequest.output_response('default', MimeType.PNG)
         ],
-        bbox=bbox,
-        size=(512, 512),  # Fixed size for speed
+        bbox=BBox(bbox=bounds, crs=CRS.WGS84),
+        size=PREVIEW_SIZE,  # Fixed size for speed
         config=config
     )
+
+
+def process_api_payload(geojson):
+    """Process API request body equivalent to the SentinelHubRequest preview"""
+    start_date, end_date = preview_window()
+    return {
+        "input": {
+            "bounds": {
+                "bbox": preview_bbox(geojson),
+                "properties": {"crs": "http://www.opengis.net/def/crs/OGC/1.3/CRS84"}
+            },
+            "data": [{
+                "type": "sentinel-2-l2a",
+                "dataFilter": {
+                    "timeRange": {
+                        "from": start_date.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                        "to": end_date.strftime('%Y-%m-%dT%H:%M:%SZ')
+                    },
+                    "maxCloudCoverage": 80,
+                    "mosaickingOrder": "leastCC"
+                }
+            }]
+        },
+        "output": {
+            "width": PREVIEW_SIZE[0],
+            "height": PREVIEW_SIZE[1],
+            "responses": [{"identifier": "default", "format": {"type": "image/png"}}]
+        },
+        "evalscript": PREVIEW_EVALSCRIPT
+    }
+
+
+async def fetch_preview_async(client, session, semaphore, geojson, name):
+    """Fetch one AOI's preview, posting straight to the process API"""
+    start_date, end_date = preview_window()
+    cache_path = preview_cache_path(preview_bbox(geojson), start_date, end_date)
+    cached = load_cached_preview(cache_path)
+    if cached is not None:
+        print(f"\n{name}:")
+        report_cached_preview(cached.shape)
+        return True, None
     
-    start_time = time.time()
+    payload = process_api_payload(geojson)
     
-    try:
-        data = request.get_data(save_data=False)
-        elapsed = time.time() - start_time
-        
-        if data and len(data) > 0:
-            print(f"[SUCCESS] Retrieved preview in {elapsed:.1f} seconds")
-            print(f"   Image shape: {data[0].shape}")
-            
-            # Check if within frontend timeout
-            if elapsed < 30:
-                print(f"   [OK] Within 30s frontend timeout")
-            else:
-                print(f"   [WARNING] Exceeds 30s timeout - will fail in frontend!")
+    async with semaphore:
+        start_time = time.time()
+        try:
+            for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+                # session_headers refreshes the OAuth token if it has expired
+                headers = await asyncio.to_thread(lambda: session.session_headers)
+                response = await client.post("/api/v1/process", json=payload, headers=headers)
+                if response.status_code != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+                    break
+                delay = float(response.headers.get("Retry-After", 2 ** attempt))
+                print(f"   [RATE LIMITED] {name}: retrying in {delay:.0f}s")
+                await asyncio.sleep(delay)
+            response.raise_for_status()
             
+            image = np.asarray(Image.open(BytesIO(response.content)))
+            elapsed = time.time() - start_time
+            store_preview(cache_path, image)
+            print(f"\n{name}:")
+            report_preview(image.shape, elapsed)
             return True, elapsed
+        
+        except Exception as e:
+            elapsed = time.time() - start_time
+            print(f"\n{name}:")
+            print(f"[ERROR] Failed after {elapsed:.1f} seconds: {str(e)}")
+            return False, elapsed
+
+
+async def fetch_previews_async(test_aois):
+    """Fetch every preview on one event loop, at most MAX_PREVIEW_WORKERS in flight"""
+    config = sh_config()
+    session = await asyncio.to_thread(get_session, config)
+    semaphore = asyncio.Semaphore(MAX_PREVIEW_WORKERS)
+    
+    async with httpx.AsyncClient(base_url=config.sh_base_url, timeout=120) as client:
+        outcomes = await asyncio.gather(*(
+            fetch_preview_async(client, session, semaphore, aoi['geojson'], aoi['name'])
+            for aoi in test_aois
+        ))
+    return {aoi['name']: outcome for aoi, outcome in zip(test_aois, outcomes)}
+
+
+def fetch_previews_batch(test_aois):
+    """
+    Fallback: fetch every uncached preview in one SentinelHubDownloadClient batch
+    
+    The requests share one HTTP session and OAuth token and are downloaded on
+    MAX_PREVIEW_WORKERS threads, so the reported time is the batch wall time.
+    """
+    config = sh_config()
+    start_date, end_date = preview_window()
+    
+    outcomes = {}
+    pending = []
+    for aoi in test_aois:
+        bounds = preview_bbox(aoi['geojson'])
+        cache_path = preview_cache_path(bounds, start_date, end_date)
+        cached = load_cached_preview(cache_path)
+        if cached is not None:
+            print(f"\n{aoi['name']}:")
+            report_cached_preview(cached.shape)
+            outcomes[aoi['name']] = (True, None)
         else:
+            request = build_preview_request(bounds, start_date, end_date, config)
+            pending.append((aoi['name'], cache_path, request.download_list[0]))
+    
+    if not pending:
+        return outcomes
+    
+    print(f"\nFetching {len(pending)} preview(s) in one batch...")
+    client = SentinelHubDownloadClient(
+        config=config, session=get_session(config), raise_download_errors=False
+    )
+    start_time = time.time()
+    images = client.download([download for _, _, download in pending], max_threads=MAX_PREVIEW_WORKERS)
+    elapsed = time.time() - start_time
+    
+    for (name, cache_path, _), image in zip(pending, images):
+        print(f"\n{name}:")
+        if image is None:
             print(f"[FAIL] No data after {elapsed:.1f} seconds")
-            return False, elapsed
-            
-    except Exception as e:
-        elapsed = time.time() - start_time
-        print(f"[ERROR] Failed after {elapsed:.1f} seconds: {str(e)}")
-        return False, elapsed
+            outcomes[name] = (False, elapsed)
+        else:
+            store_preview(cache_path, image)
+            report_preview(image.shape, elapsed)
+            outcomes[name] = (True, elapsed)
+    
+    return outcomes
 
 
 def main():
@@ -125,9 +302,16 @@ def main():
         }
     ]
     
+    # Fetch all previews concurrently; wall time is the slowest AOI rather than the sum
+    try:
+        outcomes = asyncio.run(fetch_previews_async(test_aois))
+    except Exception as e:
+        print(f"\n[WARNING] Async preview path failed ({e}), falling back to SentinelHubRequest")
+        outcomes = fetch_previews_batch(test_aois)
+    
     results = []
     for aoi in test_aois:
-        success, elapsed = test_simple_fast_preview(aoi['geojson'], aoi['name'])
+        success, elapsed = outcomes[aoi['name']]
         results.append({
             'name': aoi['name'],
             'success': success,
@@ -141,19 +325,28 @@ def main():
     
     for result in results:
         status = "[PASS]" if result['success'] else "[FAIL]"
+        if result['time'] is None:
+            print(f"{status} {result['name']}: [CACHED] not timed")
+            continue
         timeout_ok = "[OK]" if result['time'] < 30 else "[TIMEOUT RISK]"
         print(f"{status} {result['name']}: {result['time']:.1f}s {timeout_ok}")
     
     success_count = sum(1 for r in results if r['success'])
     print(f"\nSuccess Rate: {success_count}/{len(results)}")
     
-    # Check if any will timeout
-    timeout_risk = [r for r in results if r['time'] >= 30]
+    # Check if any will timeout; cached previews were not timed and get no verdict
+    timed = [r for r in results if r['time'] is not None]
+    timeout_risk = [r for r in timed if r['time'] >= 30]
     if timeout_risk:
         print(f"\n[WARNING] {len(timeout_risk)} AOI(s) will timeout in frontend!")
         print("RECOMMENDATION: Optimize API or increase frontend timeout")
-    else:
-        print("\n[OK] All within 30s frontend timeout")
+    elif timed:
+        print(f"\n[OK] All {len(timed)} timed AOI(s) within 30s frontend timeout")
+    
+    untimed = len(results) - len(timed)
+    if untimed:
+        print(f"[INFO] {untimed} preview(s) served from cache and not timed; "
+              f"delete {PREVIEW_CACHE_DIR} to re-measure")
 
 if __name__ == "__main__":
     main()
@@ -12,6 +12,22 @@ import numpy as np
 CLIENT_ID = "333999f3-3d9a-46b2-b530-d39776969ef3"
 CLIENT_SECRET = "utLm2mXfWUypkTzQdWryvd7SIfdoEEF8"
 
+# Simple evalscript for true color, built once rather than per request
+TRUE_COLOR_EVALSCRIPT = """
+//VERSION=3
+function setup() {
+    return {
+        input: ["B02", "B03", "B04", "SCL"],
+        output: { bands: 3 }
+    };
+}
+function evaluatePixel(sample) {
+    return [sample.B04, sample.B03, sample.B02];
+}
+"""
+
+TRUE_COLOR_RESPONSES = [SentinelHubRequest.output_response('default', MimeType.TIFF)]
+
 def test_authentication():
     """Test if credentials can authenticate with Sentinel Hub"""
     print("\n" + "="*60)
@@ -49,20 +65,6 @@ def test_data_request(config):
         bbox = BBox(bbox=[91.733, 26.1415, 91.739, 26.1475], crs=CRS.WGS84)
         size = (256, 256)
         
-        # Simple evalscript for true color
-        evalscript = """
-        //VERSION=3
-        function setup() {
-            return {
-                input: ["B02", "B03", "B04", "SCL"],
-                output: { bands: 3 }
-            };
-        }
-        function evaluatePixel(sample) {
-            return [sample.B04, sample.B03, sample.B02];
-        }
-        """
-        
         # Date range: last 30 days
         end_date = datetime.now()
         start_date = end_date - timedelta(days=30)
@@ -74,7 +76,7 @@ def test_data_request(config):
         
         # Create request
         request = SentinelHubRequest(
-            evalscript=evalscript,
+            evalscript=TRUE_COLOR_EVALSCRIPT,
             input_data=[
                 SentinelHubRequest.input_data(
                     data_collection=DataCollection.SENTINEL2_L2A,
@@ -82,9 +84,7 @@ def test_data_request(config):
                     maxcc=0.5  # Max 50% cloud coverage
                 )
             ],
-            responses=[
-                SentinelHubRequest.output_response('default', MimeType.TIFF)
-            ],
+            responses=TRUE_COLOR_RESPONSES,
             bbox=bbox,
             size=size,
             config=config
@@ -5,17 +5,30 @@ Tests Sentinel Hub API connectivity, credentials, and data retrieval
 
 import os
 import sys
+import time
+import json
+import functools
+import logging
+import threading
+from contextlib import contextmanager
+from logging.handlers import MemoryHandler
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from pathlib import Path
 from sentinelhub import (
     SHConfig, 
     DataCollection, 
     SentinelHubRequest, 
+    SentinelHubSession,
+    SentinelHubCatalog,
     BBox, 
     CRS, 
     MimeType,
     MosaickingOrder,
     bbox_to_dimensions
 )
+import httpx
+import tifffile
 from PIL import Image
 import numpy as np
 from io import BytesIO
@@ -24,9 +37,233 @@ import base64
 # Add app to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
 
+# Probes are network-bound, so this many run at once
+MAX_PROBE_WORKERS = 6
+
+# Plain message lines on stdout, same output as the former print calls
+_console = logging.StreamHandler(sys.stdout)
+_console.setFormatter(logging.Formatter('%(message)s'))
+
+logger = logging.getLogger('shtest')
+logger.addHandler(_console)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+# Availability probes only need cloud coverage, which 64x64 pixels estimate well;
+# the full size is requested once, for the image that gets saved
+PROBE_SIZE = (64, 64)
+PREVIEW_SIZE = (512, 512)
+
+# Days of imagery searched per location; LEAST_CC mosaicking picks the clearest scene
+PROBE_WINDOW_DAYS = 60
+
+# 50% cloud coverage tolerance for testing, shared by the catalog check and the request
+MAX_CLOUD_COVER = 0.5
+
+# Responses worth retrying: rate limited or temporarily unavailable
+RETRY_STATUS_CODES = (429, 503)
+
+# Seconds before expiry at which the cached OAuth session is replaced
+TOKEN_REFRESH_MARGIN = 60
+
+# OAuth token kept between runs so repeat invocations skip the token exchange
+TOKEN_CACHE_PATH = Path.home() / ".cache" / "geoguardian" / "sh_token.json"
+
+_session = None
+
+_catalog = None
+
+# Serializes creating and refreshing the shared clients, which the probe threads reach concurrently
+_clients_lock = threading.Lock()
+
+# One HTTP/2 connection multiplexes every concurrent probe instead of a handshake per request
+_http = None
+
+# Per-thread decode buffers keyed by (shape, dtype), reused by each worker's probes
+_buffers = threading.local()
+
+# Simple evalscript to check data availability, shared by every probe
+AVAILABILITY_EVALSCRIPT = """
+//VERSION=3
+function setup() {
+    return {
+        input: ["B04", "B03", "B02", "SCL"],
+        output: { bands: 4 }
+    };
+}
+
+function evaluatePixel(sample) {
+    return [sample.B04, sample.B03, sample.B02, sample.SCL];
+}
+"""
+
+AVAILABILITY_RESPONSES = [SentinelHubRequest.output_response('default', MimeType.TIFF)]
+
+
+@functools.lru_cache(maxsize=1)
+def build_config():
+    """Sentinel Hub config populated from the backend settings, built once per run"""
+    from app.core.config import settings
+    
+    config = SHConfig()
+    config.sh_client_id = settings.SENTINELHUB_CLIENT_ID
+    config.sh_client_secret = settings.SENTINELHUB_CLIENT_SECRET
+    # Bound each probe's wall time: 30s per attempt, 3 attempts backing off 1s, 2s
+    config.download_timeout_seconds = 30
+    config.max_download_attempts = 3
+    config.download_sleep_time = 1.0
+    return config
+
+
+def load_cached_token(config):
+    """Token saved by an earlier run for the same client, unless it is about to expire"""
+    try:
+        with open(TOKEN_CACHE_PATH) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    token = cached.get('token') or {}
+    if cached.get('client_id') != config.sh_client_id:
+        return None
+    if token.get('expires_at', 0) <= time.time() + TOKEN_REFRESH_MARGIN:
+        return None
+    return token
+
+
+def store_token(config, token):
+    """Save the session token for later runs, readable only by the current user"""
+    try:
+        TOKEN_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(TOKEN_CACHE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'client_id': config.sh_client_id, 'token': token}, f)
+    except OSError:
+        pass
+
+
+def get_session(config):
+    """Shared authenticated session, re-created only when its token is about to expire"""
+    global _session
+    with _clients_lock:
+        if _session is None or time.time() > _session.token['expires_at'] - TOKEN_REFRESH_MARGIN:
+            token = load_cached_token(config) if _session is None else None
+            if token:
+                _session = SentinelHubSession(config=config, _token=token)
+            else:
+                _session = SentinelHubSession(config=config)
+                store_token(config, _session.token)
+        return _session
+
+
+def get_http():
+    """Shared HTTP/2 client; the concurrent probes share its connections as streams"""
+    global _http
+    with _clients_lock:
+        if _http is None:
+            _http = httpx.Client(transport=httpx.HTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(max_connections=4, max_keepalive_connections=4)
+            ))
+        return _http
+
+
+def close_http():
+    """Close the pooled connections once the probes are done"""
+    global _http
+    with _clients_lock:
+        if _http is not None:
+            _http.close()
+            _http = None
+
+
+@contextmanager
+def buffered_log(name):
+    """
+    Logger for one probe whose records are held in memory and written as one block
+    
+    Probes run on a thread pool, so writing their lines as they happen would
+    interleave them. The buffer is flushed under the console handler's lock.
+    """
+    probe_logger = logger.getChild(name)
+    probe_logger.propagate = False
+    buffer = MemoryHandler(capacity=1024, flushLevel=logging.CRITICAL, target=_console)
+    probe_logger.addHandler(buffer)
+    try:
+        yield probe_logger
+    finally:
+        probe_logger.removeHandler(buffer)
+        _console.acquire()
+        try:
+            buffer.close()
+        finally:
+            _console.release()
+
+
+def probe_location(bbox, date_range, config, name):
+    """Run test_data_availability with its output buffered under the given name"""
+    with buffered_log(name) as log:
+        return test_data_availability(bbox, date_range, config, log)
+
+
+def download(request, config):
+    """
+    Execute a SentinelHubRequest over the shared HTTP/2 client
+    
+    sentinelhub's download client opens a fresh connection per call, so the
+    prepared download request is posted here with the shared session's token.
+    Timeouts, connection errors and 429/503 responses are retried up to
+    config.max_download_attempts times with exponential backoff, honouring
+    Retry-After when the service sends it.
+    """
+    download_request = request.download_list[0]
+    for attempt in range(config.max_download_attempts):
+        last_attempt = attempt == config.max_download_attempts - 1
+        delay = config.download_sleep_time * 2 ** attempt
+        try:
+            response = get_http().post(
+                download_request.url,
+                json=download_request.post_values,
+                headers={**download_request.headers, **get_session(config).session_headers},
+                timeout=config.download_timeout_seconds
+            )
+        except httpx.TransportError:
+            if last_attempt:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUS_CODES or last_attempt:
+                break
+            try:
+                delay = float(response.headers.get("Retry-After", delay))
+            except ValueError:
+                pass  # HTTP-date form; keep the backoff delay
+        time.sleep(delay)
+    response.raise_for_status()
+    return [decode_tiff(response.content)]
+
+
+def decode_tiff(content):
+    """
+    Decode a TIFF response into this thread's reusable buffer for its shape
+    
+    The returned array is overwritten by the thread's next download of the same
+    shape, so callers must finish with it (or copy it) before fetching again.
+    """
+    with tifffile.TiffFile(BytesIO(content)) as tif:
+        page = tif.pages[0]
+        key = (page.shape, page.dtype)
+        cache = getattr(_buffers, 'arrays', None)
+        if cache is None:
+            cache = _buffers.arrays = {}
+        if key not in cache:
+            cache[key] = np.empty(page.shape, dtype=page.dtype)
+        return tif.asarray(out=cache[key])
+
+
 def test_credentials():
     """Test if Sentinel Hub credentials are configured"""
-    print("\n=== TESTING CREDENTIALS ===")
+    logger.info("\n=== TESTING CREDENTIALS ===")
     
     from app.core.config import settings
     
@@ -34,155 +271,170 @@ def test_credentials():
     client_secret = settings.SENTINELHUB_CLIENT_SECRET
     
     if not client_id or not client_secret:
-        print("[FAIL] Sentinel Hub credentials not configured")
-        print(f"   Client ID: {'Set' if client_id else 'Missing'}")
-        print(f"   Client Secret: {'Set' if client_secret else 'Missing'}")
+        logger.info("[FAIL] Sentinel Hub credentials not configured")
+        logger.info(f"   Client ID: {'Set' if client_id else 'Missing'}")
+        logger.info(f"   Client Secret: {'Set' if client_secret else 'Missing'}")
         return False
     
-    print("[PASS] Credentials are configured")
-    print(f"   Client ID: {client_id[:8]}...{client_id[-4:]}")
+    logger.info("[PASS] Credentials are configured")
+    logger.info(f"   Client ID: {client_id[:8]}...{client_id[-4:]}")
     return True
 
 
-def test_api_connection():
+def test_api_connection(config):
     """Test basic API connection"""
-    print("\n=== TESTING API CONNECTION ===")
+    logger.info("\n=== TESTING API CONNECTION ===")
     
     try:
-        from app.core.config import settings
-        
-        config = SHConfig()
-        config.sh_client_id = settings.SENTINELHUB_CLIENT_ID
-        config.sh_client_secret = settings.SENTINELHUB_CLIENT_SECRET
+        # Always exchange credentials for a fresh token here, so revoked credentials or a
+        # broken network fail this step; the cached token only spares the probes
+        logger.info("Attempting to authenticate with Sentinel Hub...")
+        global _session
+        _session = SentinelHubSession(config=config)
+        store_token(config, _session.token)
         
-        # Try to get a token
-        print("Attempting to authenticate with Sentinel Hub...")
-        # The get_data() call will handle authentication
-        
-        print("[PASS] API connection successful")
+        logger.info("[PASS] API connection successful")
         return True
         
     except Exception as e:
-        print(f"[FAIL] API connection failed")
-        print(f"   Error: {str(e)}")
+        logger.info(f"[FAIL] API connection failed")
+        logger.info(f"   Error: {str(e)}")
         return False
 
 
-def test_data_availability(bbox, date_range):
+def get_catalog(config):
+    """Shared Catalog API client for the metadata pre-checks"""
+    global _catalog
+    with _clients_lock:
+        if _catalog is None:
+            _catalog = SentinelHubCatalog(config=config)
+        return _catalog
+
+
+def has_scene(bbox, date_range, config):
+    """Whether the catalog lists any scene under the cloud limit, without fetching pixels"""
+    results = get_catalog(config).search(
+        DataCollection.SENTINEL2_L2A,
+        bbox=bbox,
+        time=date_range,
+        filter=f"eo:cloud_cover < {MAX_CLOUD_COVER * 100:g}",
+        fields={"include": ["id"], "exclude": []},
+        limit=1
+    )
+    return next(iter(results), None) is not None
+
+
+def test_data_availability(bbox, date_range, config, log=logger, size=PROBE_SIZE):
     """Test if data is available for a specific location and time"""
-    print("\n=== TESTING DATA AVAILABILITY ===")
-    print(f"Location: [{bbox.min_x}, {bbox.min_y}, {bbox.max_x}, {bbox.max_y}]")
-    print(f"Date Range: {date_range[0].date()} to {date_range[1].date()}")
+    log.info("\n=== TESTING DATA AVAILABILITY ===")
+    log.info(f"Location: [{bbox.min_x}, {bbox.min_y}, {bbox.max_x}, {bbox.max_y}]")
+    log.info(f"Date Range: {date_range[0].date()} to {date_range[1].date()}")
     
     try:
-        from app.core.config import settings
-        
-        config = SHConfig()
-        config.sh_client_id = settings.SENTINELHUB_CLIENT_ID
-        config.sh_client_secret = settings.SENTINELHUB_CLIENT_SECRET
-        
-        # Simple evalscript to check data availability
-        evalscript = """
-        //VERSION=3
-        function setup() {
-            return {
-                input: ["B04", "B03", "B02", "SCL"],
-                output: { bands: 4 }
-            };
-        }
-        
-        function evaluatePixel(sample) {
-            return [sample.B04, sample.B03, sample.B02, sample.SCL];
-        }
-        """
+        # A metadata search costs far less than an imagery request that would come back empty
+        if not has_scene(bbox, date_range, config):
+            log.info("[FAIL] No scene in the catalog for this location/time")
+            return False, None
         
         request = SentinelHubRequest(
-            evalscript=evalscript,
+            evalscript=AVAILABILITY_EVALSCRIPT,
             input_data=[
                 SentinelHubRequest.input_data(
                     data_collection=DataCollection.SENTINEL2_L2A,
                     time_interval=date_range,
                     mosaicking_order=MosaickingOrder.LEAST_CC,
-                    maxcc=0.5  # 50% cloud coverage tolerance for testing
+                    maxcc=MAX_CLOUD_COVER
                 )
             ],
-            responses=[
-                SentinelHubRequest.output_response('default', MimeType.TIFF)
-            ],
+            responses=AVAILABILITY_RESPONSES,
             bbox=bbox,
-            size=(512, 512),
+            size=size,
             config=config
         )
         
-        print("Fetching data... (this may take 30-60 seconds)")
-        data = request.get_data(save_data=False)
+        log.info("Fetching data... (up to 30 seconds per attempt)")
+        data = download(request, config)
         
         if data and len(data) > 0:
-            print(f"[PASS] Retrieved {len(data)} image(s)")
-            print(f"   Image shape: {data[0].shape}")
-            print(f"   Data type: {data[0].dtype}")
+            log.info(f"[PASS] Retrieved {len(data)} image(s)")
+            log.info(f"   Image shape: {data[0].shape}")
+            log.info(f"   Data type: {data[0].dtype}")
             
-            # Check SCL band for cloud coverage
+            # Check SCL band for cloud coverage; cloud classes 8-11 are contiguous,
+            # so a range check replaces np.isin's lookup
             scl_band = data[0][:, :, 3]
-            cloud_pixels = np.isin(scl_band, [8, 9, 10, 11])
-            cloud_coverage = np.sum(cloud_pixels) / scl_band.size
-            print(f"   Cloud coverage: {cloud_coverage * 100:.1f}%")
+            cloud_coverage = np.count_nonzero((scl_band >= 8) & (scl_band <= 11)) / scl_band.size
+            log.info(f"   Cloud coverage: {cloud_coverage * 100:.1f}%")
             
             return True, data[0]
         else:
-            print("[FAIL] No data available for this location/time")
+            log.info("[FAIL] No data available for this location/time")
             return False, None
             
     except Exception as e:
-        print(f"[FAIL] Error fetching data")
-        print(f"   Error type: {type(e).__name__}")
-        print(f"   Error message: {str(e)}")
+        log.info(f"[FAIL] Error fetching data")
+        log.info(f"   Error type: {type(e).__name__}")
+        log.info(f"   Error message: {str(e)}")
         return False, None
 
 
 def save_test_image(data, filename="test_sentinel_output.png"):
     """Save the retrieved image for visual inspection"""
-    print(f"\n=== SAVING TEST IMAGE ===")
+    logger.info(f"\n=== SAVING TEST IMAGE ===")
     
     try:
         # Extract RGB bands (first 3 bands)
         rgb = data[:, :, :3]
         
-        # Normalize to 0-255
-        rgb_normalized = ((rgb / np.max(rgb)) * 255).astype(np.uint8)
+        # Normalize to 0-255: one scaled float32 buffer, clipped in place, then cast
+        peak = float(rgb.max()) or 1.0
+        rgb_normalized = np.multiply(rgb, np.float32(255.0 / peak), dtype=np.float32)
+        np.clip(rgb_normalized, 0, 255, out=rgb_normalized)
+        rgb_normalized = rgb_normalized.astype(np.uint8)
         
         # Create PIL Image
         img = Image.fromarray(rgb_normalized)
         
         # Save
         img.save(filename)
-        print(f"[PASS] Image saved as {filename}")
-        print(f"   Resolution: {img.size}")
+        logger.info(f"[PASS] Image saved as {filename}")
+        logger.info(f"   Resolution: {img.size}")
         
         return True
         
     except Exception as e:
-        print(f"[FAIL] Error saving image")
-        print(f"   Error: {str(e)}")
+        logger.info(f"[FAIL] Error saving image")
+        logger.info(f"   Error: {str(e)}")
         return False
 
 
 def run_comprehensive_test():
     """Run all tests"""
-    print("\n" + "="*60)
-    print("SENTINEL HUB COMPREHENSIVE TEST")
-    print("="*60)
+    logger.info("\n" + "="*60)
+    logger.info("SENTINEL HUB COMPREHENSIVE TEST")
+    logger.info("="*60)
     
     # Test 1: Credentials
     if not test_credentials():
-        print("\n[WARNING] Cannot proceed without credentials")
+        logger.info("\n[WARNING] Cannot proceed without credentials")
         return
     
+    # One config and one authenticated session serve every request below
+    config = build_config()
+    
     # Test 2: API Connection
-    if not test_api_connection():
-        print("\n[WARNING] Cannot proceed without API connection")
+    if not test_api_connection(config):
+        logger.info("\n[WARNING] Cannot proceed without API connection")
         return
     
+    try:
+        run_availability_tests(config)
+    finally:
+        close_http()
+
+
+def run_availability_tests(config):
+    """Probe every test location over the recent window and summarize the results"""
     # Test 3: Data Availability
     # Test locations in India
     test_locations = [
@@ -200,59 +452,62 @@ def run_comprehensive_test():
         }
     ]
     
-    # Test different date ranges
+    # One least-cloudy mosaic over the whole window replaces a probe per date range
     now = datetime.now()
-    date_ranges = [
-        ("Recent (last 10 days)", (now - timedelta(days=10), now)),
-        ("Last month", (now - timedelta(days=30), now - timedelta(days=10))),
-        ("2 months ago", (now - timedelta(days=60), now - timedelta(days=30))),
-    ]
+    date_range = (now - timedelta(days=PROBE_WINDOW_DAYS), now)
+    range_name = f"Last {PROBE_WINDOW_DAYS} days"
     
     successful_tests = 0
-    total_tests = len(test_locations) * len(date_ranges)
     
-    for location in test_locations:
-        print(f"\n{'='*60}")
-        print(f"TESTING LOCATION: {location['name']}")
-        print(f"{'='*60}")
+    # Fan every location's probe out at once
+    with ThreadPoolExecutor(max_workers=MAX_PROBE_WORKERS) as executor:
+        futures = {
+            executor.submit(
+                probe_location, location['bbox'], date_range, config, location['name']
+            ): location
+            for location in test_locations
+        }
         
-        for range_name, date_range in date_ranges:
-            print(f"\n--- Testing: {range_name} ---")
-            success, data = test_data_availability(location['bbox'], date_range)
-            
+        for future in as_completed(futures):
+            location = futures[future]
+            success, data = future.result()
             if success and data is not None:
                 successful_tests += 1
-                # Save the first successful image
+                logger.info(f"\n[FOUND] {location['name']}: data in {range_name}")
+                # Save the first successful image, re-requested at full size
                 if successful_tests == 1:
-                    safe_name = location['name'].replace(' ', '_').replace(',', '')
-                    save_test_image(data, f"test_{safe_name}_{range_name.replace(' ', '_')}.png")
-                break  # Found data for this location, move to next
+                    found, preview = test_data_availability(location['bbox'], date_range, config, size=PREVIEW_SIZE)
+                    if found:
+                        safe_name = location['name'].replace(' ', '_').replace(',', '')
+                        save_test_image(preview, f"test_{safe_name}_{range_name.replace(' ', '_')}.png")
+            else:
+                logger.info(f"\n[MISSING] {location['name']}: no data in {range_name}")
     
     # Summary
-    print("\n" + "="*60)
-    print("TEST SUMMARY")
-    print("="*60)
-    print(f"Successful retrievals: {successful_tests} / {len(test_locations)}")
-    print(f"Success rate: {(successful_tests / len(test_locations)) * 100:.1f}%")
+    logger.info("\n" + "="*60)
+    logger.info("TEST SUMMARY")
+    logger.info("="*60)
+    logger.info(f"Successful retrievals: {successful_tests} / {len(test_locations)}")
+    logger.info(f"Success rate: {(successful_tests / len(test_locations)) * 100:.1f}%")
     
     if successful_tests == 0:
-        print("\n[DIAGNOSIS]")
-        print("   - Credentials might be invalid or expired")
-        print("   - API quota might be exceeded")
-        print("   - Network connectivity issues")
-        print("   - Sentinel Hub service might be down")
-        print("\n[RECOMMENDATIONS]")
-        print("   1. Check your Sentinel Hub dashboard: https://apps.sentinel-hub.com/")
-        print("   2. Verify credentials are correct")
-        print("   3. Check API quotas and usage")
-        print("   4. Try again in a few minutes")
+        logger.info("\n[DIAGNOSIS]")
+        logger.info("   - Credentials might be invalid or expired")
+        logger.info("   - API quota might be exceeded")
+        logger.info("   - Network connectivity issues")
+        logger.info("   - Sentinel Hub service might be down")
+        logger.info("\n[RECOMMENDATIONS]")
+        logger.info("   1. Check your Sentinel Hub dashboard: https://apps.sentinel-hub.com/")
+        logger.info("   2. Verify credentials are correct")
+        logger.info("   3. Check API quotas and usage")
+        logger.info("   4. Try again in a few minutes")
     elif successful_tests < len(test_locations):
-        print("\n[PARTIAL SUCCESS]")
-        print("   Some locations have no recent cloud-free imagery")
-        print("   This is normal - try expanding the date range")
+        logger.info("\n[PARTIAL SUCCESS]")
+        logger.info("   Some locations have no recent cloud-free imagery")
+        logger.info("   This is normal - try expanding the date range")
     else:
-        print("\n[SUCCESS] ALL TESTS PASSED!")
-        print("   Sentinel Hub integration is working correctly")
+        logger.info("\n[SUCCESS] ALL TESTS PASSED!")
+        logger.info("   Sentinel Hub integration is working correctly")
 
 
 if __name__ == "__main__":
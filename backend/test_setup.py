@@ -3,44 +3,68 @@
 Test script to verify GeoGuardian backend setup with Supabase
 """
 
+import io
 import os
 import sys
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import version, PackageNotFoundError
 from pathlib import Path
 
 # Add the app directory to the Python path
 sys.path.append(str(Path(__file__).parent))
 
-def test_imports():
-    """Test if all required modules can be imported"""
-    print("🔍 Testing imports...")
+# (display name, distribution name) of the packages the backend needs installed
+REQUIRED_PACKAGES = [
+    ("FastAPI", "fastapi"),
+    ("Supabase", "supabase"),
+    ("Sentinel Hub", "sentinelhub"),
+    ("Uvicorn", "uvicorn"),
+]
+
+_supabase = None
+
+def _get_supabase():
+    """
+    Supabase client shared by the database checks
     
-    try:
-        import fastapi
-        print(f"✅ FastAPI: {fastapi.__version__}")
-    except ImportError as e:
-        print(f"❌ FastAPI import failed: {e}")
-        return False
+    Imported on first use rather than at module level so a broken .env is
+    reported by the test that needs it instead of aborting the whole script.
+    """
+    global _supabase
+    if _supabase is None:
+        from app.core.database import get_supabase
+        _supabase = get_supabase()
+    return _supabase
+
+@functools.lru_cache(maxsize=1)
+def _shconfig():
+    """Sentinel Hub config from the backend settings, built on first use"""
+    from app.core.config import settings
+    from sentinelhub import SHConfig
     
-    try:
-        import supabase
-        print(f"✅ Supabase: {supabase.__version__}")
-    except ImportError as e:
-        print(f"❌ Supabase import failed: {e}")
-        return False
+    config = SHConfig()
+    config.sh_client_id = settings.SENTINELHUB_CLIENT_ID
+    config.sh_client_secret = settings.SENTINELHUB_CLIENT_SECRET
+    return config
+
+def test_imports():
+    """
+    Test if all required modules are installed
     
-    try:
-        import sentinelhub
-        print(f"✅ Sentinel Hub: {sentinelhub.__version__}")
-    except ImportError as e:
-        print(f"❌ Sentinel Hub import failed: {e}")
-        return False
+    Versions are read from the installed distribution metadata, so checking
+    them does not execute each package (sentinelhub alone drags in numpy,
+    shapely and friends at import time).
+    """
+    print("🔍 Testing imports...")
     
-    try:
-        import uvicorn
-        print(f"✅ Uvicorn: {uvicorn.__version__}")
-    except ImportError as e:
-        print(f"❌ Uvicorn import failed: {e}")
-        return False
+    for label, distribution in REQUIRED_PACKAGES:
+        try:
+            print(f"✅ {label}: {version(distribution)}")
+        except PackageNotFoundError as e:
+            print(f"❌ {label} not installed: {e}")
+            return False
     
     return True
 
@@ -73,8 +97,7 @@ def test_supabase_connection():
     print("\n🔗 Testing Supabase connection...")
     
     try:
-        from app.core.database import get_supabase
-        supabase_client = get_supabase()
+        supabase_client = _get_supabase()
         
         # Test basic connection by trying to count users table
         response = supabase_client.table("users").select("*").limit(0).execute()
@@ -91,12 +114,25 @@ def test_database_tables():
     print("\n🗄️  Testing database tables...")
     
     try:
-        from app.core.database import get_supabase
-        supabase_client = get_supabase()
+        supabase_client = _get_supabase()
         
         tables = ['users', 'aois', 'alerts', 'votes']
         
+        # One RPC reports every table at once; fall back to probing each table
+        # when the check_tables function from database_migration.sql is missing
+        try:
+            existing = set(supabase_client.rpc('check_tables', {'names': tables}).execute().data or [])
+        except Exception as e:
+            print(f"⚠️  check_tables RPC unavailable ({e}), probing tables individually")
+            existing = None
+        
         for table in tables:
+            if existing is not None:
+                if table not in existing:
+                    print(f"❌ Table '{table}' error: not found")
+                    return False
+                print(f"✅ Table '{table}' exists and is accessible")
+                continue
             try:
                 # Try to query the table (limit 0 to avoid loading data)
                 response = supabase_client.table(table).select("*").limit(0).execute()
@@ -144,12 +180,7 @@ def test_sentinel_hub():
     print("\n🛰️  Testing Sentinel Hub configuration...")
     
     try:
-        from app.core.config import settings
-        from sentinelhub import SHConfig
-        
-        config = SHConfig()
-        config.sh_client_id = settings.SENTINELHUB_CLIENT_ID
-        config.sh_client_secret = settings.SENTINELHUB_CLIENT_SECRET
+        config = _shconfig()
         
         if config.sh_client_id and config.sh_client_secret:
             print(f"✅ Sentinel Hub credentials configured")
@@ -170,6 +201,40 @@ def test_sentinel_hub():
         print(f"❌ Sentinel Hub test failed: {e}")
         return False
 
+class _ThreadBufferedStdout:
+    """Stand-in for sys.stdout that keeps the prints of each capturing thread apart"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+    
+    def write(self, text):
+        return getattr(self._local, 'buffer', self.stream).write(text)
+    
+    def flush(self):
+        self.stream.flush()
+    
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+    
+    def capture(self, func, *args):
+        """Call func, returning its result and everything it printed on this thread"""
+        self._local.buffer = io.StringIO()
+        try:
+            return func(*args), self._local.buffer.getvalue()
+        finally:
+            del self._local.buffer
+
+def run_test(test_name, test_func):
+    """Run one check under its header, reporting an exception as a failure"""
+    print(f"\n{'=' * 50}")
+    print(f"Running {test_name}...")
+    try:
+        return test_func()
+    except Exception as e:
+        print(f"❌ {test_name} failed with exception: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("🌍 GeoGuardian Backend Setup Test")
@@ -184,16 +249,28 @@ def main():
         ("Sentinel Hub Config", test_sentinel_hub),
     ]
     
-    results = []
-    for test_name, test_func in tests:
-        print(f"\n{'=' * 50}")
-        print(f"Running {test_name}...")
-        try:
-            result = test_func()
-            results.append((test_name, result))
-        except Exception as e:
-            print(f"❌ {test_name} failed with exception: {e}")
-            results.append((test_name, False))
+    # Imports run first on their own: the other checks need those packages
+    (first_name, first_func), *concurrent_tests = tests
+    results = [(first_name, run_test(first_name, first_func))]
+    
+    # The remaining checks are independent network/config probes, so they run
+    # together and the script waits for the slowest rather than the sum
+    stdout = _ThreadBufferedStdout(sys.stdout)
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=len(concurrent_tests)) as executor:
+            futures = [
+                executor.submit(stdout.capture, run_test, test_name, test_func)
+                for test_name, test_func in concurrent_tests
+            ]
+    finally:
+        sys.stdout = stdout.stream
+    
+    # Report in declared order, each test's output as one block
+    for (test_name, _), future in zip(concurrent_tests, futures):
+        result, output = future.result()
+        print(output, end="")
+        results.append((test_name, result))
     
     # Summary
     print(f"\n{'=' * 50}")
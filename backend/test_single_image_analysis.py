@@ -6,12 +6,26 @@ Works with just 1 satellite image!
 
 import sys
 import os
+import io
 import asyncio
+import hashlib
+import pickle
+import tempfile
+from contextlib import redirect_stdout
 sys.path.append('.')
 
 from datetime import datetime
+from functools import lru_cache, wraps
 import logging
 import numpy as np
+from matplotlib import colormaps
+from PIL import Image
+
+# Optional GPU backend for the per-pixel spectral math; NumPy is used without it
+try:
+    import cupy as cp
+except ImportError:
+    cp = None
 
 # Import backend modules directly
 from app.core.satellite_data import SentinelDataFetcher, FetchConfig
@@ -33,6 +47,54 @@ UMANANDA_GEOJSON = {
     ]]
 }
 
+@lru_cache(maxsize=None)
+def colormap_lut(name):
+    """256-entry uint8 RGB lookup table for a matplotlib colormap, built once per name"""
+    return (colormaps[name](np.linspace(0, 1, 256))[:, :3] * 255).astype(np.uint8)
+
+# Set DEBUG in the environment for full tracebacks of handled step failures;
+# the error message itself is always printed
+DEBUG = bool(os.environ.get('DEBUG'))
+
+# Search windows in days, widened in turn until an image turns up
+SEARCH_WINDOWS_DAYS = (60, 90, 120)
+
+# Bands in the order SpectralAnalyzer reads them (B02, B03, B04, B08, B05-B07, B11, B12);
+# B01, B8A and B09 feed no index, so they are not fetched
+ANALYSIS_BANDS = ["B02", "B03", "B04", "B08", "B05", "B06", "B07", "B11", "B12"]
+
+# Spectral features from earlier runs, keyed by the scene's content and timestamp
+# and the SpectralAnalyzer source that produced them
+SPECTRAL_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.spectral_cache')
+SPECTRAL_ANALYZER_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'core', 'spectral_analyzer.py')
+
+@lru_cache(maxsize=1)
+def spectral_analyzer_digest():
+    """Hash of the SpectralAnalyzer source, read once per run"""
+    with open(SPECTRAL_ANALYZER_SOURCE, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).digest()
+
+def spectral_cache_path(image):
+    """Cache file for an image's features; any change to its pixels, timestamp or the analyzer misses"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(spectral_analyzer_digest())
+    digest.update(f"{image.timestamp.isoformat()}|{image.data.shape}|{image.data.dtype}".encode())
+    digest.update(memoryview(np.ascontiguousarray(image.data)).cast('B'))
+    return os.path.join(SPECTRAL_CACHE_DIR, f"{digest.hexdigest()}.pkl")
+
+def buffered_output(step):
+    """Collect everything a step prints and write it to stdout in one call when it ends"""
+    @wraps(step)
+    def wrapper(*args, **kwargs):
+        buffer = io.StringIO()
+        try:
+            with redirect_stdout(buffer):
+                return step(*args, **kwargs)
+        finally:
+            sys.stdout.write(buffer.getvalue())
+            sys.stdout.flush()
+    return wrapper
+
 def print_header(text):
     print("\n" + "=" * 70)
     print(f"  {text}")
@@ -56,8 +118,10 @@ class SingleImageAnalyzer:
     """Analyze environmental state from single satellite image"""
     
     def __init__(self):
+        # The decoded scene is spilled to a scratch dir and handed out as a read-only memmap
+        self._scratch_dir = tempfile.TemporaryDirectory(prefix="geoguardian_scene_")
         self.satellite_fetcher = SentinelDataFetcher(
-            FetchConfig(max_cloud_coverage=0.3, max_images=1)
+            FetchConfig(max_cloud_coverage=0.3, max_images=1, memmap_dir=self._scratch_dir.name)
         )
         self.spectral_analyzer = SpectralAnalyzer()
         self.visualizer = ChangeVisualizer()
@@ -77,11 +141,14 @@ class SingleImageAnalyzer:
             images = await self.satellite_fetcher.fetch_imagery(
                 aoi_geometry=geojson,
                 date_range=(start_date, end_date),
-                bands=None  # Use default bands
+                bands=ANALYSIS_BANDS
             )
             
             if images and len(images) > 0:
                 image = images[0]
+                # float32 is ample for index math and halves the bytes every step reads
+                if image.data.dtype == np.float64:
+                    image.data = image.data.astype(np.float32)
                 print_success(f"Found satellite image!")
                 print_info(f"Date: {image.timestamp}")
                 print_info(f"Cloud cover: {image.cloud_coverage:.1f}%")
@@ -94,10 +161,12 @@ class SingleImageAnalyzer:
                 
         except Exception as e:
             print_error(f"Image fetching failed: {e}")
-            import traceback
-            traceback.print_exc()
+            if DEBUG:
+                import traceback
+                traceback.print_exc()
             return None
     
+    @buffered_output
     def analyze_spectral_indices(self, image):
         """Analyze all spectral indices from single image"""
         print_step(2, "Analyze Spectral Indices")
@@ -105,17 +174,17 @@ class SingleImageAnalyzer:
         try:
             print_info("Extracting spectral features...")
             
-            # Extract all features
-            features = self.spectral_analyzer.extract_all_features(image.data)
+            # Extract all features; the per-index means come from the same pass
+            features = self._cached_features(image)
             
-            indices = features['indices']
+            means = {name: stats['mean'] for name, stats in features['stats'].items()}
             
             print_success("Spectral analysis complete!")
             print_info(f"\n📊 Spectral Indices Results:")
             
             # Vegetation Health
-            if 'ndvi' in indices:
-                ndvi_mean = np.nanmean(indices['ndvi'])
+            if 'ndvi' in means:
+                ndvi_mean = means['ndvi']
                 print(f"\n🌱 Vegetation Health:")
                 print(f"   • NDVI (Normalized Difference Vegetation Index): {ndvi_mean:.3f}")
                 if ndvi_mean > 0.6:
@@ -125,13 +194,13 @@ class SingleImageAnalyzer:
                 else:
                     print(f"     → Status: ❌ Poor/no vegetation")
             
-            if 'evi' in indices:
-                evi_mean = np.nanmean(indices['evi'])
+            if 'evi' in means:
+                evi_mean = means['evi']
                 print(f"   • EVI (Enhanced Vegetation Index): {evi_mean:.3f}")
             
             # Water Quality
-            if 'ndwi' in indices:
-                ndwi_mean = np.nanmean(indices['ndwi'])
+            if 'ndwi' in means:
+                ndwi_mean = means['ndwi']
                 print(f"\n💧 Water Quality:")
                 print(f"   • NDWI (Normalized Difference Water Index): {ndwi_mean:.3f}")
                 if ndwi_mean > 0.3:
@@ -142,8 +211,8 @@ class SingleImageAnalyzer:
                     print(f"     → Status: ❌ Minimal water")
             
             # Urban/Built-up
-            if 'ndbi' in indices:
-                ndbi_mean = np.nanmean(indices['ndbi'])
+            if 'ndbi' in means:
+                ndbi_mean = means['ndbi']
                 print(f"\n🏗️ Built-up Areas:")
                 print(f"   • NDBI (Normalized Difference Built-up Index): {ndbi_mean:.3f}")
                 if ndbi_mean > 0.1:
@@ -152,13 +221,13 @@ class SingleImageAnalyzer:
                     print(f"     → Status: ✅ Natural/vegetated area")
             
             # Soil/Bareness
-            if 'bsi' in indices:
-                bsi_mean = np.nanmean(indices['bsi'])
+            if 'bsi' in means:
+                bsi_mean = means['bsi']
                 print(f"\n🏜️ Bare Soil:")
                 print(f"   • BSI (Bare Soil Index): {bsi_mean:.3f}")
             
             # Overall Environmental Health Score
-            health_score = self._calculate_health_score(indices)
+            health_score = self._calculate_health_score(means)
             print(f"\n🎯 Overall Environmental Health Score: {health_score:.1f}/100")
             
             if health_score > 75:
@@ -174,34 +243,85 @@ class SingleImageAnalyzer:
             
         except Exception as e:
             print_error(f"Spectral analysis failed: {e}")
-            import traceback
-            traceback.print_exc()
+            if DEBUG:
+                import traceback
+                traceback.print_exc()
             return None, 0
     
-    def _calculate_health_score(self, indices):
-        """Calculate overall environmental health score (0-100)"""
+    def _cached_features(self, image):
+        """
+        extract_all_features with stats, reusing the result saved by an earlier run
+        
+        The band views are not saved; they are cheap slices of image.data and
+        are rebuilt on a hit.
+        """
+        path = spectral_cache_path(image)
+        try:
+            with open(path, 'rb') as f:
+                features = pickle.load(f)
+            features['bands'] = self.spectral_analyzer._extract_bands(image.data)
+            print_info("Reusing cached spectral features")
+            return features
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+        
+        if cp is not None:
+            features = self._gpu_features(image)
+        else:
+            features = self.spectral_analyzer.extract_all_features(image.data, include_stats=True)
+        try:
+            os.makedirs(SPECTRAL_CACHE_DIR, exist_ok=True)
+            with open(path, 'wb') as f:
+                pickle.dump({k: v for k, v in features.items() if k != 'bands'}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            pass
+        return features
+    
+    def _gpu_features(self, image):
+        """
+        extract_all_features run on a CuPy copy of the scene
+        
+        SpectralAnalyzer's NumPy calls dispatch to CuPy for device arrays, so
+        the scene is uploaded once and the stats come back as plain floats.
+        Index arrays and the mask are copied back so the heatmap and the disk
+        cache stay host-side.
+        """
+        features = self.spectral_analyzer.extract_all_features(cp.asarray(image.data), include_stats=True)
+        features['indices'] = {name: cp.asnumpy(values) for name, values in features['indices'].items()}
+        features['valid_mask'] = cp.asnumpy(features['valid_mask'])
+        features['bands'] = self.spectral_analyzer._extract_bands(image.data)
+        return features
+    
+    def _calculate_health_score(self, means):
+        """Calculate overall environmental health score (0-100) from per-index means"""
         score = 50  # Base score
         
         # Positive indicators
-        if 'ndvi' in indices:
-            ndvi = np.nanmean(indices['ndvi'])
+        if 'ndvi' in means:
+            ndvi = means['ndvi']
             score += min(ndvi * 30, 30)  # Up to +30 for vegetation
         
-        if 'ndwi' in indices:
-            ndwi = np.nanmean(indices['ndwi'])
+        if 'ndwi' in means:
+            ndwi = means['ndwi']
             if ndwi > 0:
                 score += min(ndwi * 10, 10)  # Up to +10 for water
         
         # Negative indicators
-        if 'ndbi' in indices:
-            ndbi = np.nanmean(indices['ndbi'])
+        if 'ndbi' in means:
+            ndbi = means['ndbi']
             if ndbi > 0.1:
                 score -= min(ndbi * 20, 20)  # Up to -20 for urbanization
         
         return max(0, min(100, score))
     
-    def generate_visualizations(self, image):
-        """Generate single-image visualizations"""
+    @buffered_output
+    def generate_visualizations(self, image, features=None):
+        """
+        Generate single-image visualizations
+        
+        Reuses the NDVI from the spectral analysis step when its features are
+        passed in, and only extracts them again otherwise.
+        """
         print_step(3, "Generate Visualizations")
         
         try:
@@ -215,11 +335,11 @@ class SingleImageAnalyzer:
             print_info("Generating NDVI heatmap...")
             
             # Calculate NDVI
-            features = self.spectral_analyzer.extract_all_features(image.data)
+            if features is None:
+                features = self.spectral_analyzer.extract_all_features(image.data)
             if 'ndvi' in features['indices']:
                 ndvi_viz = self._create_index_heatmap(
                     features['indices']['ndvi'],
-                    title='NDVI - Vegetation Health',
                     colormap='RdYlGn'
                 )
                 print_success("NDVI heatmap generated!")
@@ -236,55 +356,67 @@ class SingleImageAnalyzer:
             return None
     
     def _create_rgb_composite(self, image_data):
-        """Create RGB composite from satellite data"""
+        """Create 8-bit RGB composite from satellite data"""
         # Simple RGB extraction (bands 2,1,0 for Sentinel-2)
         if image_data.ndim == 3 and image_data.shape[2] >= 3:
-            rgb = image_data[:, :, [2, 1, 0]]  # R, G, B
-            # Normalize to 0-1
-            rgb = (rgb - rgb.min()) / (rgb.max() - rgb.min() + 1e-8)
-            return rgb
+            rgb = image_data[:, :, 2::-1]  # R, G, B as a strided view, no copy
+            # Stretch to 0-255 in one float32 buffer, then store as uint8
+            low = rgb.min()
+            scaled = np.subtract(rgb, low, dtype=np.float32)
+            np.multiply(scaled, np.float32(255.0 / (rgb.max() - low + 1e-8)), out=scaled)
+            np.clip(scaled, 0, 255, out=scaled)
+            return scaled.astype(np.uint8)
         return None
     
-    def _create_index_heatmap(self, index_data, title, colormap='viridis'):
-        """Create heatmap visualization for spectral index"""
+    def _create_index_heatmap(self, index_data, colormap='viridis'):
+        """
+        Create heatmap visualization for spectral index
+        
+        Values are mapped on a fixed -1..1 scale through the colormap's lookup
+        table and encoded straight to JPEG (quality 85; compression artifacts are
+        irrelevant for an index heatmap), without building a matplotlib figure.
+        """
         try:
-            import matplotlib.pyplot as plt
-            
-            fig, ax = plt.subplots(figsize=(10, 8))
-            im = ax.imshow(index_data, cmap=colormap, interpolation='bilinear')
-            plt.colorbar(im, ax=ax, label='Index Value')
-            ax.set_title(title, fontsize=14, fontweight='bold')
-            ax.axis('off')
+            # NaN (no data) pixels are drawn at the neutral midpoint
+            scaled = np.nan_to_num(np.clip(index_data, -1, 1), nan=0.0)
+            rgb = colormap_lut(colormap)[((scaled + 1) * 127.5).astype(np.uint8)]
             
             # Convert to base64
             import io
             import base64
             buf = io.BytesIO()
-            plt.savefig(buf, format='png', bbox_inches='tight', dpi=150)
-            buf.seek(0)
+            Image.fromarray(rgb).save(buf, format='JPEG', quality=85)
             img_base64 = base64.b64encode(buf.getvalue()).decode('utf-8')
-            plt.close(fig)
             
-            return f"data:image/png;base64,{img_base64}"
+            return f"data:image/jpeg;base64,{img_base64}"
         except:
             return None
     
-    async def run_analysis(self, geojson, days_back=60):
-        """Run complete single-image analysis"""
+    async def fetch_latest_image_adaptive(self, geojson, windows=SEARCH_WINDOWS_DAYS):
+        """Fetch the most recent image, widening the search window until one is found"""
+        for days_back in windows:
+            image = await self.fetch_latest_image(geojson, days_back)
+            if image:
+                return image
+            print_info(f"🔄 Nothing in the last {days_back} days, widening the search...")
+        return None
+    
+    async def run_analysis(self, geojson, windows=SEARCH_WINDOWS_DAYS):
+        """Run complete single-image analysis, analysing the first image found exactly once"""
         print_header("🛰️  SINGLE IMAGE ENVIRONMENTAL ANALYSIS")
         print(f"📍 Location: Umananda Island")
         print(f"🌍 Analyzing current environmental state")
-        print(f"📅 Search range: Last {days_back} days")
+        print(f"📅 Search range: Last {windows[0]} days, widening up to {windows[-1]}")
         print(f"⏰ Analysis started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print_info("✨ No change detection - just current state analysis!")
         
         # Step 1: Fetch latest image
-        image = await self.fetch_latest_image(geojson, days_back)
+        image = await self.fetch_latest_image_adaptive(geojson, windows)
         
         if not image:
             print_error("\n❌ No satellite image available")
             print_info("Try:")
-            print("   • Extending date range to 90 days")
+            print(f"   • Extending date range beyond {windows[-1]} days")
             print("   • Different location")
             print("   • Waiting 2-5 days for next pass")
             return False
@@ -297,7 +429,7 @@ class SingleImageAnalyzer:
             return False
         
         # Step 3: Generate visualizations
-        visualizations = self.generate_visualizations(image)
+        visualizations = self.generate_visualizations(image, features)
         
         # Final summary
         print_header("✅ ANALYSIS COMPLETE - SUCCESS!")
@@ -326,12 +458,8 @@ async def main():
     """Run single-image analysis"""
     analyzer = SingleImageAnalyzer()
     
-    # Try with 60 days first, then 90 if needed
-    success = await analyzer.run_analysis(UMANANDA_GEOJSON, days_back=60)
-    
-    if not success:
-        print_info("\n🔄 Trying with 90 days...")
-        success = await analyzer.run_analysis(UMANANDA_GEOJSON, days_back=90)
+    # The search window widens inside run_analysis, so the image is analysed only once
+    success = await analyzer.run_analysis(UMANANDA_GEOJSON)
     
     if success:
         print_info("\n🏆 Single-image analysis successful!")
@@ -11,6 +11,7 @@ sys.path.append('.')
 
 from datetime import datetime
 import logging
+import numpy as np
 
 # Import backend modules directly
 from app.core.satellite_data import SentinelDataFetcher, FetchConfig
@@ -35,6 +36,21 @@ UMANANDA_GEOJSON = {
     ]]
 }
 
+# Set DEBUG in the environment for full tracebacks of handled step failures;
+# the error message itself is always printed
+DEBUG = bool(os.environ.get('DEBUG'))
+
+# Rows per slice when differencing scenes, so each slice's operands stay cache-resident
+CHANGE_TILE_ROWS = 256
+
+def change_map(before, after, tile_rows=CHANGE_TILE_ROWS):
+    """after - before as float32, written slice by slice into one preallocated array"""
+    change = np.empty(after.shape, dtype=np.float32)
+    for r0 in range(0, after.shape[0], tile_rows):
+        rows = slice(r0, r0 + tile_rows)
+        np.subtract(after[rows], before[rows], out=change[rows], dtype=np.float32)
+    return change
+
 def print_header(text):
     """Print formatted header"""
     print("\n" + "=" * 70)
@@ -62,7 +78,8 @@ def print_info(text):
 class UmanandaDirectTester:
     """Direct backend testing without HTTP"""
     
-    def __init__(self):
+    def __init__(self, geojson=None):
+        self.geojson = geojson or UMANANDA_GEOJSON
         self.analysis_engine = AdvancedAnalysisEngine()
         self.satellite_fetcher = SentinelDataFetcher(
             FetchConfig(
@@ -74,45 +91,29 @@ class UmanandaDirectTester:
         self.asset_manager = AssetManager()
         self.visualizer = ChangeVisualizer()
         
-    async def test_data_availability(self, date_range_days=60):
-        """Test if satellite data is available"""
-        print_step(1, f"Check Satellite Data Availability ({date_range_days} days)")
-        
-        try:
-            print_info("Querying Sentinel Hub API...")
-            data_availability = await self.satellite_fetcher.validate_data_availability(
-                UMANANDA_GEOJSON, 
-                date_range_days
-            )
-            
-            if data_availability.get('sufficient_for_analysis'):
-                print_success("Satellite data is available!")
-                print_info(f"Images available: {data_availability.get('images_available', 'Unknown')}")
-                print_info(f"Latest image: {data_availability.get('latest_image', {}).get('timestamp', 'Unknown')}")
-                return True
-            else:
-                print_error("Insufficient satellite data")
-                print_info(f"Reason: {data_availability.get('message', 'Unknown')}")
-                print_info(f"Images found: {data_availability.get('images_available', 0)}")
-                return False
-                
-        except Exception as e:
-            print_error(f"Data availability check failed: {e}")
-            return False
+    def _start_fetch(self, date_range_days):
+        """Start fetching the recent/baseline pair in the background, without reporting"""
+        return asyncio.create_task(
+            self.satellite_fetcher.get_latest_images_for_change_detection(self.geojson, date_range_days)
+        )
     
-    async def fetch_satellite_images(self, date_range_days=60):
-        """Fetch actual satellite imagery"""
-        print_step(2, f"Fetch Satellite Imagery ({date_range_days} days)")
+    async def fetch_satellite_images(self, date_range_days=60, pending=None):
+        """Fetch actual satellite imagery, or report on a fetch already started with _start_fetch"""
+        print_step(1, f"Fetch Satellite Imagery ({date_range_days} days)")
         
         try:
             print_info("Fetching images from Sentinel Hub...")
             
-            recent_image, baseline_image = await self.satellite_fetcher.get_latest_images_for_change_detection(
-                UMANANDA_GEOJSON, 
-                date_range_days
-            )
+            if pending is None:
+                pending = self._start_fetch(date_range_days)
+            recent_image, baseline_image = await pending
             
             if recent_image and baseline_image:
+                # float32 is ample for index math and halves the bytes every step reads
+                for image in (recent_image, baseline_image):
+                    if image.data.dtype == np.float64:
+                        image.data = image.data.astype(np.float32)
+                
                 print_success("Successfully fetched satellite imagery!")
                 print_info(f"Recent image: {recent_image.timestamp}")
                 print_info(f"Baseline image: {baseline_image.timestamp}")
@@ -125,13 +126,14 @@ class UmanandaDirectTester:
                 
         except Exception as e:
             print_error(f"Image fetching failed: {e}")
-            import traceback
-            traceback.print_exc()
+            if DEBUG:
+                import traceback
+                traceback.print_exc()
             return None, None
     
     async def run_comprehensive_analysis(self, before_image, after_image):
         """Run comprehensive environmental analysis"""
-        print_step(3, "Run Comprehensive Environmental Analysis")
+        print_step(2, "Run Comprehensive Environmental Analysis")
         
         try:
             print_info("Running multi-algorithm analysis...")
@@ -140,7 +142,7 @@ class UmanandaDirectTester:
             results = self.analysis_engine.analyze_environmental_change(
                 before_image=before_image.data,
                 after_image=after_image.data,
-                geojson=UMANANDA_GEOJSON,
+                geojson=self.geojson,
                 analysis_type="comprehensive"
             )
             
@@ -165,43 +167,52 @@ class UmanandaDirectTester:
             
         except Exception as e:
             print_error(f"Analysis failed: {e}")
-            import traceback
-            traceback.print_exc()
+            if DEBUG:
+                import traceback
+                traceback.print_exc()
             return None
     
     async def generate_visualizations(self, before_image, after_image):
         """Generate all visualizations"""
-        print_step(4, "Generate Visualizations")
+        print_step(3, "Generate Visualizations")
         
         try:
-            print_info("Generating change heatmap...")
-            heatmap = self.visualizer.generate_change_heatmap(
-                before_image=before_image.data,
-                after_image=after_image.data,
-                title=f'Umananda Island - Change Heat Map'
+            # One difference of the scenes feeds all three renders
+            change = change_map(before_image.data, after_image.data)
+            
+            # The three renders are independent, so they run side by side on
+            # worker threads; ChangeVisualizer draws on private Figures, not pyplot
+            print_info("Generating change heatmap, comparison view and animated GIF...")
+            heatmap, comparison, gif = await asyncio.gather(
+                asyncio.to_thread(
+                    self.visualizer.generate_change_heatmap,
+                    before_image=before_image.data,
+                    after_image=after_image.data,
+                    title=f'Umananda Island - Change Heat Map',
+                    change_map=change
+                ),
+                asyncio.to_thread(
+                    self.visualizer.generate_comparison_view,
+                    before_image=before_image.data,
+                    after_image=after_image.data,
+                    change_map=change
+                ),
+                asyncio.to_thread(
+                    self.visualizer.generate_change_gif,
+                    before_image=before_image.data,
+                    after_image=after_image.data,
+                    change_map=change,
+                    duration=1000
+                )
             )
             
             if heatmap:
                 print_success("Heatmap generated!")
                 print_info(f"Heatmap data size: {len(heatmap)} bytes")
             
-            print_info("Generating comparison view...")
-            comparison = self.visualizer.generate_comparison_view(
-                before_image=before_image.data,
-                after_image=after_image.data,
-                change_map=after_image.data - before_image.data
-            )
-            
             if comparison:
                 print_success("Comparison view generated!")
             
-            print_info("Generating animated GIF...")
-            gif = self.visualizer.generate_change_gif(
-                before_image=before_image.data,
-                after_image=after_image.data,
-                duration=1000
-            )
-            
             if gif:
                 print_success("Animated GIF generated!")
                 print_info(f"GIF data size: {len(gif)} bytes")
@@ -214,28 +225,48 @@ class UmanandaDirectTester:
             
         except Exception as e:
             print_error(f"Visualization generation failed: {e}")
-            import traceback
-            traceback.print_exc()
+            if DEBUG:
+                import traceback
+                traceback.print_exc()
             return None
     
-    async def run_full_test(self, date_range_days=60):
-        """Run complete test workflow"""
+    async def run_full_test(self, date_range_days=60, geojson=None):
+        """Run complete test workflow, optionally against a different AOI"""
+        if geojson is not None:
+            self.geojson = geojson
+        
         print_header("🛰️  UMANANDA ISLAND - DIRECT BACKEND TEST")
         print(f"📍 Location: World's smallest inhabited river island")
         print(f"🌍 Coordinates: 26.1964°N, 91.7450°E (Brahmaputra River, Guwahati)")
         print(f"📅 Date range: {date_range_days} days of historical data")
         print(f"⏰ Test started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
-        # Step 1: Check data availability
-        data_available = await self.test_data_availability(date_range_days)
+        # Step 1: Fetch satellite images; getting a recent/baseline pair is itself
+        # the availability check, so the catalog is not queried twice per window
+        fallback = None
+        if date_range_days < 90:
+            # The 90-day fallback is fetched speculatively alongside the first window,
+            # sharing one authenticated session, and dropped if it turns out unneeded
+            try:
+                await asyncio.to_thread(self.satellite_fetcher.connect)
+            except Exception:
+                pass  # Reported by the fetch itself
+            fallback = self._start_fetch(90)
+        
+        recent_image, baseline_image = await self.fetch_satellite_images(date_range_days)
         
-        if not data_available and date_range_days < 90:
-            print_info("\n⚠️  Insufficient data with {date_range_days} days. Trying 90 days...")
-            data_available = await self.test_data_availability(90)
-            if data_available:
-                date_range_days = 90
+        if fallback is not None:
+            if recent_image and baseline_image:
+                # Only the awaiting task is dropped; the 90-day download already running in
+                # its worker thread still completes and still counts against the Sentinel
+                # Hub quota. Retrieve any error it ended with so asyncio does not log it.
+                fallback.add_done_callback(lambda t: t.cancelled() or t.exception())
+                fallback.cancel()
+            else:
+                print_info(f"\n⚠️  Insufficient data with {date_range_days} days. Trying 90 days...")
+                recent_image, baseline_image = await self.fetch_satellite_images(90, pending=fallback)
         
-        if not data_available:
+        if not recent_image or not baseline_image:
             print_error("\n❌ No satellite data available even with 90 days")
             print_info("Recommendations:")
             print("   • Wait 2-5 days for next Sentinel-2 pass")
@@ -243,21 +274,14 @@ class UmanandaDirectTester:
             print("   • Check Sentinel Hub API status")
             return False
         
-        # Step 2: Fetch satellite images
-        recent_image, baseline_image = await self.fetch_satellite_images(date_range_days)
-        
-        if not recent_image or not baseline_image:
-            print_error("\n❌ Failed to fetch satellite imagery")
-            return False
-        
-        # Step 3: Run comprehensive analysis
+        # Step 2: Run comprehensive analysis
         results = await self.run_comprehensive_analysis(baseline_image, recent_image)
         
         if not results:
             print_error("\n❌ Analysis failed")
             return False
         
-        # Step 4: Generate visualizations
+        # Step 3: Generate visualizations
         visualizations = await self.generate_visualizations(baseline_image, recent_image)
         
         # Final summary
@@ -4,16 +4,22 @@ Direct Backend Test for Umananda Island
 Tests complete analysis workflow without frontend
 """
 
-import requests
+import asyncio
+import contextvars
+import hashlib
+import httpx
+import io
 import json
+import orjson
 import time
 import sys
 import os
+import random
+import socket
+from contextlib import redirect_stdout
 from datetime import datetime
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+from functools import wraps
+from urllib.parse import urlsplit
 
 # Backend API base URL
 BASE_URL = "http://localhost:8000"
@@ -22,10 +28,52 @@ BASE_URL = "http://localhost:8000"
 TEST_USER_EMAIL = "test-umananda@geoguardian.test"
 TEST_USER_PASSWORD = "test-password-123-secure"
 
-# Create headers
-HEADERS = {
-    'Content-Type': 'application/json',
-}
+def resolve_base_url(url):
+    """
+    Resolve the backend host once so new connections skip the resolver
+    
+    Returns the URL with the host replaced by its address, plus the Host header that
+    keeps vhost routing intact. https URLs are left alone so certificate checks still
+    see the hostname.
+    """
+    parts = urlsplit(url)
+    if parts.scheme != 'http' or not parts.hostname:
+        return url, {}
+    try:
+        address = socket.gethostbyname(parts.hostname)
+    except OSError:
+        return url, {}
+    return url.replace(parts.hostname, address, 1), {'Host': parts.netloc}
+
+RESOLVED_BASE_URL, HOST_HEADERS = resolve_base_url(BASE_URL)
+
+# One async keep-alive client for every call; it carries the JSON content type and,
+# after login, the bearer token. Independent steps share it concurrently.
+# HTTP/2 multiplexes them over one connection when the backend is served over TLS;
+# plain http:// stays on HTTP/1.1 keep-alive.
+CLIENT = httpx.AsyncClient(
+    base_url=RESOLVED_BASE_URL,
+    http2=True,
+    headers={'Content-Type': 'application/json', **HOST_HEADERS},
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    timeout=600
+)
+
+# With USE_MOCK=1, successful responses are recorded on disk and replayed on
+# re-runs instead of re-running the satellite pipeline on the backend.
+# Set by main() once .env has been loaded.
+USE_MOCK = False
+RESPONSE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.response_cache')
+
+# Transport errors and 5xx responses are retried with exponential backoff plus
+# up to a second of jitter, the delay capped at RETRY_MAX_DELAY seconds
+RETRY_ATTEMPTS = 3
+RETRY_MAX_DELAY = 30
+
+# Backoff between status polls for an analysis the backend reports as queued/running,
+# capped at ANALYSIS_WAIT_SECONDS of total waiting
+POLL_DELAYS = (1, 2, 4, 8, 16, 30)
+ANALYSIS_WAIT_SECONDS = 600
 
 # Umananda Island coordinates
 UMANANDA_GEOJSON = {
@@ -39,6 +87,62 @@ UMANANDA_GEOJSON = {
     ]]
 }
 
+# Request bodies are serialized once at import and sent as raw bytes
+UMANANDA_GEOJSON_BYTES = orjson.dumps(UMANANDA_GEOJSON)
+LOGIN_BODY = orjson.dumps({"email": TEST_USER_EMAIL, "password": TEST_USER_PASSWORD})
+REGISTER_BODY = orjson.dumps({
+    "email": TEST_USER_EMAIL,
+    "password": TEST_USER_PASSWORD,
+    "name": "Test User - Umananda"
+})
+
+class _TaskBufferedStdout:
+    """Stand-in for sys.stdout that keeps the prints of each capturing asyncio task apart"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self._buffer = contextvars.ContextVar('stdout_buffer', default=None)
+    
+    def write(self, text):
+        return (self._buffer.get() or self.stream).write(text)
+    
+    def flush(self):
+        self.stream.flush()
+    
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+    
+    async def capture(self, coro):
+        """Await coro, returning its result and everything it printed in this task"""
+        buffer = io.StringIO()
+        token = self._buffer.set(buffer)
+        try:
+            return await coro, buffer.getvalue()
+        finally:
+            self._buffer.reset(token)
+
+def buffered_output(section):
+    """Collect everything a section prints and write it to stdout in one call when it ends"""
+    @wraps(section)
+    def wrapper(*args, **kwargs):
+        buffer = io.StringIO()
+        try:
+            with redirect_stdout(buffer):
+                return section(*args, **kwargs)
+        finally:
+            sys.stdout.write(buffer.getvalue())
+            sys.stdout.flush()
+    return wrapper
+
+def _json(response):
+    """Decode a response body with orjson; an empty body is {}"""
+    return orjson.loads(response.content) if response.content else {}
+
+def json_body(geojson_bytes, **fields):
+    """Build a JSON request body from small fields around the pre-encoded GeoJSON"""
+    head = orjson.dumps(fields)[:-1]
+    return head + (b',' if fields else b'') + b'"geojson":' + geojson_bytes + b'}'
+
 def print_header(text):
     """Print formatted header"""
     print("\n" + "=" * 70)
@@ -62,39 +166,82 @@ def print_info(text):
     """Print info message"""
     print(f"ℹ️  {text}")
 
-def create_test_user_and_login():
-    """Create test user or login if exists"""
+async def request_with_retry(method, path, retry=True, **kwargs):
+    """Send a request through the shared client, retrying transport errors and 5xx responses"""
+    attempts = RETRY_ATTEMPTS if retry else 1
+    for attempt in range(attempts):
+        last_attempt = attempt == attempts - 1
+        try:
+            response = await CLIENT.request(method, path, **kwargs)
+        except httpx.TransportError:
+            if last_attempt:
+                raise
+        else:
+            if response.status_code < 500 or last_attempt:
+                return response
+        await asyncio.sleep(min(RETRY_MAX_DELAY, 2 ** attempt) + random.uniform(0, 1))
+
+async def send(method, path, retry=True, **kwargs):
+    """
+    Send a request, replaying recorded responses when USE_MOCK is set
+    
+    Responses are keyed by method, path and body bytes; only 200 responses are recorded.
+    Pass retry=False for requests too expensive to repeat blindly.
+    """
+    if not USE_MOCK:
+        return await request_with_retry(method, path, retry, **kwargs)
+    
+    key = f"{method} {path}\n".encode() + kwargs.get('content', b'')
+    cache_path = os.path.join(RESPONSE_CACHE_DIR, f"{hashlib.sha1(key).hexdigest()}.json")
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            cached = json.load(f)
+        return httpx.Response(cached['status_code'], text=cached['text'])
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    response = await request_with_retry(method, path, retry, **kwargs)
+    if response.status_code == 200:
+        os.makedirs(RESPONSE_CACHE_DIR, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'status_code': response.status_code, 'text': response.text}, f)
+    return response
+
+async def login():
+    """POST the test credentials to the login endpoint"""
+    return await send(
+        "POST",
+        "/api/auth/login",
+        content=LOGIN_BODY,
+        timeout=10
+    )
+
+async def create_test_user_and_login():
+    """Login as the test user, registering it first only if login fails"""
     print_step(1, "User Authentication")
     
     try:
-        # Try to register test user
         print_info(f"Creating/logging in test user: {TEST_USER_EMAIL}")
         
-        register_response = requests.post(
-            f"{BASE_URL}/api/auth/register",
-            json={
-                "email": TEST_USER_EMAIL,
-                "password": TEST_USER_PASSWORD,
-                "name": "Test User - Umananda"
-            },
-            timeout=10
-        )
+        # Try login first (user usually exists from a previous run)
+        login_response = await login()
         
-        # Try login (user may already exist)
-        login_response = requests.post(
-            f"{BASE_URL}/api/auth/login",
-            json={
-                "email": TEST_USER_EMAIL,
-                "password": TEST_USER_PASSWORD
-            },
-            timeout=10
-        )
+        if login_response.status_code != 200:
+            # Register the test user, then retry login once
+            print_info("Login failed, registering test user...")
+            await send(
+                "POST",
+                "/api/auth/register",
+                content=REGISTER_BODY,
+                timeout=10
+            )
+            login_response = await login()
         
         if login_response.status_code == 200:
-            data = login_response.json()
+            data = _json(login_response)
             access_token = data.get('access_token')
             if access_token:
-                HEADERS['Authorization'] = f'Bearer {access_token}'
+                CLIENT.headers['Authorization'] = f'Bearer {access_token}'
                 print_success("Authenticated successfully!")
                 print_info(f"User ID: {data.get('user', {}).get('id', 'unknown')}")
                 return True
@@ -107,15 +254,15 @@ def create_test_user_and_login():
         print_error(f"Authentication failed: {e}")
         return False
 
-def test_health_check():
+async def test_health_check():
     """Test if backend is running"""
     print_step(1, "Health Check")
     try:
         # Try system status endpoint instead
-        response = requests.get(f"{BASE_URL}/api/v2/analysis/system/status", headers=HEADERS, timeout=10)
+        response = await send("GET", "/api/v2/analysis/system/status", timeout=10)
         if response.status_code == 200:
             print_success("Backend is online and healthy")
-            data = response.json()
+            data = _json(response)
             if data.get('system_online'):
                 print_info(f"Database: {data.get('database_status', 'unknown')}")
                 print_info(f"Satellite service: {data.get('satellite_service_status', 'unknown')}")
@@ -123,10 +270,10 @@ def test_health_check():
         else:
             print_error(f"Backend returned status {response.status_code}")
             return False
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print_error("Cannot connect to backend. Is it running on http://localhost:8000?")
         return False
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         print_info("Backend is slow to respond but likely running...")
         print_success("Proceeding with test...")
         return True  # Continue anyway
@@ -135,135 +282,139 @@ def test_health_check():
         print_info("Will try to continue anyway...")
         return True  # Continue anyway
 
-def create_aoi():
+async def _post_json(path, body, action, timeout=60, retry=True):
+    """
+    POST a pre-encoded JSON body and decode the reply
+    
+    Returns the decoded response, or None after printing why `action` failed.
+    """
+    try:
+        response = await send("POST", path, content=body, timeout=timeout, retry=retry)
+    except Exception as e:
+        print_error(f"{action} failed: {e}")
+        return None
+    
+    if response.status_code != 200:
+        print_error(f"{action} failed: {response.status_code}")
+        print_error(f"Response: {response.text}")
+        return None
+    return _json(response)
+
+async def create_aoi():
     """Create AOI for Umananda Island"""
     print_step(3, "Create AOI - Umananda Island")
     
-    aoi_data = {
-        "name": "Umananda Island (Direct Test)",
-        "description": "World's smallest inhabited river island - Direct backend test",
-        "geojson": UMANANDA_GEOJSON,
-        "monitoring_enabled": True,
-        "alert_threshold": 0.7
-    }
+    aoi_data = json_body(
+        UMANANDA_GEOJSON_BYTES,
+        name="Umananda Island (Direct Test)",
+        description="World's smallest inhabited river island - Direct backend test",
+        monitoring_enabled=True,
+        alert_threshold=0.7
+    )
     
-    try:
-        print_info(f"Sending AOI creation request...")
-        response = requests.post(
-            f"{BASE_URL}/api/v2/aoi",
-            headers=HEADERS,
-            json=aoi_data,
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            aoi = response.json()
-            print_success(f"AOI created successfully")
-            print_info(f"AOI ID: {aoi['id']}")
-            print_info(f"AOI Name: {aoi['name']}")
-            return aoi['id'], aoi
-        else:
-            print_error(f"AOI creation failed: {response.status_code}")
-            print_error(f"Response: {response.text}")
-            return None, None
-            
-    except Exception as e:
-        print_error(f"AOI creation failed: {e}")
+    print_info(f"Sending AOI creation request...")
+    aoi = await _post_json("/api/v2/aoi", aoi_data, "AOI creation", timeout=30)
+    if aoi is None:
         return None, None
+    
+    print_success(f"AOI created successfully")
+    print_info(f"AOI ID: {aoi['id']}")
+    print_info(f"AOI Name: {aoi['name']}")
+    return aoi['id'], aoi
 
-def check_data_availability(aoi_id, geojson):
+async def check_data_availability(aoi_id, geojson_bytes):
     """Check satellite data availability"""
     print_step(4, "Check Satellite Data Availability")
     
-    try:
-        print_info("Checking if satellite imagery is available...")
-        response = requests.post(
-            f"{BASE_URL}/api/v2/analysis/data-availability/preview",
-            headers=HEADERS,
-            json={"geojson": geojson},
-            timeout=60
-        )
+    print_info("Checking if satellite imagery is available...")
+    data = await _post_json(
+        "/api/v2/analysis/data-availability/preview",
+        json_body(geojson_bytes),
+        "Data availability check"
+    )
+    if data is None:
+        return False
+    
+    if data.get('success'):
+        print_success("Satellite data is available!")
+        print_info(f"Images available: {data.get('images_available', 'Unknown')}")
+        print_info(f"Sufficient for analysis: {data.get('sufficient_for_analysis', False)}")
+        if data.get('latest_image'):
+            print_info(f"Latest image: {data['latest_image'].get('timestamp', 'Unknown')}")
+        return True
+    
+    print_error("Insufficient satellite data")
+    print_info(f"Reason: {data.get('message', 'Unknown')}")
+    print_info(f"Recommendation: {data.get('recommendation', 'Try extending date range')}")
+    return False
+
+async def wait_for_analysis(analysis):
+    """Poll a queued or running analysis until it reaches a final status or the wait cap"""
+    deadline = time.monotonic() + ANALYSIS_WAIT_SECONDS
+    attempt = 0
+    
+    while analysis.get('status') in ('queued', 'running') and time.monotonic() < deadline:
+        delay = POLL_DELAYS[min(attempt, len(POLL_DELAYS) - 1)]
+        print_info(f"Analysis {analysis['status']} ({analysis.get('progress') or 0}%), checking again in {delay}s...")
+        await asyncio.sleep(delay)
+        attempt += 1
         
+        # Status polls bypass the replay cache so a recorded 'running' is never replayed
+        response = await request_with_retry("GET", f"/api/v2/analysis/{analysis['id']}", timeout=30)
         if response.status_code == 200:
-            data = response.json()
-            if data.get('success'):
-                print_success("Satellite data is available!")
-                print_info(f"Images available: {data.get('images_available', 'Unknown')}")
-                print_info(f"Sufficient for analysis: {data.get('sufficient_for_analysis', False)}")
-                if data.get('latest_image'):
-                    print_info(f"Latest image: {data['latest_image'].get('timestamp', 'Unknown')}")
-                return True
-            else:
-                print_error("Insufficient satellite data")
-                print_info(f"Reason: {data.get('message', 'Unknown')}")
-                print_info(f"Recommendation: {data.get('recommendation', 'Try extending date range')}")
-                return False
-        else:
-            print_error(f"Data availability check failed: {response.status_code}")
-            return False
-            
-    except Exception as e:
-        print_error(f"Data availability check failed: {e}")
-        return False
+            analysis = _json(response)
+    
+    return analysis
 
-def run_comprehensive_analysis(aoi_id, geojson, date_range_days=60):
+async def run_comprehensive_analysis(aoi_id, geojson_bytes, date_range_days=60):
     """Run comprehensive analysis with historical data"""
     print_step(5, f"Run Comprehensive Analysis ({date_range_days} days historical data)")
     
-    analysis_request = {
-        "aoi_id": aoi_id,
-        "geojson": geojson,
-        "analysis_type": "comprehensive",
-        "date_range_days": date_range_days,  # Historical data range!
-        "max_cloud_coverage": 0.3,
-        "include_spectral_analysis": True,
-        "include_visualizations": True
-    }
+    analysis_request = json_body(
+        geojson_bytes,
+        aoi_id=aoi_id,
+        analysis_type="comprehensive",
+        date_range_days=date_range_days,  # Historical data range!
+        max_cloud_coverage=0.3,
+        include_spectral_analysis=True,
+        include_visualizations=True
+    )
     
-    try:
-        print_info(f"Starting analysis with {date_range_days} days of historical data...")
-        print_info("This may take 3-5 minutes...")
-        
-        response = requests.post(
-            f"{BASE_URL}/api/v2/analysis/analyze/comprehensive",
-            headers=HEADERS,
-            json=analysis_request,
-            timeout=600  # 10 minute timeout
-        )
-        
-        if response.status_code == 200:
-            analysis = response.json()
-            
-            print_success("Analysis request completed!")
-            print_info(f"Analysis ID: {analysis['id']}")
-            print_info(f"Status: {analysis['status']}")
-            print_info(f"Success: {analysis.get('success', False)}")
-            
-            if analysis['status'] == 'completed':
-                print_success("Analysis completed successfully!")
-                return analysis['id'], analysis
-            elif analysis['status'] == 'insufficient_data':
-                print_error("Analysis failed: Insufficient satellite data")
-                if analysis.get('processing_metadata'):
-                    print_info(f"Error: {analysis['processing_metadata'].get('error', 'Unknown')}")
-                    tips = analysis['processing_metadata'].get('helpful_tips', [])
-                    if tips:
-                        print_info("Helpful tips:")
-                        for tip in tips:
-                            print(f"   • {tip}")
-                return analysis['id'], analysis
-            else:
-                print_info(f"Analysis status: {analysis['status']}")
-                return analysis['id'], analysis
-        else:
-            print_error(f"Analysis failed: {response.status_code}")
-            print_error(f"Response: {response.text}")
-            return None, None
-            
-    except Exception as e:
-        print_error(f"Analysis failed: {e}")
+    print_info(f"Starting analysis with {date_range_days} days of historical data...")
+    print_info("This may take 3-5 minutes...")
+    
+    analysis = await _post_json(
+        "/api/v2/analysis/analyze/comprehensive",
+        analysis_request,
+        "Analysis",
+        timeout=600,  # 10 minute timeout
+        retry=False  # A full pipeline run; never repeated blindly
+    )
+    if analysis is None:
         return None, None
+    analysis = await wait_for_analysis(analysis)
+    
+    print_success("Analysis request completed!")
+    print_info(f"Analysis ID: {analysis['id']}")
+    print_info(f"Status: {analysis['status']}")
+    print_info(f"Success: {analysis.get('success', False)}")
+    
+    if analysis['status'] == 'completed':
+        print_success("Analysis completed successfully!")
+    elif analysis['status'] == 'insufficient_data':
+        print_error("Analysis failed: Insufficient satellite data")
+        if analysis.get('processing_metadata'):
+            print_info(f"Error: {analysis['processing_metadata'].get('error', 'Unknown')}")
+            tips = analysis['processing_metadata'].get('helpful_tips', [])
+            if tips:
+                print_info("Helpful tips:")
+                for tip in tips:
+                    print(f"   • {tip}")
+    else:
+        print_info(f"Analysis status: {analysis['status']}")
+    return analysis['id'], analysis
 
+@buffered_output
 def display_analysis_results(analysis):
     """Display detailed analysis results"""
     print_step(6, "Analysis Results")
@@ -309,115 +460,154 @@ def display_analysis_results(analysis):
         for key, value in stats.items():
             print(f"   • {key.replace('_', ' ').title()}: {value}")
 
-def generate_heatmap(aoi_id, geojson, date_range_days=60):
+async def generate_heatmap(aoi_id, geojson_bytes, date_range_days=60):
     """Generate change intensity heatmap"""
     print_step(7, "Generate Change Intensity Heatmap")
     
-    heatmap_request = {
-        "aoi_id": aoi_id,
-        "geojson": geojson,
-        "visualization_type": "heatmap",
-        "date_range_days": date_range_days
-    }
+    heatmap_request = json_body(
+        geojson_bytes,
+        aoi_id=aoi_id,
+        visualization_type="heatmap",
+        date_range_days=date_range_days
+    )
     
-    try:
-        print_info("Generating heatmap visualization...")
-        response = requests.post(
-            f"{BASE_URL}/api/v2/analysis/visualize",
-            headers=HEADERS,
-            json=heatmap_request,
-            timeout=300
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            print_success("Heatmap generated successfully!")
-            print_info(f"Visualization URL: {result['visualization_url'][:80]}...")
-            return result['visualization_url']
-        else:
-            print_error(f"Heatmap generation failed: {response.status_code}")
-            return None
-            
-    except Exception as e:
-        print_error(f"Heatmap generation failed: {e}")
+    print_info("Generating heatmap visualization...")
+    result = await _post_json("/api/v2/analysis/visualize", heatmap_request, "Heatmap generation", timeout=300)
+    if result is None:
         return None
+    
+    print_success("Heatmap generated successfully!")
+    print_info(f"Visualization URL: {result['visualization_url'][:80]}...")
+    return result['visualization_url']
 
-def detect_hotspots(aoi_id, geojson, date_range_days=60):
+async def detect_hotspots(aoi_id, geojson_bytes, date_range_days=60):
     """Detect change hotspots"""
     print_step(8, "Detect Change Hotspots")
     
-    hotspot_request = {
-        "aoi_id": aoi_id,
-        "geojson": geojson,
-        "date_range_days": date_range_days,
-        "grid_size": 10,
-        "threshold_percentile": 75
-    }
+    hotspot_request = json_body(
+        geojson_bytes,
+        aoi_id=aoi_id,
+        date_range_days=date_range_days,
+        grid_size=10,
+        threshold_percentile=75
+    )
     
-    try:
-        print_info("Analyzing hotspots...")
-        response = requests.post(
-            f"{BASE_URL}/api/v2/analysis/hotspot-detection",
-            headers=HEADERS,
-            json=hotspot_request,
-            timeout=300
-        )
+    print_info("Analyzing hotspots...")
+    result = await _post_json("/api/v2/analysis/hotspot-detection", hotspot_request, "Hotspot detection", timeout=300)
+    if result is not None:
+        display_hotspots(result)
+    return result
+
+@buffered_output
+def display_hotspots(result):
+    """Display hotspot count and the top 3 hotspots"""
+    print_success(f"Hotspot analysis complete!")
+    print_info(f"Hotspots found: {len(result.get('hotspots', []))}")
+    
+    # Display top 3 hotspots
+    hotspots = result.get('hotspots', [])[:3]
+    if hotspots:
+        print_info("Top 3 hotspots:")
+        for i, hotspot in enumerate(hotspots, 1):
+            pos = hotspot.get('grid_position', {})
+            intensity = hotspot.get('intensity', 0)
+            print(f"   {i}. Position: ({pos.get('row', '?')}, {pos.get('col', '?')}), Intensity: {intensity:.2f}")
+
+@buffered_output
+def display_summary(analysis_id, analysis, heatmap_url=None, hotspots=None):
+    """Display the final test summary"""
+    if analysis.get('status') == 'completed':
+        print_header("✅ TEST COMPLETE - SUCCESS!")
+        print("📊 All features tested successfully:")
+        print("   ✅ AOI Creation")
+        print("   ✅ Data Availability Check")
+        print("   ✅ Comprehensive Analysis (with historical data)")
+        print("   ✅ Change Detection (EWMA, CUSUM, VedgeSat)")
+        print("   ✅ Visualizations (Before, After, Change Map, GIF)")
+        if heatmap_url:
+            print("   ✅ Heatmap Generation")
+        if hotspots:
+            print("   ✅ Hotspot Detection")
         
-        if response.status_code == 200:
-            result = response.json()
-            print_success(f"Hotspot analysis complete!")
-            print_info(f"Hotspots found: {len(result.get('hotspots', []))}")
-            
-            # Display top 3 hotspots
-            hotspots = result.get('hotspots', [])[:3]
-            if hotspots:
-                print_info("Top 3 hotspots:")
-                for i, hotspot in enumerate(hotspots, 1):
-                    pos = hotspot.get('grid_position', {})
-                    intensity = hotspot.get('intensity', 0)
-                    print(f"   {i}. Position: ({pos.get('row', '?')}, {pos.get('col', '?')}), Intensity: {intensity:.2f}")
-            
-            return result
-        else:
-            print_error(f"Hotspot detection failed: {response.status_code}")
-            return None
-            
-    except Exception as e:
-        print_error(f"Hotspot detection failed: {e}")
-        return None
+        print(f"\n📝 Analysis ID: {analysis_id}")
+        print(f"🌐 View in frontend: http://localhost:3000/analysis/{analysis_id}")
+        
+    else:
+        print_header("⚠️  TEST COMPLETE - PARTIAL SUCCESS")
+        print(f"Analysis Status: {analysis.get('status')}")
+        print(f"Analysis ID: {analysis_id}")
+        
+        if analysis.get('status') == 'insufficient_data':
+            print("\n💡 Recommendations:")
+            print("   • Try again in 2-5 days (next Sentinel-2 pass)")
+            print("   • Check if location has good satellite coverage")
+            print("   • Verify Sentinel Hub API credentials")
+            print("   • Try a different location (e.g., Delhi, London)")
 
-def main():
+async def main():
     """Main test function"""
+    global USE_MOCK
+    
+    # Load environment variables; python-dotenv is optional for this script
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+    
+    USE_MOCK = os.environ.get('USE_MOCK', '').lower() in ('1', 'true', 'yes')
+    
     print_header("🛰️  UMANANDA ISLAND - DIRECT BACKEND TEST")
     print(f"📍 Location: World's smallest inhabited river island")
     print(f"🌍 Coordinates: 26.1964°N, 91.7450°E (Brahmaputra River, Guwahati)")
     print(f"⏰ Test started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
+    stdout = _TaskBufferedStdout(sys.stdout)
+    sys.stdout = stdout
+    try:
+        await run_steps(stdout)
+    finally:
+        sys.stdout = stdout.stream
+        await CLIENT.aclose()
+
+async def run_steps(stdout):
+    """Run the test steps, overlapping the ones that only need the AOI"""
     # Test 1: Authenticate
-    if not create_test_user_and_login():
+    if not await create_test_user_and_login():
         print_error("\n❌ Failed to authenticate. Check backend auth endpoints.")
         sys.exit(1)
     
     # Test 2: Health check
-    if not test_health_check():
+    if not await test_health_check():
         print_info("\n⚠️ Health check had issues but continuing...")
     
     # Test 3: Create AOI
-    aoi_id, aoi = create_aoi()
+    aoi_id, aoi = await create_aoi()
     if not aoi_id:
         print_error("\n❌ Failed to create AOI. Check backend logs.")
         sys.exit(1)
     
-    # Test 4: Check data availability
-    data_available = check_data_availability(aoi_id, UMANANDA_GEOJSON)
-    
-    # Test 5: Run comprehensive analysis
-    # Try 60 days first, then 90 days if needed
-    analysis_id, analysis = run_comprehensive_analysis(aoi_id, UMANANDA_GEOJSON, date_range_days=60)
+    # Test 4 + 5: Check data availability while the comprehensive analysis runs
+    # Try 60 days first, then 90 days if needed; the 90-day fallback starts
+    # speculatively alongside, its output held back until its result is used
+    print_info("Also starting a speculative 90-day analysis; the backend runs it in full "
+               "even if the 60-day result makes it unnecessary")
+    fallback = asyncio.create_task(stdout.capture(
+        run_comprehensive_analysis(aoi_id, UMANANDA_GEOJSON_BYTES, date_range_days=90)
+    ))
+    data_available, (analysis_id, analysis) = await asyncio.gather(
+        check_data_availability(aoi_id, UMANANDA_GEOJSON_BYTES),
+        run_comprehensive_analysis(aoi_id, UMANANDA_GEOJSON_BYTES, date_range_days=60)
+    )
     
     if analysis and analysis.get('status') == 'insufficient_data':
-        print_info("\n⚠️  Insufficient data with 60 days. Trying 90 days...")
-        analysis_id, analysis = run_comprehensive_analysis(aoi_id, UMANANDA_GEOJSON, date_range_days=90)
+        print_info("\n⚠️  Insufficient data with 60 days. Using the 90-day analysis...")
+        (analysis_id, analysis), fallback_output = await fallback
+        print(fallback_output, end="")
+    else:
+        # Only the client side is dropped; the server-side run still completes
+        fallback.cancel()
+        print_info("Discarded the speculative 90-day analysis")
     
     if not analysis:
         print_error("\n❌ Analysis failed completely. Check backend logs.")
@@ -427,43 +617,19 @@ def main():
     if analysis.get('status') == 'completed':
         display_analysis_results(analysis)
         
-        # Test 7: Generate heatmap
-        heatmap_url = generate_heatmap(aoi_id, UMANANDA_GEOJSON)
-        
-        # Test 8: Detect hotspots
-        hotspots = detect_hotspots(aoi_id, UMANANDA_GEOJSON)
-        
-        # Final summary
-        print_header("✅ TEST COMPLETE - SUCCESS!")
-        print("📊 All features tested successfully:")
-        print("   ✅ AOI Creation")
-        print("   ✅ Data Availability Check")
-        print("   ✅ Comprehensive Analysis (with historical data)")
-        print("   ✅ Change Detection (EWMA, CUSUM, VedgeSat)")
-        print("   ✅ Visualizations (Before, After, Change Map, GIF)")
-        if heatmap_url:
-            print("   ✅ Heatmap Generation")
-        if hotspots:
-            print("   ✅ Hotspot Detection")
-        
-        print(f"\n📝 Analysis ID: {analysis_id}")
-        print(f"🌐 View in frontend: http://localhost:3000/analysis/{analysis_id}")
+        # Test 7 + 8: Generate heatmap and detect hotspots concurrently
+        heatmap_url, hotspots = await asyncio.gather(
+            generate_heatmap(aoi_id, UMANANDA_GEOJSON_BYTES),
+            detect_hotspots(aoi_id, UMANANDA_GEOJSON_BYTES)
+        )
         
+        display_summary(analysis_id, analysis, heatmap_url, hotspots)
     else:
-        print_header("⚠️  TEST COMPLETE - PARTIAL SUCCESS")
-        print(f"Analysis Status: {analysis.get('status')}")
-        print(f"Analysis ID: {analysis_id}")
-        
-        if analysis.get('status') == 'insufficient_data':
-            print("\n💡 Recommendations:")
-            print("   • Try again in 2-5 days (next Sentinel-2 pass)")
-            print("   • Check if location has good satellite coverage")
-            print("   • Verify Sentinel Hub API credentials")
-            print("   • Try a different location (e.g., Delhi, London)")
+        display_summary(analysis_id, analysis)
 
 if __name__ == "__main__":
     try:
-        main()
+        asyncio.run(main())
     except KeyboardInterrupt:
         print("\n\n⚠️  Test interrupted by user")
         sys.exit(0)
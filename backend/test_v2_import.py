@@ -1,13 +1,19 @@
 #!/usr/bin/env python3
 """Test v2 imports"""
 
-try:
-    from app.api.v2 import aoi
-    print("✅ AOI v2 import successful")
-    print(f"Router exists: {hasattr(aoi, 'router')}")
-    if hasattr(aoi, 'router'):
-        print(f"Router routes: {[route.path for route in aoi.router.routes]}")
-except Exception as e:
-    print(f"❌ AOI v2 import failed: {e}")
-    import traceback
-    traceback.print_exc()
+import importlib.util
+
+# Fail fast when FastAPI is missing instead of importing the app package first
+if importlib.util.find_spec("fastapi") is None:
+    print("❌ AOI v2 import failed: No module named 'fastapi'")
+else:
+    try:
+        from app.api.v2 import aoi
+        print("✅ AOI v2 import successful")
+        print(f"Router exists: {hasattr(aoi, 'router')}")
+        if hasattr(aoi, 'router'):
+            print("Router routes:", ", ".join(route.path for route in aoi.router.routes))
+    except Exception as e:
+        print(f"❌ AOI v2 import failed: {e}")
+        import traceback
+        traceback.print_exc()